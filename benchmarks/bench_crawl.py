@@ -0,0 +1,194 @@
+# benchmarks/bench_crawl.py
+"""
+End-to-end benchmark of the `check` and `crawl` commands against a local synthetic site.
+
+    python -m benchmarks.bench_crawl --pages 200 --latency-ms 20 --concurrency 1 8 \\
+        --output bench-results.json [--compare baseline.json]
+
+    # parse worker scaling: CPU-heavy pages, one scenario per worker count
+    python -m benchmarks.bench_crawl --pages 400 --latency-ms 0 --page-kb 200 \\
+        --concurrency 8 --workers 0 1 2 4
+
+    # sharded crawl scaling: 1 to N worker processes
+    python -m benchmarks.bench_crawl --pages 1000 --latency-ms 20 --concurrency 4 --shards 1 2 4
+
+Each scenario runs `main.py` in a fresh process with --no-ai --profile and records wall
+time, pages/sec, requests and connections seen by the server, peak RSS of the process
+and per-stage time. Results are written as JSON so a branch can be compared with a
+baseline run made with the same options.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_site import SyntheticSite, SyntheticSiteServer
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def build_scenarios(args, url):
+    scenarios = [("check", ["check", url])]
+    for concurrency in args.concurrency:
+        scenarios.append((
+            f"crawl-c{concurrency}",
+            ["crawl", url, "--max-pages", str(args.max_pages or args.pages), "--concurrency", str(concurrency)],
+        ))
+    # Worker scenarios fetch with enough threads to keep every worker busy.
+    for workers in args.workers or []:
+        concurrency = max(max(args.concurrency), workers)
+        scenarios.append((
+            f"crawl-c{concurrency}-w{workers}",
+            ["crawl", url, "--max-pages", str(args.max_pages or args.pages),
+             "--concurrency", str(concurrency), "--workers", str(workers)],
+        ))
+    # Nightly re-crawl: the cold run fills the HTTP cache, the warm run revalidates against it.
+    if args.http_cache:
+        for name in ("cold", "warm"):
+            scenarios.append((
+                f"crawl-c{max(args.concurrency)}-cache-{name}",
+                ["crawl", url, "--max-pages", str(args.max_pages or args.pages),
+                 "--concurrency", str(max(args.concurrency)), "--http-cache", "http-cache.db"],
+            ))
+    # Asset audit: compare with crawl-c<N> to see what the probes add to crawl time.
+    if args.assets:
+        scenarios.append((
+            f"crawl-c{max(args.concurrency)}-assets",
+            ["crawl", url, "--max-pages", str(args.max_pages or args.pages),
+             "--concurrency", str(max(args.concurrency)), "--assets"],
+        ))
+    # Sharded crawl scaling: one worker process per shard, each with the same concurrency.
+    for shards in args.shards or []:
+        scenarios.append((
+            f"crawl-sharded-s{shards}",
+            ["crawl-sharded", url, "--max-pages", str(args.max_pages or args.pages),
+             "--shards", str(shards), "--concurrency", str(args.shard_concurrency)],
+        ))
+    return scenarios
+
+
+def run_scenario(name, argv, server, workdir):
+    json_path = os.path.join(workdir, f"{name}.json")
+    command = [sys.executable, str(ROOT / "main.py")] + argv + [
+        "--profile",
+        "--output-json", json_path,
+        "--output-html", os.path.join(workdir, f"{name}.html"),
+    ]
+    # A sharded crawl never makes AI calls, so it has no --no-ai option.
+    if argv[0] != "crawl-sharded":
+        command.append("--no-ai")
+    if argv[0] in ("crawl", "crawl-sharded"):
+        command += ["--output-jsonl", os.path.join(workdir, f"{name}.jsonl")]
+
+    server.reset_counters()
+    stderr_path = os.path.join(workdir, f"{name}.stderr")
+    with open(stderr_path, "wb") as stderr:
+        started = time.perf_counter()
+        process = subprocess.Popen(command, cwd=workdir, stdout=subprocess.DEVNULL, stderr=stderr)
+        # wait4 gives the resource usage of this child alone, including its peak RSS.
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - started
+    if os.waitstatus_to_exitcode(status) != 0:
+        with open(stderr_path, encoding="utf-8", errors="replace") as f:
+            raise RuntimeError(f"{name} failed:\n{f.read()}")
+
+    with open(json_path, encoding="utf-8") as f:
+        report = json.load(f)
+    pages = len(report["pages"]) if "pages" in report else 1
+    stages = report["profile"]["stages"]
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    rss_scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "scenario": name,
+        "command": argv,
+        "wall_s": round(wall, 3),
+        "pages": pages,
+        "pages_per_s": round(pages / wall, 2),
+        "server": server.counters(),
+        "peak_rss_mb": round(usage.ru_maxrss * rss_scale / 2**20, 1),
+        "stage_total_s": {stage: values["total"] for stage, values in stages.items()},
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def print_results(results, baseline=None):
+    previous = {r["scenario"]: r for r in (baseline or {}).get("results", [])}
+    print(f"{'scenario':<22}{'wall s':>9}{'pages/s':>10}{'GET':>7}{'HEAD':>7}{'conns':>7}{'body MB':>9}{'RSS MB':>8}  vs baseline")
+    for r in results:
+        requests = r["server"]["requests"]
+        line = (
+            f"{r['scenario']:<22}{r['wall_s']:>9.2f}{r['pages_per_s']:>10.1f}"
+            f"{requests.get('GET', 0):>7}{requests.get('HEAD', 0):>7}{r['server']['connections']:>7}"
+            f"{r['server'].get('body_bytes', 0) / 2**20:>9.2f}"
+            f"{r['peak_rss_mb']:>8.1f}"
+        )
+        old = previous.get(r["scenario"])
+        if old:
+            line += f"  {(r['pages_per_s'] / old['pages_per_s'] - 1) * 100:+.1f}% pages/s"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end check/crawl benchmark against a synthetic site.")
+    parser.add_argument("--pages", type=int, default=200, help="Pages on the synthetic site.")
+    parser.add_argument("--max-pages", type=int, default=None, help="Pages to crawl (defaults to --pages).")
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--images", type=int, default=5)
+    parser.add_argument("--broken-share", type=float, default=0.05)
+    parser.add_argument("--latency-ms", type=float, default=10)
+    parser.add_argument("--page-kb", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="Also run one crawl per parse worker count (0 parses in the fetching threads).")
+    parser.add_argument("--http-cache", action="store_true",
+                        help="Also run a crawl twice with --http-cache to measure an incremental re-crawl.")
+    parser.add_argument("--assets", action="store_true",
+                        help="Also run a crawl with --assets to measure the cost of the asset probes.")
+    parser.add_argument("--shards", type=int, nargs="+", default=None,
+                        help="Also run one crawl-sharded per shard count, to measure scaling from 1 to N workers.")
+    parser.add_argument("--shard-concurrency", type=int, default=4, help="Pages in flight per shard worker.")
+    parser.add_argument("--output", default="bench-results.json")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare against.")
+    args = parser.parse_args()
+
+    site = SyntheticSite(args.pages, args.fanout, args.images, args.broken_share, args.latency_ms, args.page_kb)
+    results = []
+    with SyntheticSiteServer(site) as server, tempfile.TemporaryDirectory() as workdir:
+        for name, argv in build_scenarios(args, server.url):
+            print(f"[INFO] Running {name}...")
+            results.append(run_scenario(name, argv, server, workdir))
+
+    output = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "site": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    print(f"[INFO] Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_parse.py
+"""
+Parse time and peak memory per page: BeautifulSoup tree walks vs the single-pass PageFacts extractor.
+
+    python -m benchmarks.bench_parse [--sizes 200 2000 10000] [--repeat 3]
+
+Each size is the number of content blocks in the synthetic page (one link, one image
+and one paragraph each).
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from dnz_seochecker.meta_checker import MetaChecker
+from dnz_seochecker.page_facts import extract_page_facts
+
+
+def build_page(blocks):
+    parts = [
+        "<html><head><title>Synthetic benchmark page</title>",
+        "<meta name='description' content='A synthetic page used to benchmark HTML parsing.'>",
+        "<meta name='keywords' content='seo,benchmark'>",
+        "<meta name='viewport' content='width=device-width'>",
+        "</head><body><h1>Benchmark</h1>",
+    ]
+    for i in range(blocks):
+        parts.append(
+            f"<div class='block'><h2>Section {i}</h2>"
+            f"<p>Lorem ipsum dolor sit amet, <a href='/page/{i}'>link {i}</a> consectetur "
+            f"adipiscing elit.</p><img src='/img/{i}.png' alt='image {i}'></div>"
+        )
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def soup_path(html):
+    # What SiteChecker, MetaChecker and SEOAnalyzer did per page before PageFacts.
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.find("title")
+    title = title.text.strip() if title else None
+    links = [a.get("href") for a in soup.find_all("a", href=True)]
+    links = [a.get("href") for a in soup.find_all("a", href=True)]
+    images = [{"src": img.get("src"), "alt": img.get("alt")} for img in soup.find_all("img")]
+    meta_checker = MetaChecker(soup)
+    meta_checker.get_meta_tags()
+    meta_checker.get_description()
+    meta_checker.get_keywords()
+    h1_count = len(soup.find_all("h1"))
+    return title, links, images, h1_count
+
+
+def facts_path(html):
+    facts = extract_page_facts(html)
+    return facts.title, facts.links, facts.images, facts.h1_count
+
+
+def measure(func, html, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(html)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    func(html)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 2000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'blocks':>8} {'page KB':>8} | {'soup ms':>9} {'soup MB':>8} | {'facts ms':>9} {'facts MB':>9} | {'speedup':>7}")
+    for blocks in args.sizes:
+        html = build_page(blocks)
+        soup_time, soup_peak = measure(soup_path, html, args.repeat)
+        facts_time, facts_peak = measure(facts_path, html, args.repeat)
+        print(
+            f"{blocks:>8} {len(html) / 1024:>8.0f} | "
+            f"{soup_time * 1000:>9.1f} {soup_peak / 2**20:>8.1f} | "
+            f"{facts_time * 1000:>9.1f} {facts_peak / 2**20:>9.1f} | "
+            f"{soup_time / facts_time:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
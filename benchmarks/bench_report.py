@@ -0,0 +1,73 @@
+# benchmarks/bench_report.py
+"""
+HTML report render time against page count: one combined file vs the sharded index.
+
+    python -m benchmarks.bench_report [--pages 1000 5000 20000] [--images 20]
+
+Synthetic page reports are written to a temporary JSON Lines file first, so both
+modes stream from disk the way `crawl` does.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from dnz_seochecker.report_generator import ReportGenerator
+from dnz_seochecker.report_sink import JsonlReportSink, JsonlReports
+
+
+def make_page(number, images):
+    return {
+        "url": f"https://example.com/page/{number}",
+        "status_code": 200,
+        "title": f"Synthetic page {number}",
+        "meta": {"description": "A synthetic page.", "viewport": "width=device-width"},
+        "description": "A synthetic page.",
+        "keywords": None,
+        "broken_links": [[f"https://example.com/missing/{number % 50}", 404]],
+        "images": [{"src": f"/img/{i}.png", "alt": "" if i % 3 else f"image {i}"} for i in range(images)],
+        "suggestions": [
+            "✅ Title length is good.",
+            "⚠️ Description is short (17 chars). Expand it.",
+            "⚠️ 1 broken links found. Consider fixing them.",
+            f"❌ {images - images // 3} images missing alt text. Add descriptive alt attributes for accessibility and SEO.",
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--pages-per-file", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'pages':>8} | {'single s':>9} {'single MB':>10} | {'sharded s':>10} {'index KB':>9} {'files':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            jsonl = os.path.join(tmp, f"{pages}.jsonl")
+            with JsonlReportSink(jsonl) as sink:
+                for number in range(pages):
+                    sink.write(make_page(number, args.images))
+            generator = ReportGenerator(JsonlReports(jsonl))
+
+            single = os.path.join(tmp, f"{pages}.html")
+            started = time.perf_counter()
+            generator.to_html(single)
+            single_time = time.perf_counter() - started
+
+            sharded = os.path.join(tmp, f"{pages}-sharded")
+            started = time.perf_counter()
+            index = generator.to_sharded_html(sharded, pages_per_file=args.pages_per_file)
+            sharded_time = time.perf_counter() - started
+
+            files = len(os.listdir(os.path.join(sharded, "pages")))
+            print(
+                f"{pages:>8} | {single_time:>9.2f} {os.path.getsize(single) / 2**20:>10.1f} | "
+                f"{sharded_time:>10.2f} {os.path.getsize(index) / 1024:>9.1f} {files:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
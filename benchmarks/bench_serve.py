@@ -0,0 +1,169 @@
+# benchmarks/bench_serve.py
+"""
+Latency of single-page audits: one `main.py check` process per audit against
+requests to a running `main.py serve`.
+
+    python -m benchmarks.bench_serve --audits 30 --latency-ms 20 [--parallel 8] [--output serve-results.json]
+
+Both modes audit the same pages of a local synthetic site with --no-ai. Each
+latency is measured from the client's side, so it includes process start-up and
+imports in one mode and the HTTP round trip to the server in the other.
+The server's reports are checked against the ones `check` writes.
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.synthetic_site import SyntheticSite, SyntheticSiteServer
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_check_process(url, workdir, n):
+    json_path = os.path.join(workdir, f"check-{n}.json")
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(ROOT / "main.py"), "check", url, "--no-ai",
+         "--output-json", json_path, "--output-html", os.path.join(workdir, f"check-{n}.html")],
+        cwd=workdir, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    latency = time.perf_counter() - started
+    with open(json_path, encoding="utf-8") as f:
+        return latency, json.load(f)
+
+
+def run_check_request(base_url, url):
+    request = urllib.request.Request(
+        f"{base_url}/check", data=json.dumps({"url": url}).encode("utf-8"),
+        headers={"Content-Type": "application/json"}, method="POST",
+    )
+    started = time.perf_counter()
+    while True:
+        try:
+            with urllib.request.urlopen(request, timeout=300) as response:
+                report = json.load(response)
+            return time.perf_counter() - started, report
+        except urllib.error.HTTPError as e:
+            if e.code != 503:
+                raise
+            # Backpressure: the queue is full, so wait as the server asks.
+            time.sleep(float(e.headers.get("Retry-After", "1")))
+
+
+def start_server(port, workers, workdir):
+    log = open(os.path.join(workdir, "serve.log"), "wb")
+    process = subprocess.Popen(
+        [sys.executable, str(ROOT / "main.py"), "serve", "--port", str(port), "--no-ai",
+         "--workers", str(workers)],
+        cwd=workdir, stdout=log, stderr=subprocess.STDOUT,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    while True:
+        try:
+            with urllib.request.urlopen(f"{base_url}/health", timeout=1):
+                return process, base_url, time.perf_counter() - started
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError("serve exited during start-up; see serve.log")
+            time.sleep(0.05)
+
+
+def run_mode(audit, urls, parallel):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        results = list(pool.map(audit, urls))
+    wall = time.perf_counter() - started
+    latencies = sorted(latency for latency, _ in results)
+    return [report for _, report in results], {
+        "audits": len(urls),
+        "wall_s": round(wall, 3),
+        "audits_per_s": round(len(urls) / wall, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+    }
+
+
+def percentile(sorted_values, percent):
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def comparable(report):
+    # Timings differ from run to run; the rest of the audit must not.
+    return {key: value for key, value in report.items() if key != "fetch_timing"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare process-per-audit with the serve API.")
+    parser.add_argument("--audits", type=int, default=30)
+    parser.add_argument("--parallel", type=int, default=1, help="Audits in flight at once.")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--page-kb", type=int, default=10)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    site = SyntheticSite(args.pages, args.fanout, latency_ms=args.latency_ms, page_kb=args.page_kb)
+    with SyntheticSiteServer(site) as site_server, tempfile.TemporaryDirectory() as workdir:
+        urls = [site_server.url + site.path(n % args.pages).lstrip("/") for n in range(args.audits)]
+
+        print(f"[INFO] Running {args.audits} audits as separate check processes...")
+        numbered = list(enumerate(urls))
+        process_reports, process_stats = run_mode(
+            lambda item: run_check_process(item[1], workdir, item[0]), numbered, args.parallel)
+
+        print("[INFO] Starting serve...")
+        server, base_url, startup = start_server(free_port(), max(4, args.parallel), workdir)
+        try:
+            print(f"[INFO] Running {args.audits} audits against serve...")
+            served_reports, serve_stats = run_mode(
+                lambda url: run_check_request(base_url, url), urls, args.parallel)
+        finally:
+            server.terminate()
+            server.wait()
+
+    same = all(comparable(a) == comparable(b) for a, b in zip(process_reports, served_reports))
+    speedup = process_stats["mean_ms"] / serve_stats["mean_ms"]
+    print(f"{'mode':<10}{'audits/s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, stats in (("process", process_stats), ("serve", serve_stats)):
+        print(f"{name:<10}{stats['audits_per_s']:>10.2f}{stats['mean_ms']:>10.1f}"
+              f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}")
+    print(f"serve start-up {startup:.2f}s (paid once); mean latency {speedup:.1f}x lower; "
+          f"reports identical: {same}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "options": vars(args),
+                "process": process_stats,
+                "serve": dict(serve_stats, startup_s=round(startup, 3)),
+                "reports_identical": same,
+            }, f, indent=2)
+        print(f"[INFO] Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/bench_store.py
+"""
+Report store vs JSON Lines: file size, write time, query time and peak memory.
+
+    python -m benchmarks.bench_store [--pages 1000 10000 50000] [--images 20]
+
+The queries are the ones of the `query` command (pages missing a description, top
+broken link targets, issue counts). Over JSON Lines they stream the whole file through
+Python; over the store they run in SQL. Export time is the JSON report written from each.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+
+from benchmarks.bench_report import make_page
+from dnz_seochecker.report_generator import ReportGenerator
+from dnz_seochecker.report_sink import JsonlReportSink, JsonlReports
+from dnz_seochecker.report_store import ReportStore
+from dnz_seochecker.rules import evaluate_page
+
+
+def make_report(number, images):
+    page = make_page(number, images)
+    if number % 7 == 0:
+        page["description"] = None
+        page["meta"].pop("description")
+    page["findings"] = evaluate_page(page)
+    page["fetch_timing"] = {"connect": 0.0012, "ttfb": 0.0123, "total": 0.0456}
+    return page
+
+
+def jsonl_queries(path):
+    missing = []
+    broken = defaultdict(set)
+    issues = Counter()
+    for page in JsonlReports(path):
+        if "description" in page and not page["description"]:
+            missing.append(page["url"])
+        for target, _ in page.get("broken_links", []):
+            broken[target].add(page["url"])
+        issues.update((f["code"], f["severity"]) for f in page.get("findings", []))
+    top = sorted(broken.items(), key=lambda item: (-len(item[1]), item[0]))[:10]
+    return len(missing), [(target, len(urls)) for target, urls in top], issues
+
+
+def store_queries(store):
+    return (store.count_missing("description"),
+            [(t["url"], t["pages"]) for t in store.top_broken_targets(10)],
+            Counter({(i["code"], i["severity"]): i["pages"] for i in store.issue_counts()}))
+
+
+def measured(fn, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--images", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'pages':>8} {'format':>6} | {'MB':>6} {'write s':>8} | {'query s':>8} {'query MB':>9} | {'export s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            jsonl = os.path.join(tmp, f"{pages}.jsonl")
+            db = os.path.join(tmp, f"{pages}.db")
+
+            started = time.perf_counter()
+            with JsonlReportSink(jsonl) as sink:
+                for number in range(pages):
+                    sink.write(make_report(number, args.images))
+            jsonl_write = time.perf_counter() - started
+
+            started = time.perf_counter()
+            with ReportStore(db) as store:
+                for number in range(pages):
+                    store.write(make_report(number, args.images))
+            store_write = time.perf_counter() - started
+
+            with ReportStore(db, append=True) as store:
+                jsonl_result, jsonl_query, jsonl_peak = measured(jsonl_queries, jsonl)
+                store_result, store_query, store_peak = measured(store_queries, store)
+                if jsonl_result != store_result:
+                    raise SystemExit("query results differ between JSON Lines and the store")
+
+                started = time.perf_counter()
+                ReportGenerator(JsonlReports(jsonl)).to_json(os.path.join(tmp, "from-jsonl.json"))
+                jsonl_export = time.perf_counter() - started
+                started = time.perf_counter()
+                ReportGenerator(store).to_json(os.path.join(tmp, "from-store.json"))
+                store_export = time.perf_counter() - started
+            with open(os.path.join(tmp, "from-jsonl.json"), "rb") as a, open(os.path.join(tmp, "from-store.json"), "rb") as b:
+                if a.read() != b.read():
+                    raise SystemExit("JSON export differs between JSON Lines and the store")
+
+            for name, path, write, query, peak, export in (
+                ("jsonl", jsonl, jsonl_write, jsonl_query, jsonl_peak, jsonl_export),
+                ("store", db, store_write, store_query, store_peak, store_export),
+            ):
+                print(f"{pages:>8} {name:>6} | {os.path.getsize(path) / 2**20:>6.1f} {write:>8.2f} | "
+                      f"{query:>8.3f} {peak / 2**20:>9.2f} | {export:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+# benchmarks/synthetic_site.py
+"""
+Local HTTP server for a deterministic synthetic website.
+
+    python -m benchmarks.synthetic_site --pages 1000 --fanout 20 --latency-ms 20 --port 8000
+
+Page 0 is "/", the others are "/page/<n>". Every page links to `fanout` pages
+(a share of them broken), has `images` images (every third one without alt text)
+and is padded to roughly `page_kb` kilobytes. Every response is delayed by
+`latency_ms`. Pages carry an ETag and answer a matching If-None-Match with 304.
+Every page loads /static/site.css (sent uncompressed) and /static/app.js (gzipped when
+the client accepts it), both cacheable for a day. The 50 images are not cacheable and
+every tenth one weighs 150 KB.
+/robots.txt disallows /missing/ and points at /sitemap_index.xml, which lists every
+page in two sitemaps, one plain and one gzipped, with a lastmod per page.
+The server counts requests by method and the connections it accepted, and the
+bytes of response bodies it sent.
+"""
+
+import argparse
+import datetime
+import gzip
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class SyntheticSite:
+    def __init__(self, pages=200, fanout=10, images=5, broken_share=0.05, latency_ms=0, page_kb=10, seed=1):
+        self.pages = pages
+        self.fanout = fanout
+        self.images = images
+        self.broken_share = broken_share
+        self.latency = latency_ms / 1000
+        self.page_kb = page_kb
+        self.seed = seed
+
+    def path(self, index):
+        return "/" if index == 0 else f"/page/{index}"
+
+    def index_of(self, path):
+        path = path.split("?", 1)[0]
+        if path == "/":
+            return 0
+        if path.startswith("/page/") and path[6:].isdigit():
+            index = int(path[6:])
+            if 0 < index < self.pages:
+                return index
+        return None
+
+    def links(self, index):
+        rng = random.Random(self.seed * 1000003 + index)
+        links = []
+        for k in range(self.fanout):
+            if rng.random() < self.broken_share:
+                links.append(f"/missing/{rng.randrange(self.pages)}")
+            else:
+                # Mostly nearby pages, like real navigation, plus a few random jumps.
+                target = (index + k + 1) % self.pages if k % 3 else rng.randrange(self.pages)
+                links.append(self.path(target))
+        return links
+
+    def page_html(self, index):
+        parts = [
+            f"<html><head><title>Synthetic page {index} of the benchmark site</title>",
+            f"<meta name='description' content='Synthetic benchmark page number {index}, generated for crawl benchmarks.'>",
+            "<meta name='viewport' content='width=device-width'>",
+            "<link rel='stylesheet' href='/static/site.css'><script src='/static/app.js'></script>",
+            f"</head><body><h1>Page {index}</h1><nav>",
+        ]
+        parts.extend(f"<a href='{link}'>link {n}</a>" for n, link in enumerate(self.links(index)))
+        parts.append("</nav>")
+        for n in range(self.images):
+            alt = "" if n % 3 == 2 else f" alt='image {n}'"
+            parts.append(f"<img src='/img/{(index + n) % 50}.png'{alt}>")
+
+        body = "".join(parts)
+        filler = "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>"
+        repeat = max(0, (self.page_kb * 1024 - len(body)) // len(filler))
+        return (body + filler * repeat + "</body></html>").encode("utf-8")
+
+    def image(self, path):
+        number = path[5:].split(".", 1)[0]
+        size = 150 * 1024 if number.isdigit() and int(number) % 10 == 0 else 2048
+        return b"\x89PNG\r\n\x1a\n" + b"\0" * size
+
+    def static(self, path):
+        if path == "/static/site.css":
+            return "text/css", b"body { margin: 0; }\n" * 1000
+        return "application/javascript", b"console.log('synthetic');\n" * 1000
+
+    def lastmod(self, index):
+        return (datetime.date(2024, 1, 1) + datetime.timedelta(days=index % 365)).isoformat()
+
+    def robots_txt(self, base_url):
+        return f"User-agent: *\nDisallow: /missing/\nSitemap: {base_url}/sitemap_index.xml\n".encode("utf-8")
+
+    def sitemap_xml(self, path, base_url):
+        # The index points at the first half of the pages (plain) and the second (gzipped).
+        namespace = "http://www.sitemaps.org/schemas/sitemap/0.9"
+        if path == "/sitemap_index.xml":
+            entries = "".join(f"<sitemap><loc>{base_url}{name}</loc></sitemap>"
+                              for name in ("/sitemap-1.xml", "/sitemap-2.xml.gz"))
+            return f"<?xml version='1.0'?><sitemapindex xmlns='{namespace}'>{entries}</sitemapindex>".encode("utf-8")
+        half = self.pages // 2
+        indexes = range(half) if path == "/sitemap-1.xml" else range(half, self.pages)
+        entries = "".join(f"<url><loc>{base_url}{self.path(n)}</loc><lastmod>{self.lastmod(n)}</lastmod></url>"
+                          for n in indexes)
+        body = f"<?xml version='1.0'?><urlset xmlns='{namespace}'>{entries}</urlset>".encode("utf-8")
+        return gzip.compress(body, mtime=0) if path.endswith(".gz") else body
+
+
+class SyntheticSiteServer:
+    """
+    Runs a SyntheticSite on a background thread. Use as a context manager.
+    """
+
+    def __init__(self, site, host="127.0.0.1", port=0):
+        self.site = site
+        self.requests = Counter()
+        self.connections = 0
+        self.body_bytes = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}/"
+        self._thread = None
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = Counter()
+            self.connections = 0
+            self.body_bytes = 0
+
+    def counters(self):
+        with self._lock:
+            return {"requests": dict(self.requests), "connections": self.connections,
+                    "body_bytes": self.body_bytes}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self._respond(send_body=True)
+
+            def do_HEAD(self):
+                self._respond(send_body=False)
+
+            def _respond(self, send_body):
+                with server._lock:
+                    server.requests[self.command] += 1
+                if server.site.latency:
+                    time.sleep(server.site.latency)
+
+                index = server.site.index_of(self.path)
+                etag = None
+                headers = {}
+                if index is not None:
+                    # Pages never change, so the ETag only depends on the page and the seed.
+                    etag = f'"{server.site.seed}-{index}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.end_headers()
+                        return
+                    status, content_type, body = 200, "text/html; charset=utf-8", server.site.page_html(index)
+                elif self.path == "/robots.txt":
+                    status, content_type, body = 200, "text/plain", server.site.robots_txt(self._base_url())
+                elif self.path in ("/sitemap_index.xml", "/sitemap-1.xml", "/sitemap-2.xml.gz"):
+                    content_type = "application/gzip" if self.path.endswith(".gz") else "application/xml"
+                    status, body = 200, server.site.sitemap_xml(self.path, self._base_url())
+                elif self.path.startswith("/img/"):
+                    status, content_type, body = 200, "image/png", server.site.image(self.path)
+                elif self.path in ("/static/site.css", "/static/app.js"):
+                    content_type, body = server.site.static(self.path)
+                    status = 200
+                    headers["Cache-Control"] = "public, max-age=86400"
+                    if self.path.endswith(".js") and "gzip" in self.headers.get("Accept-Encoding", ""):
+                        body = gzip.compress(body, mtime=0)
+                        headers["Content-Encoding"] = "gzip"
+                else:
+                    status, content_type, body = 404, "text/html; charset=utf-8", b"<html><body>Not found</body></html>"
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if send_body:
+                    with server._lock:
+                        server.body_bytes += len(body)
+                    self.wfile.write(body)
+
+            def _base_url(self):
+                return f"http://{self.headers.get('Host') or '127.0.0.1'}"
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic website for benchmarks.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--images", type=int, default=5)
+    parser.add_argument("--broken-share", type=float, default=0.05)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--page-kb", type=int, default=10)
+    args = parser.parse_args()
+
+    site = SyntheticSite(args.pages, args.fanout, args.images, args.broken_share, args.latency_ms, args.page_kb)
+    server = SyntheticSiteServer(site, port=args.port)
+    print(f"Serving {args.pages} synthetic pages at {server.url} (Ctrl-C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
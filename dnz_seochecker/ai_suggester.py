@@ -3,10 +3,23 @@
 from openai import OpenAI
 import os
 import json
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dotenv import load_dotenv
+from dnz_seochecker.profiler import NULL_PROFILER
+
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+DEFAULT_MODEL = "deepseek/deepseek-r1-0528:free"
+
+# Enough examples for the model to be specific without sending every link on the page.
+MAX_EXAMPLES = 10
+
 
 class AISuggester:
-    def __init__(self):
+    def __init__(self, base_url=None, model=None, max_in_flight=4, cache=None, profiler=None):
         load_dotenv()  # Load from .env file
 
         api_key = os.getenv("OPENROUTER_API_KEY")
@@ -14,34 +27,204 @@ class AISuggester:
             raise EnvironmentError("Missing OPENROUTER_API_KEY in environment or .env file.")
 
         self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
+            base_url=base_url or os.getenv("OPENROUTER_BASE_URL") or DEFAULT_BASE_URL,
             api_key=api_key,
         )
-        self.model = "deepseek/deepseek-r1-0528:free"
+        self.model = model or os.getenv("OPENROUTER_MODEL") or DEFAULT_MODEL
+        self.max_in_flight = max(1, max_in_flight)
+        self.cache = cache if cache is not None else AIResponseCache()
+        self.profiler = profiler or NULL_PROFILER
+
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.calls_avoided = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def findings(self, report):
+        """
+        Compact view of a page report with only the checks that failed.
+        The URL is left out so pages with identical findings share one cached answer.
+        """
+        failing = [s for s in report.get("suggestions", []) if not s.startswith("✅")]
+        findings = {"issues": failing}
+
+        if any("title" in s.lower() for s in failing):
+            findings["title"] = report.get("title")
+        if any("description" in s.lower() for s in failing):
+            findings["description"] = report.get("description")
+
+        broken = report.get("broken_links", [])
+        if broken:
+            findings["broken_links"] = [[link, err] for link, err in broken[:MAX_EXAMPLES]]
+            findings["broken_links_total"] = len(broken)
+
+        missing_alt = [img.get("src") for img in report.get("images", []) if not (img.get("alt") or "").strip()]
+        if missing_alt:
+            findings["images_missing_alt"] = missing_alt[:MAX_EXAMPLES]
+            findings["images_missing_alt_total"] = len(missing_alt)
+        return findings
 
     def build_prompt(self, report):
-        # Same as before
         return (
             "You are an advanced SEO consultant.\n"
-            "Analyze this website SEO report (JSON) and provide actionable, detailed, human-readable recommendations.\n"
+            "Below are the failing checks from a website SEO audit (compact JSON; passing checks are omitted).\n"
+            "Provide actionable, detailed, human-readable recommendations for each issue.\n"
             "Be specific about missing elements, too-long or too-short fields, broken links, meta-tags, and general SEO best practices.\n"
             "Respond in clear bullet points in English or Persian if appropriate.\n\n"
-            f"SEO Report JSON:\n{json.dumps(report, indent=2, ensure_ascii=False)}"
+            f"Findings:\n{json.dumps(self.findings(report), ensure_ascii=False, separators=(',', ':'))}"
         )
-        
 
     def get_ai_suggestions(self, report):
+        text, _ = self.suggest(report)
+        return text
+
+    def submit(self, report):
+        """
+        Start suggest(report) in the background; at most `max_in_flight` requests run at once.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+        return self._executor.submit(self.suggest, report)
+
+    def suggest(self, report):
+        """
+        Return (text, usage) for a page report. Identical findings are answered from the cache.
+        """
         prompt = self.build_prompt(report)
-        print("[INFO] Sending report to OpenRouter model for AI suggestions...")
-
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an advanced SEO consultant."},
-                {"role": "user", "content": prompt}
-            ]
-        )
+        key = hashlib.sha256(f"{self.model}\n{prompt}".encode("utf-8")).hexdigest()
+
+        future, owner = self.cache.claim(key)
+        if not owner:
+            with self._lock:
+                self.calls_avoided += 1
+            self.profiler.count("ai_calls_avoided")
+            return future.result(), {"prompt_tokens": 0, "cached": True}
+
+        try:
+            with self.profiler.stage("ai"):
+                text, prompt_tokens, completion_tokens = self._complete(prompt)
+        except Exception as e:
+            self.cache.fail(key, e)
+            raise
+        self.cache.resolve(key, text)
+
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        return text, {"prompt_tokens": prompt_tokens, "cached": False}
+
+    def _complete(self, prompt):
+        with self._slots:
+            print("[INFO] Sending report to OpenRouter model for AI suggestions...")
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "You are an advanced SEO consultant."},
+                    {"role": "user", "content": prompt}
+                ]
+            )
 
         ai_response = response.choices[0].message.content
         print("[INFO] Received AI suggestions.")
-        return ai_response
+
+        usage = getattr(response, "usage", None)
+        # Some providers omit usage; ~4 characters per token is close enough for reporting.
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or len(prompt) // 4
+        completion_tokens = getattr(usage, "completion_tokens", None) or len(ai_response or "") // 4
+        return ai_response, prompt_tokens, completion_tokens
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "calls_avoided": self.calls_avoided,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self.cache.close()
+
+
+class AIResponseCache:
+    """
+    AI answers keyed by a hash of the prompt. Concurrent requests for the same key share
+    one call. With `path`, answers are kept in SQLite for `ttl` seconds so unchanged pages
+    in the next crawl make no new call. At most `max_memory_entries` answers are kept in
+    memory, so a long-running server does not grow without bound.
+    """
+
+    def __init__(self, path=None, ttl=7 * 86400, max_memory_entries=10000):
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self._futures = {}
+        self._lock = threading.Lock()
+        self.conn = None
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS ai_response ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self.conn.execute("DELETE FROM ai_response WHERE created_at < ?", (time.time() - ttl,))
+            self.conn.commit()
+
+    def claim(self, key):
+        """
+        Return (future, owner). The owner must call resolve() or fail(); everyone else waits on the future.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future, False
+
+            future = Future()
+            self._futures[key] = future
+            self._trim()
+            if self.conn is not None:
+                row = self.conn.execute(
+                    "SELECT response FROM ai_response WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl),
+                ).fetchone()
+                if row is not None:
+                    future.set_result(row[0])
+                    return future, False
+            return future, True
+
+    def _trim(self):
+        # Oldest answers go first; calls still in flight are kept for their waiters.
+        if len(self._futures) <= self.max_memory_entries:
+            return
+        for key in list(self._futures):
+            if len(self._futures) <= self.max_memory_entries:
+                break
+            if self._futures[key].done():
+                del self._futures[key]
+
+    def resolve(self, key, text):
+        with self._lock:
+            self._futures[key].set_result(text)
+            if self.conn is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO ai_response (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, text, time.time()),
+                )
+                self.conn.commit()
+
+    def fail(self, key, error):
+        # Waiters see the error; the key is released so a later page can try again.
+        with self._lock:
+            self._futures.pop(key).set_exception(error)
+
+    def close(self):
+        if self.conn is not None:
+            with self._lock:
+                self.conn.close()
+                self.conn = None
@@ -0,0 +1,180 @@
+# dnz_seochecker/assets.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlparse
+from dnz_seochecker.host_health import CircuitOpenError
+from dnz_seochecker.link_cache import LinkStatusCache
+
+# Images larger than this are reported as oversized.
+MAX_IMAGE_BYTES = 100 * 1024
+# Pages whose HTML and assets add up to more than this are reported as heavy.
+MAX_PAGE_WEIGHT = 4 * 2**20
+# Text assets smaller than this gain little from compression and are not reported.
+MIN_COMPRESSIBLE_BYTES = 1400
+# Without a Content-Length, a body is counted up to this size at most.
+MAX_COUNTED_BYTES = 10 * 2**20
+
+_COMPRESSIBLE_TYPES = ("application/javascript", "application/x-javascript", "application/json",
+                       "application/xml", "image/svg+xml")
+
+
+def cache_lifetime(headers):
+    """
+    Seconds a browser may reuse a response without asking the server again, from its
+    Cache-Control or Expires header. 0 if it must not be stored or must be revalidated,
+    None if neither header is sent.
+    """
+    directives = {}
+    for part in headers.get("Cache-Control", "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip().strip('"')
+    if "no-store" in directives or "no-cache" in directives:
+        return 0
+    if "max-age" in directives:
+        try:
+            return max(0, int(directives["max-age"]))
+        except ValueError:
+            return 0
+    expires = headers.get("Expires")
+    if expires is None:
+        return None
+    try:
+        date = headers.get("Date")
+        now = parsedate_to_datetime(date).timestamp() if date else time.time()
+        return max(0, int(parsedate_to_datetime(expires).timestamp() - now))
+    except (TypeError, ValueError):
+        # An invalid Expires date (often "0" or "-1") means already expired.
+        return 0
+
+
+def page_assets(page_url, facts):
+    """
+    The distinct images, scripts and stylesheets of a page as (absolute URL, kind), in
+    page order. Inline data: URIs and non-HTTP URLs are left out.
+    """
+    assets = {}
+    for kind, sources in (("stylesheet", facts.stylesheets), ("script", facts.scripts),
+                          ("image", (img["src"] for img in facts.images))):
+        for src in sources:
+            if not src or not src.strip():
+                continue
+            url = urljoin(page_url, src.strip())
+            if urlparse(url).scheme in ("http", "https"):
+                assets.setdefault(url.split("#", 1)[0], kind)
+    return list(assets.items())
+
+
+def _compressible(kind, content_type):
+    if content_type:
+        return content_type.startswith("text/") or content_type in _COMPRESSIBLE_TYPES
+    return kind in ("script", "stylesheet")
+
+
+class AssetAuditor:
+    """
+    Probes the images, scripts and stylesheets of each page for size, type, compression
+    and cache lifetime, with one HEAD request per asset (a streamed GET when HEAD is
+    refused or gives no size).
+
+    Probe results go into `cache` (a LinkStatusCache by default) shared by every page, so
+    an asset used site-wide is probed once. A page's new assets are probed `concurrency`
+    at a time on a pool shared by all pages.
+    """
+
+    def __init__(self, client, cache=None, concurrency=8, timeout=5, max_image_bytes=MAX_IMAGE_BYTES,
+                 max_page_weight=MAX_PAGE_WEIGHT):
+        self.client = client
+        self.cache = cache or LinkStatusCache()
+        self.timeout = timeout
+        self.max_image_bytes = max_image_bytes
+        self.max_page_weight = max_page_weight
+        self.executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+
+    def audit(self, page_url, facts, html_bytes):
+        """
+        The `assets` field of a page report: asset counts, total bytes, the page weight
+        (HTML plus assets) and the assets that are oversized, uncompressed, uncacheable or
+        broken.
+        """
+        assets = page_assets(page_url, facts)
+        futures = [self.executor.submit(self.cache.lookup, url, self.probe) for url, _ in assets]
+        summary = {"images": 0, "scripts": 0, "stylesheets": 0, "bytes": 0, "page_weight": html_bytes,
+                   "heavy": False, "oversized_images": [], "uncompressed": [], "uncacheable": [], "broken": [],
+                   "cache": {"hits": 0, "misses": 0}}
+        for (url, kind), future in zip(assets, futures):
+            probe, hit = future.result()
+            summary[kind + "s"] += 1
+            summary["cache"]["hits" if hit else "misses"] += 1
+            if "error" in probe or probe["status"] >= 400:
+                summary["broken"].append([url, probe.get("error") or probe["status"]])
+                continue
+            size = probe["bytes"] or 0
+            summary["bytes"] += size
+            if kind == "image" and size > self.max_image_bytes:
+                summary["oversized_images"].append([url, size])
+            if (probe["encoding"] in (None, "identity") and size >= MIN_COMPRESSIBLE_BYTES
+                    and _compressible(kind, probe["content_type"])):
+                summary["uncompressed"].append([url, size])
+            if not probe["cache_lifetime"]:
+                summary["uncacheable"].append(url)
+        summary["page_weight"] += summary["bytes"]
+        summary["heavy"] = summary["page_weight"] > self.max_page_weight
+        return summary
+
+    def probe(self, url):
+        """
+        {"status", "content_type", "bytes", "encoding", "cache_lifetime"} for one asset,
+        or {"error": message} if it could not be requested. `bytes` is the transfer size.
+        """
+        try:
+            response = self.client.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code in (405, 501) or (response.status_code < 400
+                                                      and "Content-Length" not in response.headers):
+                return self._probe_get(url)
+            return self._result(response, _content_length(response))
+        except CircuitOpenError as e:
+            return {"error": str(e)}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def _probe_get(self, url):
+        response = self.client.get(url, timeout=self.timeout, stream=True)
+        try:
+            size = _content_length(response)
+            if size is None and response.status_code < 400:
+                # Count the bytes as sent, before any Content-Encoding is undone.
+                size = 0
+                for chunk in response.raw.stream(64 * 1024, decode_content=False):
+                    size += len(chunk)
+                    if size >= MAX_COUNTED_BYTES:
+                        break
+            return self._result(response, size)
+        finally:
+            response.close()
+
+    @staticmethod
+    def _result(response, size):
+        headers = response.headers
+        return {
+            "status": response.status_code,
+            "content_type": headers.get("Content-Type", "").split(";", 1)[0].strip().lower() or None,
+            "bytes": size,
+            "encoding": headers.get("Content-Encoding", "").strip().lower() or None,
+            "cache_lifetime": cache_lifetime(headers),
+        }
+
+    def stats(self):
+        return self.cache.stats()
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _content_length(response):
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
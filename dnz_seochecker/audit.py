@@ -0,0 +1,90 @@
+# dnz_seochecker/audit.py
+
+from dnz_seochecker.site_checker import SiteChecker, DEFAULT_MAX_PAGE_BYTES, HTML_CONTENT_TYPES
+from dnz_seochecker.meta_checker import MetaChecker
+from dnz_seochecker.link_checker import LinkChecker
+from dnz_seochecker.seo_analyzer import SEOAnalyzer
+from dnz_seochecker.rules import evaluate_page
+from dnz_seochecker.profiler import NULL_PROFILER
+
+
+def skipped_page_report(url, site):
+    """
+    Report for a page whose body was not read because its Content-Type is not HTML.
+    """
+    report = {
+        "url": url,
+        "status_code": site.status_code,
+        "fetch_timing": site.timing,
+        "download": site.download,
+        "suggestions": [],
+    }
+    report["findings"] = evaluate_page(report)
+    return report
+
+
+def audit_page(url, client=None, ai_suggester=None, link_cache=None, profiler=None,
+               max_bytes=DEFAULT_MAX_PAGE_BYTES, content_types=HTML_CONTENT_TYPES, head_only=False,
+               asset_auditor=None):
+    """
+    The single-page audit behind `check` and the `serve` API. Returns the report dict,
+    or None if the page could not be fetched. AI suggestions are added when an
+    `ai_suggester` is given; if that fails the report is returned without them.
+    `max_bytes`, `content_types` and `head_only` limit the download (see SiteChecker.fetch).
+    With an `asset_auditor`, the page's images, scripts and stylesheets are probed too.
+    """
+    profiler = profiler or NULL_PROFILER
+    site = SiteChecker(url, client=client, profiler=profiler, max_bytes=max_bytes,
+                       content_types=content_types, head_only=head_only)
+    if not site.fetch():
+        return None
+    if site.skipped:
+        return skipped_page_report(url, site)
+
+    link_checker = LinkChecker(site.final_url, site.get_all_links(), cache=link_cache, client=client)
+    with profiler.stage("link_check"):
+        broken_links = link_checker.check_links()
+
+    assets = None
+    if asset_auditor is not None:
+        with profiler.stage("assets"):
+            assets = asset_auditor.audit(site.final_url, site.facts, site.download["bytes"])
+
+    # Build report
+    with profiler.stage("extract"):
+        meta_checker = MetaChecker(facts=site.facts)
+        report = {
+            "url": url,
+            "status_code": site.status_code,
+            "fetch_timing": site.timing,
+            "download": site.download,
+            "title": site.get_title(),
+            "meta": meta_checker.get_meta_tags(),
+            "description": meta_checker.get_description(),
+            "keywords": meta_checker.get_keywords(),
+            "h1": site.get_h1(),
+            "h1_count": site.get_h1_count(),
+            "broken_links": broken_links,
+            "images": site.get_images_with_alt(),
+            "short_circuited": link_checker.short_circuited
+        }
+        if assets is not None:
+            report["assets"] = assets
+
+    # Analyze with local rules
+    with profiler.stage("analyze"):
+        analyzer = SEOAnalyzer(report, facts=site.facts)
+        suggestions = analyzer.run_all_checks()
+        report["suggestions"] = suggestions
+        report["findings"] = evaluate_page(report)
+
+    # Optional AI Analysis
+    if ai_suggester is not None:
+        try:
+            ai_text, usage = ai_suggester.suggest(report)
+            report["ai_suggestions"] = ai_text
+            report["ai_usage"] = usage
+        except Exception as e:
+            print(f"[WARNING] Could not get AI suggestions: {e}")
+
+    return report
@@ -0,0 +1,200 @@
+# dnz_seochecker/batch.py
+
+import asyncio
+import json
+import os
+import re
+import time
+from collections import Counter
+from urllib.parse import urlparse
+from dnz_seochecker.assets import AssetAuditor, MAX_IMAGE_BYTES
+from dnz_seochecker.crawler import Crawler
+from dnz_seochecker.link_cache import LinkStatusCache
+from dnz_seochecker.report_sink import JsonlReportSink, JsonlReports
+from dnz_seochecker.robots import RobotsCache
+from dnz_seochecker.rules import SEVERITIES
+from dnz_seochecker.scheduler import FetchScheduler
+from dnz_seochecker.site_checker import DEFAULT_MAX_PAGE_BYTES, HTML_CONTENT_TYPES
+
+
+def read_seeds(path, default_max_pages=10):
+    """
+    Sites listed in a seed file, one per line: a URL, optionally followed by its page
+    budget ("https://example.com 200" or "https://example.com,200"). Blank lines and
+    lines starting with # are skipped. Returns a list of (url, max_pages).
+    """
+    seeds = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.replace(",", " ").split()
+            if len(fields) > 2 or not urlparse(fields[0]).netloc:
+                raise ValueError(f"{path}:{number}: expected a URL and an optional page budget, got {line!r}")
+            try:
+                max_pages = int(fields[1]) if len(fields) == 2 else default_max_pages
+            except ValueError:
+                raise ValueError(f"{path}:{number}: page budget must be a number, got {fields[1]!r}")
+            seeds.append((fields[0], max_pages))
+    return seeds
+
+
+def site_name(url, taken):
+    # File name for a site's reports: its host, made unique within the batch.
+    name = re.sub(r"[^A-Za-z0-9.-]+", "_", urlparse(url).netloc) or "site"
+    unique, n = name, 2
+    while unique in taken:
+        unique = f"{name}-{n}"
+        n += 1
+    taken.add(unique)
+    return unique
+
+
+class BatchAudit:
+    """
+    Crawls many sites in one process. All crawls run on one event loop and share one
+    FetchScheduler. It holds the `workers` budget, `per_host_limit` and `host_delay`, so
+    the sites take turns and a slow site only delays itself. Each site keeps at most
+    `site_concurrency` pages in flight. The HTTP client, link statuses and AI suggester
+    are shared too. With `robots`, every site obeys its robots.txt rules and Crawl-delay;
+    with `sitemaps`, each crawl is seeded from the site's sitemaps. With `assets`, one
+    AssetAuditor probes the images, scripts and stylesheets of every site.
+
+    Each site's reports stream to <output_dir>/<site>.jsonl, and its site-wide findings go
+    to <site>-findings.json. run() writes the cross-site summary to batch-summary.json.
+    """
+
+    def __init__(self, seeds, output_dir, client, ai_suggester=None, link_store=None, workers=16,
+                 site_concurrency=4, per_host_limit=2, host_delay=0, near_duplicate_distance=3,
+                 robots=False, sitemaps=False, max_page_bytes=DEFAULT_MAX_PAGE_BYTES,
+                 content_types=HTML_CONTENT_TYPES, head_only=False, assets=False, asset_concurrency=8,
+                 max_image_bytes=MAX_IMAGE_BYTES):
+        self.seeds = seeds
+        self.output_dir = output_dir
+        self.client = client
+        self.ai_suggester = ai_suggester
+        self.link_cache = LinkStatusCache(store=link_store)
+        self.site_concurrency = site_concurrency
+        self.near_duplicate_distance = near_duplicate_distance
+        self.robots = RobotsCache(client) if robots else None
+        self.sitemaps = sitemaps
+        self.max_page_bytes = max_page_bytes
+        self.content_types = content_types
+        self.head_only = head_only
+        self.asset_auditor = AssetAuditor(client, concurrency=asset_concurrency,
+                                          max_image_bytes=max_image_bytes) if assets else None
+        self.scheduler = FetchScheduler(workers, per_host_limit, host_delay, robots=self.robots)
+        taken = set()
+        self.sites = [(site_name(url, taken), url, max_pages) for url, max_pages in seeds]
+
+    def run(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        started = time.perf_counter()
+        try:
+            results = asyncio.run(self._run_all())
+        finally:
+            self.scheduler.close()
+            if self.asset_auditor is not None:
+                self.asset_auditor.close()
+        summary = self._summary(results, time.perf_counter() - started)
+        with open(os.path.join(self.output_dir, "batch-summary.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        return summary
+
+    async def _run_all(self):
+        return await asyncio.gather(*(self._run_site(name, url, max_pages)
+                                      for name, url, max_pages in self.sites))
+
+    async def _run_site(self, name, url, max_pages):
+        report_path = os.path.join(self.output_dir, f"{name}.jsonl")
+        findings_path = os.path.join(self.output_dir, f"{name}-findings.json")
+        sink = JsonlReportSink(report_path)
+        crawler = Crawler(url, max_pages=max_pages, no_ai=self.ai_suggester is None,
+                          concurrency=self.site_concurrency, client=self.client, sink=sink,
+                          ai_suggester=self.ai_suggester, link_cache=self.link_cache,
+                          near_duplicate_distance=self.near_duplicate_distance,
+                          robots=self.robots, sitemaps=self.sitemaps, max_page_bytes=self.max_page_bytes,
+                          content_types=self.content_types, head_only=self.head_only,
+                          asset_auditor=self.asset_auditor)
+        started = time.perf_counter()
+        error = None
+        try:
+            await crawler.crawl_async(self.scheduler)
+        except Exception as e:
+            print(f"[ERROR] Crawl of {url} failed: {e}")
+            error = str(e)
+        finally:
+            sink.close()
+        seconds = time.perf_counter() - started
+
+        site_findings = crawler.site_index.findings()
+        with open(findings_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "pages": crawler.site_index.pages,
+                "counts": dict(Counter(finding["code"] for finding in site_findings)),
+                "findings": site_findings,
+            }, f, indent=2, ensure_ascii=False)
+
+        # Page counts are read back from the stream, so no report is held in memory.
+        broken_links = 0
+        page_findings = Counter()
+        issues = Counter()
+        for report in JsonlReports(report_path):
+            broken_links += len(report.get("broken_links", []))
+            for finding in report.get("findings", []):
+                page_findings[finding["severity"]] += 1
+                issues[finding["code"]] += 1
+        for finding in site_findings:
+            issues[finding["code"]] += finding["count"]
+
+        if error is None and sink.count == 0:
+            error = "No page could be fetched."
+        print(f"[INFO] {url}: {sink.count} pages in {seconds:.1f}s")
+        return {
+            "site": name,
+            "url": url,
+            "max_pages": max_pages,
+            "status": "failed" if error else "done",
+            "error": error,
+            "pages": sink.count,
+            "sitemap_urls_seeded": crawler.sitemap_urls_seeded,
+            "blocked_by_robots": crawler.blocked_by_robots,
+            "seconds": round(seconds, 3),
+            "broken_links": broken_links,
+            "page_findings": {severity: page_findings[severity] for severity in SEVERITIES},
+            "site_findings": {severity: sum(1 for f in site_findings if f["severity"] == severity)
+                              for severity in SEVERITIES},
+            "issues": dict(issues.most_common()),
+            "report": report_path,
+            "findings": findings_path,
+        }
+
+    def _summary(self, results, seconds):
+        sites_with_issue = Counter()
+        for result in results:
+            sites_with_issue.update(result["issues"].keys())
+        return {
+            "sites": results,
+            "totals": {
+                "sites": len(results),
+                "failed": sum(1 for result in results if result["status"] == "failed"),
+                "pages": sum(result["pages"] for result in results),
+                "broken_links": sum(result["broken_links"] for result in results),
+                "page_findings": {severity: sum(result["page_findings"][severity] for result in results)
+                                  for severity in SEVERITIES},
+                "site_findings": {severity: sum(result["site_findings"][severity] for result in results)
+                                  for severity in SEVERITIES},
+            },
+            # Issue code -> number of sites that have it, most widespread first.
+            "sites_with_issue": dict(sites_with_issue.most_common()),
+            "seconds": round(seconds, 3),
+            "slowest_site_seconds": max((result["seconds"] for result in results), default=0),
+            "sum_of_site_seconds": round(sum(result["seconds"] for result in results), 3),
+            "scheduler": self.scheduler.stats(),
+            "link_cache": self.link_cache.stats(),
+            "asset_cache": self.asset_auditor.stats() if self.asset_auditor is not None else None,
+            "robots": self.robots.stats() if self.robots is not None else None,
+            "http": self.client.stats(),
+            "host_health": self.client.health.stats(),
+        }
@@ -1,72 +1,119 @@
 
+import cProfile
+import os
+import json
+from collections import Counter
 import typer
-from dnz_seochecker.site_checker import SiteChecker
-from dnz_seochecker.meta_checker import MetaChecker
-from dnz_seochecker.link_checker import LinkChecker
 from dnz_seochecker.report_generator import ReportGenerator
-from dnz_seochecker.seo_analyzer import SEOAnalyzer
-from dnz_seochecker.ai_suggester import AISuggester
+from dnz_seochecker.audit import audit_page
+from dnz_seochecker.ai_suggester import AISuggester, AIResponseCache
 from dnz_seochecker.crawler import Crawler
+from dnz_seochecker.http_client import HttpClient, DEFAULT_USER_AGENT
+from dnz_seochecker.host_health import HostHealth
+from dnz_seochecker.site_checker import HTML_CONTENT_TYPES
+from dnz_seochecker.profiler import StageProfiler, NULL_PROFILER
 
 
 app = typer.Typer(help="A simple SEO analysis CLI tool in Python.")
 
+
+def _start_profiling(profile, profile_output):
+    profiler = StageProfiler() if profile else NULL_PROFILER
+    cprofile = None
+    if profile_output:
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+    return profiler, cprofile
+
+
+def _content_types(value):
+    return tuple(t.strip().lower() for t in value.split(",") if t.strip())
+
+
+def _finish_profiling(profiler, cprofile, profile_output):
+    if cprofile is not None:
+        cprofile.disable()
+        cprofile.dump_stats(profile_output)
+        typer.echo(f"- cProfile stats: {profile_output}")
+    if profiler.enabled:
+        typer.echo("\n⏱  Stage timings")
+        typer.echo(profiler.format_table())
+
+
 @app.command()
 def check(
     url: str = typer.Argument(..., help="The website URL to analyze."),
     output_json: str = typer.Option("report.json", help="Path for JSON report output."),
     output_html: str = typer.Option("report.html", help="Path for HTML report output."),
-    no_ai: bool = typer.Option(False, help="Skip AI-powered analysis.")
+    no_ai: bool = typer.Option(False, help="Skip AI-powered analysis."),
+    user_agent: str = typer.Option(DEFAULT_USER_AGENT, help="User-Agent header sent with every request."),
+    max_retries: int = typer.Option(2, help="Retries for transient errors (timeouts, dropped connections, 429/502/503/504)."),
+    breaker_threshold: int = typer.Option(5, help="Consecutive failures after which a host's remaining requests are skipped."),
+    adaptive_timeouts: bool = typer.Option(False, help="Shorten link check timeouts to each host's observed response time."),
+    ai_cache: str = typer.Option(None, help="SQLite file for reusing AI answers for unchanged findings."),
+    max_page_mb: float = typer.Option(15, help="Read at most this many MB of each page; larger pages are audited truncated."),
+    content_types: str = typer.Option(",".join(HTML_CONTENT_TYPES), help="Comma-separated Content-Types to audit; other responses are not downloaded. Empty audits everything."),
+    head_only: bool = typer.Option(False, help="Stop reading each page after </head> and its first <h1> (links and images further down are not audited)."),
+    assets: bool = typer.Option(False, help="Probe each page's images, scripts and stylesheets for size, compression and caching."),
+    asset_concurrency: int = typer.Option(8, help="Max asset probes in flight at once."),
+    max_image_kb: int = typer.Option(100, help="Images larger than this many KB are reported as oversized."),
+    profile: bool = typer.Option(False, help="Print per-stage timings and add them to the JSON report."),
+    profile_output: str = typer.Option(None, help="Also write cProfile stats to this file.")
 ):
     """
     Analyze the SEO of a single page and output JSON and/or HTML reports.
     """
     typer.echo(f"🔎 Checking site: {url}")
+    profiler, cprofile = _start_profiling(profile, profile_output)
 
-    site = SiteChecker(url)
-    if not site.fetch():
-        typer.echo("[ERROR] Failed to fetch the site.")
-        raise typer.Exit(code=1)
-
-    meta_checker = MetaChecker(site.soup)
-    link_checker = LinkChecker(url, site.get_all_links())
-    broken_links = link_checker.check_links()
-
-    # Build report
-    report = {
-        "url": url,
-        "status_code": site.status_code,
-        "title": site.get_title(),
-        "meta": meta_checker.get_meta_tags(),
-        "description": meta_checker.get_description(),
-        "keywords": meta_checker.get_keywords(),
-        "broken_links": broken_links,
-        "images": site.get_images_with_alt()
-    }
+    health = HostHealth(failure_threshold=breaker_threshold, max_retries=max_retries,
+                        adaptive_timeouts=adaptive_timeouts)
+    client = HttpClient(user_agent=user_agent, health=health)
 
-    # Analyze with local rules
-    analyzer = SEOAnalyzer(report, site.soup)
-    suggestions = analyzer.run_all_checks()
-    report["suggestions"] = suggestions
-
-    # Optional AI Analysis
+    ai_suggester = None
     if not no_ai:
         try:
-            ai_suggester = AISuggester()
-            ai_text = ai_suggester.get_ai_suggestions(report)
-            report["ai_suggestions"] = ai_text
-
-            typer.echo("\n✨ AI-Powered SEO Suggestions ✨")
-            typer.echo(ai_text)
+            ai_suggester = AISuggester(cache=AIResponseCache(ai_cache) if ai_cache else None,
+                                       profiler=profiler)
         except Exception as e:
             typer.echo(f"[WARNING] Could not get AI suggestions: {e}")
 
+    asset_auditor = None
+    if assets:
+        from dnz_seochecker.assets import AssetAuditor
+        asset_auditor = AssetAuditor(client, concurrency=asset_concurrency, max_image_bytes=max_image_kb * 1024)
+
+    try:
+        report = audit_page(url, client=client, ai_suggester=ai_suggester, profiler=profiler,
+                            max_bytes=int(max_page_mb * 2**20), content_types=_content_types(content_types),
+                            head_only=head_only, asset_auditor=asset_auditor)
+    finally:
+        if ai_suggester is not None:
+            ai_suggester.close()
+        if asset_auditor is not None:
+            asset_auditor.close()
+    if report is None:
+        typer.echo("[ERROR] Failed to fetch the site.")
+        raise typer.Exit(code=1)
+
+    if report.get("ai_suggestions"):
+        typer.echo("\n✨ AI-Powered SEO Suggestions ✨")
+        typer.echo(report["ai_suggestions"])
+
     # Write reports
-    generator = ReportGenerator(report)
-    generator.to_json(output_json)
-    generator.to_html(output_html)
+    if profiler.enabled:
+        report["profile"] = profiler.summary()
+    with profiler.stage("report_write"):
+        generator = ReportGenerator(report)
+        generator.to_json(output_json)
+        generator.to_html(output_html)
 
     typer.echo(f"\n✅ Reports generated:\n- {output_json}\n- {output_html}")
+    health_stats = health.stats()
+    if health_stats["short_circuited"] or health_stats["retries"]:
+        typer.echo(f"- Host health: {health_stats['short_circuited']} requests short-circuited, "
+                   f"{health_stats['retries']} retries")
+    _finish_profiling(profiler, cprofile, profile_output)
 
 
 
@@ -76,24 +123,553 @@ def crawl(
     max_pages: int = typer.Option(10, help="Max number of pages to crawl."),
     output_json: str = typer.Option("site-report.json", help="Path for JSON report."),
     output_html: str = typer.Option("site-report.html", help="Path for HTML report."),
-    no_ai: bool = typer.Option(False, help="Skip AI-powered analysis.")
+    output_jsonl: str = typer.Option("site-report.jsonl", help="Path for the JSON Lines report written while crawling."),
+    output_findings: str = typer.Option("site-findings.json", help="Path for site-wide findings (duplicates, orphan pages, broken internal targets)."),
+    html_dir: str = typer.Option(None, help="Write a summary index plus paginated page files to this directory instead of one HTML file."),
+    pages_per_file: int = typer.Option(100, help="Pages per detail file when using --html-dir."),
+    store: str = typer.Option(None, help="SQLite file to also store the reports in, compactly, for the query and export commands."),
+    no_ai: bool = typer.Option(False, help="Skip AI-powered analysis."),
+    concurrency: int = typer.Option(1, help="Number of pages fetched and analyzed in parallel."),
+    per_host_limit: int = typer.Option(None, help="Max parallel requests per host (defaults to --concurrency)."),
+    workers: int = typer.Option(0, help="Worker processes for parsing pages (0 parses in the fetching threads). Use with --concurrency."),
+    link_cache: str = typer.Option(None, help="SQLite file for reusing link check results between runs."),
+    link_cache_ttl: int = typer.Option(86400, help="Seconds a stored link check result stays valid."),
+    http_cache: str = typer.Option(None, help="SQLite file of page reports reused by the next crawl when pages are unchanged."),
+    http_cache_max_age: int = typer.Option(7 * 86400, help="Seconds before a cached page is analyzed in full again."),
+    http_cache_max_mb: int = typer.Option(512, help="Size limit of the HTTP cache; least recently used pages are evicted."),
+    user_agent: str = typer.Option(DEFAULT_USER_AGENT, help="User-Agent header sent with every request."),
+    max_retries: int = typer.Option(2, help="Retries for transient errors (timeouts, dropped connections, 429/502/503/504)."),
+    breaker_threshold: int = typer.Option(5, help="Consecutive failures after which a host's remaining requests are skipped."),
+    adaptive_timeouts: bool = typer.Option(False, help="Shorten link check timeouts to each host's observed response time."),
+    pool_size: int = typer.Option(None, help="Max pooled connections per host (defaults to max(10, --concurrency))."),
+    ai_concurrency: int = typer.Option(4, help="Max AI requests in flight at once."),
+    ai_cache: str = typer.Option(None, help="SQLite file for reusing AI answers for unchanged findings."),
+    near_duplicate_distance: int = typer.Option(3, help="Max differing bits (of 64) between text fingerprints for pages to count as near-duplicates."),
+    skip_near_duplicate_links: bool = typer.Option(False, help="Do not follow links from pages that nearly duplicate an earlier page."),
+    robots: bool = typer.Option(False, help="Obey robots.txt: skip disallowed URLs and wait its Crawl-delay between pages."),
+    sitemaps: bool = typer.Option(False, help="Seed the crawl from the sitemaps in robots.txt (or /sitemap.xml), newest lastmod first."),
+    max_page_mb: float = typer.Option(15, help="Read at most this many MB of each page; larger pages are audited truncated."),
+    content_types: str = typer.Option(",".join(HTML_CONTENT_TYPES), help="Comma-separated Content-Types to audit; other responses are not downloaded. Empty audits everything."),
+    head_only: bool = typer.Option(False, help="Stop reading each page after </head> and its first <h1> (links and images further down are not audited)."),
+    assets: bool = typer.Option(False, help="Probe each page's images, scripts and stylesheets for size, compression and caching."),
+    asset_concurrency: int = typer.Option(8, help="Max asset probes in flight at once."),
+    max_image_kb: int = typer.Option(100, help="Images larger than this many KB are reported as oversized."),
+    state: str = typer.Option(None, help="SQLite file to checkpoint the crawl to, so it can be resumed."),
+    resume: str = typer.Option(None, help="Resume the crawl checkpointed in this state file."),
+    profile: bool = typer.Option(False, help="Print per-stage timings and add them to the JSON report."),
+    profile_output: str = typer.Option(None, help="Also write cProfile stats to this file (main thread only).")
   ):
     from dnz_seochecker.crawler import Crawler
     from dnz_seochecker.report_generator import ReportGenerator
+    from dnz_seochecker.report_sink import FanoutSink, JsonlReportSink, JsonlReports
+    from dnz_seochecker.report_store import ReportStore
+    from dnz_seochecker.crawl_state import CrawlState
+    from dnz_seochecker.url_normalizer import normalize_url
+
+    if state and resume:
+        typer.echo("[ERROR] Use either --state for a new crawl or --resume for an existing one.")
+        raise typer.Exit(code=1)
+    if state and CrawlState.exists(state):
+        typer.echo(f"[ERROR] {state} already holds a crawl. Use --resume {state} to continue it.")
+        raise typer.Exit(code=1)
+    if resume and not CrawlState.exists(resume):
+        typer.echo(f"[ERROR] No crawl state found in {resume}.")
+        raise typer.Exit(code=1)
+
+    crawl_state = CrawlState(state or resume) if (state or resume) else None
+    if resume:
+        if crawl_state.start_url != (normalize_url(url) or url):
+            typer.echo(f"[ERROR] {resume} belongs to a crawl of {crawl_state.start_url}.")
+            raise typer.Exit(code=1)
+        typer.echo(f"♻️  Resuming crawl at {url} ({crawl_state.report_count()} pages already done, max {max_pages} pages)")
+    else:
+        typer.echo(f"🌐 Starting crawl at {url} (max {max_pages} pages)")
+
+    if workers > concurrency:
+        typer.echo(f"[WARNING] At most {concurrency} pages are parsed at once; "
+                   f"use --concurrency {workers} or more to keep every worker busy.")
+
+    profiler, cprofile = _start_profiling(profile, profile_output)
 
-    typer.echo(f"🌐 Starting crawl at {url} (max {max_pages} pages)")
+    link_store = None
+    if link_cache:
+        from dnz_seochecker.link_cache import DiskLinkStore
+        link_store = DiskLinkStore(link_cache, ttl=link_cache_ttl)
 
-    crawler = Crawler(url, max_pages=max_pages, no_ai=no_ai)
-    reports = crawler.crawl()
+    page_cache = None
+    if http_cache:
+        from dnz_seochecker.page_cache import PageCache
+        page_cache = PageCache(http_cache, max_age=http_cache_max_age, max_bytes=http_cache_max_mb * 2**20)
 
-    generator = ReportGenerator(reports)
-    generator.to_json(output_json)
-    generator.to_html(output_html)
+    health = HostHealth(failure_threshold=breaker_threshold, max_retries=max_retries,
+                        adaptive_timeouts=adaptive_timeouts)
+    client = HttpClient(user_agent=user_agent, pool_maxsize=pool_size or max(10, concurrency), health=health)
+    robots_cache = None
+    if robots:
+        from dnz_seochecker.robots import RobotsCache
+        robots_cache = RobotsCache(client)
+    asset_auditor = None
+    if assets:
+        from dnz_seochecker.assets import AssetAuditor
+        asset_auditor = AssetAuditor(client, concurrency=asset_concurrency, max_image_bytes=max_image_kb * 1024)
+    sink = JsonlReportSink(output_jsonl)
+    if store:
+        sink = FanoutSink(sink, ReportStore(store))
+    if resume:
+        # Rebuild the stream from the checkpoint, which drops pages written after the last one.
+        for report in crawl_state.reports():
+            sink.write(report)
+
+    ai_suggester = None
+    if not no_ai:
+        try:
+            ai_suggester = AISuggester(max_in_flight=ai_concurrency,
+                                       cache=AIResponseCache(ai_cache) if ai_cache else None,
+                                       profiler=profiler)
+        except Exception as e:
+            typer.echo(f"[WARNING] Could not get AI suggestions: {e}")
+            no_ai = True
+
+    crawler = Crawler(url, max_pages=max_pages, no_ai=no_ai,
+                      concurrency=concurrency, per_host_limit=per_host_limit,
+                      link_store=link_store, client=client, sink=sink, state=crawl_state,
+                      ai_suggester=ai_suggester, profiler=profiler,
+                      near_duplicate_distance=near_duplicate_distance,
+                      skip_near_duplicate_links=skip_near_duplicate_links,
+                      workers=workers, page_cache=page_cache, robots=robots_cache, sitemaps=sitemaps,
+                      max_page_bytes=int(max_page_mb * 2**20), content_types=_content_types(content_types),
+                      head_only=head_only, asset_auditor=asset_auditor)
+    try:
+        crawler.crawl()
+    finally:
+        if ai_suggester is not None:
+            ai_suggester.close()
+        if asset_auditor is not None:
+            asset_auditor.close()
+        sink.close()
+        if crawl_state is not None:
+            crawl_state.close()
+        if link_store is not None:
+            link_store.close()
+        if page_cache is not None:
+            page_cache.close()
+
+    site_findings = crawler.site_index.findings()
+    with open(output_findings, "w", encoding="utf-8") as f:
+        json.dump({
+            "pages": crawler.site_index.pages,
+            "counts": dict(Counter(finding["code"] for finding in site_findings)),
+            "findings": site_findings,
+        }, f, indent=2, ensure_ascii=False)
+
+    report_store = None
+    if store:
+        # The reports are read back from the store instead of the JSON Lines stream.
+        report_store = ReportStore(store, append=True)
+        report_store.set_site_findings(site_findings)
+    generator = ReportGenerator(report_store if report_store is not None else JsonlReports(output_jsonl))
+    extra = {"profile": profiler.summary()} if profiler.enabled else None
+    try:
+        with profiler.stage("report_write"):
+            generator.to_json(output_json, extra=extra)
+            if html_dir:
+                output_html = generator.to_sharded_html(html_dir, pages_per_file=pages_per_file,
+                                                        site_findings=site_findings)
+            else:
+                generator.to_html(output_html, site_findings=site_findings)
+    finally:
+        if report_store is not None:
+            report_store.close()
 
     typer.echo(f"\n✅ Site crawl complete!")
+    typer.echo(f"- JSON Lines report: {output_jsonl} ({sink.count} pages)")
+    if store:
+        typer.echo(f"- Report store: {store} (see the query and export commands)")
     typer.echo(f"- JSON report: {output_json}")
     typer.echo(f"- HTML report: {output_html}")
+    severities = Counter(finding["severity"] for finding in site_findings)
+    typer.echo(f"- Site findings: {output_findings} ({severities['error']} errors, "
+               f"{severities['warning']} warnings, {severities['notice']} notices)")
+    if sitemaps:
+        typer.echo(f"- Sitemaps: {crawler.sitemap_urls_seeded} URLs seeded")
+    if robots_cache is not None:
+        typer.echo(f"- robots.txt: {crawler.blocked_by_robots} URLs disallowed"
+                   + (f", {robots_cache.crawl_delay(crawler.start_url):g}s crawl delay"
+                      if robots_cache.crawl_delay(crawler.start_url) else ""))
+    if crawler.downloads["truncated"] or crawler.downloads["skipped"] or head_only:
+        typer.echo(f"- Downloads: {crawler.downloads['truncated']} pages truncated at {max_page_mb:g} MB, "
+                   f"{crawler.downloads['skipped']} skipped by Content-Type"
+                   + (f", {crawler.downloads['head_only']} read head-only" if head_only else ""))
+    if asset_auditor is not None:
+        asset_stats = asset_auditor.stats()
+        typer.echo(f"- Assets: {asset_stats['misses']} distinct assets probed, "
+                   f"{asset_stats['hits']} repeat uses served from the asset cache")
+    frontier_stats = crawler.to_visit.stats()
+    typer.echo(f"- Frontier: {frontier_stats['enqueued']} URLs queued, "
+               f"{frontier_stats['duplicates_skipped']} duplicate enqueues avoided")
+    duplicate_stats = crawler.near_duplicates.stats()
+    typer.echo(f"- Near-duplicates: {duplicate_stats['near_duplicates']} of {duplicate_stats['pages']} pages"
+               + (f", links not followed from {crawler.near_duplicate_pages_not_expanded}"
+                  if skip_near_duplicate_links else ""))
+    if page_cache is not None:
+        page_stats = page_cache.stats()
+        typer.echo(f"- HTTP cache: {page_stats['not_modified']} pages not modified, {page_stats['unchanged']} unchanged, "
+                   f"{page_stats['lastmod']} skipped by sitemap lastmod, "
+                   f"{page_stats['analyzed']} analyzed in full; {page_stats['bytes_saved'] / 1024:.1f} KB not downloaded")
+    cache_stats = crawler.link_cache.stats()
+    typer.echo(f"- Link cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    if ai_suggester is not None:
+        ai_stats = ai_suggester.stats()
+        typer.echo(f"- AI: {ai_stats['calls']} calls, {ai_stats['calls_avoided']} avoided by cache, "
+                   f"{ai_stats['prompt_tokens']} prompt tokens sent")
+    health_stats = health.stats()
+    typer.echo(f"- Host health: {health_stats['short_circuited']} requests short-circuited, "
+               f"{health_stats['retries']} retries, {health_stats['circuits_opened']} circuits opened"
+               + (f" ({', '.join(health_stats['open_hosts'])} still failing)" if health_stats['open_hosts'] else ""))
+    http_stats = client.stats()
+    typer.echo(f"- HTTP: {http_stats['requests']} requests over {http_stats['connections_opened']} connections "
+               f"(avg connect {http_stats['avg_connect']:.3f}s, ttfb {http_stats['avg_ttfb']:.3f}s, "
+               f"total {http_stats['avg_total']:.3f}s)")
+    _finish_profiling(profiler, cprofile, profile_output)
    
 
+@app.command()
+def query(
+    store: str = typer.Argument(..., help="Report store written by crawl --store."),
+    missing: str = typer.Option("description", help="List pages missing this field: title, description, keywords or h1."),
+    top_broken: int = typer.Option(10, help="Number of most widespread broken link targets to list."),
+    limit: int = typer.Option(20, help="Max pages listed for --missing."),
+    output_json: str = typer.Option(None, help="Also write the results to this JSON file.")
+  ):
+    from dnz_seochecker.report_store import MISSING_FIELDS, ReportStore
+
+    if missing not in MISSING_FIELDS:
+        typer.echo(f"[ERROR] --missing must be one of {', '.join(MISSING_FIELDS)}.")
+        raise typer.Exit(code=1)
+    if not os.path.exists(store):
+        typer.echo(f"[ERROR] No report store found at {store}.")
+        raise typer.Exit(code=1)
+
+    with ReportStore(store, append=True) as report_store:
+        results = {
+            "pages": len(report_store),
+            "missing": {"field": missing, "pages": report_store.count_missing(missing),
+                        "urls": report_store.pages_missing(missing, limit=limit)},
+            "top_broken_targets": report_store.top_broken_targets(top_broken),
+            "issues": report_store.issue_counts(),
+        }
+
+    typer.echo(f"📦 {store}: {results['pages']} pages")
+    typer.echo(f"\nPages missing {missing}: {results['missing']['pages']}")
+    for page_url in results["missing"]["urls"]:
+        typer.echo(f"  - {page_url}")
+    if results["missing"]["pages"] > len(results["missing"]["urls"]):
+        typer.echo(f"  ... and {results['missing']['pages'] - len(results['missing']['urls'])} more")
+    typer.echo(f"\nTop broken link targets:")
+    for target in results["top_broken_targets"]:
+        typer.echo(f"  - {target['url']} ({target['error']}) on {target['pages']} pages")
+    typer.echo(f"\nIssues by type:")
+    for issue in results["issues"]:
+        typer.echo(f"  - {issue['code']} ({issue['severity']}): {issue['pages']} pages")
+    if output_json:
+        with open(output_json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        typer.echo(f"\n- Results: {output_json}")
+
+
+@app.command()
+def export(
+    store: str = typer.Argument(..., help="Report store written by crawl --store."),
+    output_json: str = typer.Option("site-report.json", help="Path for JSON report."),
+    output_html: str = typer.Option("site-report.html", help="Path for HTML report."),
+    html_dir: str = typer.Option(None, help="Write a summary index plus paginated page files to this directory instead of one HTML file."),
+    pages_per_file: int = typer.Option(100, help="Pages per detail file when using --html-dir.")
+  ):
+    from dnz_seochecker.report_generator import ReportGenerator
+    from dnz_seochecker.report_store import ReportStore
+
+    if not os.path.exists(store):
+        typer.echo(f"[ERROR] No report store found at {store}.")
+        raise typer.Exit(code=1)
+
+    with ReportStore(store, append=True) as report_store:
+        site_findings = report_store.site_findings()
+        generator = ReportGenerator(report_store)
+        generator.to_json(output_json)
+        if html_dir:
+            output_html = generator.to_sharded_html(html_dir, pages_per_file=pages_per_file,
+                                                    site_findings=site_findings)
+        else:
+            generator.to_html(output_html, site_findings=site_findings)
+
+    typer.echo(f"\n✅ Export complete!")
+    typer.echo(f"- JSON report: {output_json}")
+    typer.echo(f"- HTML report: {output_html}")
+
+
+@app.command()
+def batch(
+    seeds: str = typer.Argument(..., help="File with one site per line: a URL and optionally its page budget."),
+    output_dir: str = typer.Option("batch-reports", help="Directory for each site's reports and the cross-site summary."),
+    max_pages: int = typer.Option(10, help="Page budget for sites listed without one."),
+    workers: int = typer.Option(16, help="Pages fetched and analyzed at once across all sites."),
+    site_concurrency: int = typer.Option(4, help="Max pages in flight per site."),
+    per_host_limit: int = typer.Option(2, help="Max parallel page fetches per host."),
+    host_delay: float = typer.Option(0, help="Min seconds between page fetches from the same host."),
+    no_ai: bool = typer.Option(False, help="Skip AI-powered analysis."),
+    link_cache: str = typer.Option(None, help="SQLite file for reusing link check results between runs."),
+    link_cache_ttl: int = typer.Option(86400, help="Seconds a stored link check result stays valid."),
+    user_agent: str = typer.Option(DEFAULT_USER_AGENT, help="User-Agent header sent with every request."),
+    max_retries: int = typer.Option(2, help="Retries for transient errors (timeouts, dropped connections, 429/502/503/504)."),
+    breaker_threshold: int = typer.Option(5, help="Consecutive failures after which a host's remaining requests are skipped."),
+    pool_size: int = typer.Option(None, help="Max pooled connections per host (defaults to max(10, --per-host-limit))."),
+    ai_concurrency: int = typer.Option(4, help="Max AI requests in flight at once."),
+    ai_cache: str = typer.Option(None, help="SQLite file for reusing AI answers for unchanged findings."),
+    near_duplicate_distance: int = typer.Option(3, help="Max differing bits (of 64) between text fingerprints for pages to count as near-duplicates."),
+    robots: bool = typer.Option(False, help="Obey each site's robots.txt rules and Crawl-delay."),
+    sitemaps: bool = typer.Option(False, help="Seed each crawl from the site's sitemaps, newest lastmod first."),
+    max_page_mb: float = typer.Option(15, help="Read at most this many MB of each page; larger pages are audited truncated."),
+    content_types: str = typer.Option(",".join(HTML_CONTENT_TYPES), help="Comma-separated Content-Types to audit; other responses are not downloaded. Empty audits everything."),
+    head_only: bool = typer.Option(False, help="Stop reading each page after </head> and its first <h1> (links and images further down are not audited)."),
+    assets: bool = typer.Option(False, help="Probe each page's images, scripts and stylesheets for size, compression and caching."),
+    asset_concurrency: int = typer.Option(8, help="Max asset probes in flight at once."),
+    max_image_kb: int = typer.Option(100, help="Images larger than this many KB are reported as oversized.")
+):
+    """
+    Crawl every site in a seed file in one process, sharing connections and workers across sites.
+    """
+    from dnz_seochecker.batch import BatchAudit, read_seeds
+
+    try:
+        site_seeds = read_seeds(seeds, default_max_pages=max_pages)
+    except (OSError, ValueError) as e:
+        typer.echo(f"[ERROR] {e}")
+        raise typer.Exit(code=1)
+    if not site_seeds:
+        typer.echo(f"[ERROR] No sites listed in {seeds}.")
+        raise typer.Exit(code=1)
+    typer.echo(f"🌐 Crawling {len(site_seeds)} sites ({workers} workers, "
+               f"{site_concurrency} pages per site, {per_host_limit} per host)")
+
+    link_store = None
+    if link_cache:
+        from dnz_seochecker.link_cache import DiskLinkStore
+        link_store = DiskLinkStore(link_cache, ttl=link_cache_ttl)
+
+    ai_suggester = None
+    if not no_ai:
+        try:
+            ai_suggester = AISuggester(max_in_flight=ai_concurrency,
+                                       cache=AIResponseCache(ai_cache) if ai_cache else None)
+        except Exception as e:
+            typer.echo(f"[WARNING] Could not get AI suggestions: {e}")
+
+    health = HostHealth(failure_threshold=breaker_threshold, max_retries=max_retries)
+    client = HttpClient(user_agent=user_agent, pool_connections=max(100, 2 * len(site_seeds)),
+                        pool_maxsize=pool_size or max(10, per_host_limit), health=health)
+    audit = BatchAudit(site_seeds, output_dir, client, ai_suggester=ai_suggester, link_store=link_store,
+                       workers=workers, site_concurrency=site_concurrency, per_host_limit=per_host_limit,
+                       host_delay=host_delay, near_duplicate_distance=near_duplicate_distance,
+                       robots=robots, sitemaps=sitemaps, max_page_bytes=int(max_page_mb * 2**20),
+                       content_types=_content_types(content_types), head_only=head_only,
+                       assets=assets, asset_concurrency=asset_concurrency, max_image_bytes=max_image_kb * 1024)
+    try:
+        summary = audit.run()
+    finally:
+        if ai_suggester is not None:
+            ai_suggester.close()
+        if link_store is not None:
+            link_store.close()
+        client.close()
+
+    typer.echo(f"\n✅ Batch complete!")
+    typer.echo(f"{'site':<40}{'status':>8}{'pages':>7}{'errors':>8}{'warnings':>10}{'broken':>8}{'secs':>8}")
+    for site in summary["sites"]:
+        findings = site["page_findings"]
+        typer.echo(f"{site['site'][:39]:<40}{site['status']:>8}{site['pages']:>7}{findings['error']:>8}"
+                   f"{findings['warning']:>10}{site['broken_links']:>8}{site['seconds']:>8.1f}")
+    totals = summary["totals"]
+    typer.echo(f"- Sites: {totals['sites']} ({totals['failed']} failed), {totals['pages']} pages, "
+               f"{totals['broken_links']} broken links")
+    widespread = list(summary["sites_with_issue"].items())[:5]
+    if widespread:
+        typer.echo("- Most widespread issues: " + ", ".join(f"{code} ({count} sites)" for code, count in widespread))
+    typer.echo(f"- Wall time {summary['seconds']:.1f}s; slowest site {summary['slowest_site_seconds']:.1f}s, "
+               f"all sites added up {summary['sum_of_site_seconds']:.1f}s")
+    typer.echo(f"- Reports: {output_dir}/<site>.jsonl, summary: {output_dir}/batch-summary.json")
+
+
+@app.command()
+def crawl_sharded(
+    url: str = typer.Argument(..., help="Root URL to crawl."),
+    shards: int = typer.Option(4, help="Number of shards, each crawled by its own worker process."),
+    max_pages: int = typer.Option(10, help="Max number of pages to crawl, over all shards."),
+    concurrency: int = typer.Option(4, help="Pages fetched and analyzed in parallel by each shard worker."),
+    queue: str = typer.Option("crawl-queue.db", help="SQLite work queue shared by the coordinator and the shard workers."),
+    shard_dir: str = typer.Option("shards", help="Directory for the per-shard report streams."),
+    spawn: bool = typer.Option(True, help="Start the shard workers as local processes. With --no-spawn, run shard-worker for each shard yourself, on the same machine (the queue file must not be on a network file system)."),
+    lease_timeout: int = typer.Option(300, help="Seconds after which a URL leased by a worker is handed out again."),
+    output_json: str = typer.Option("site-report.json", help="Path for JSON report."),
+    output_html: str = typer.Option("site-report.html", help="Path for HTML report."),
+    output_jsonl: str = typer.Option("site-report.jsonl", help="Path for the merged JSON Lines report."),
+    output_findings: str = typer.Option("site-findings.json", help="Path for site-wide findings (duplicates, orphan pages, broken internal targets)."),
+    html_dir: str = typer.Option(None, help="Write a summary index plus paginated page files to this directory instead of one HTML file."),
+    pages_per_file: int = typer.Option(100, help="Pages per detail file when using --html-dir."),
+    user_agent: str = typer.Option(DEFAULT_USER_AGENT, help="User-Agent header sent with every request."),
+    near_duplicate_distance: int = typer.Option(3, help="Max differing bits (of 64) between text fingerprints for pages to count as near-duplicates."),
+    robots: bool = typer.Option(False, help="Do not crawl URLs that robots.txt disallows (its Crawl-delay is not applied across shards)."),
+    max_page_mb: float = typer.Option(15, help="Read at most this many MB of each page; larger pages are audited truncated."),
+    content_types: str = typer.Option(",".join(HTML_CONTENT_TYPES), help="Comma-separated Content-Types to audit; other responses are not downloaded. Empty audits everything."),
+    head_only: bool = typer.Option(False, help="Stop reading each page after </head> and its first <h1> (links and images further down are not audited)."),
+    assets: bool = typer.Option(False, help="Probe each page's images, scripts and stylesheets for size, compression and caching."),
+    profile: bool = typer.Option(False, help="Print per-stage timings and add them to the JSON report.")
+  ):
+    """
+    Crawl a large site with several worker processes, each owning a shard of the URLs.
+    AI suggestions are not made in a sharded crawl.
+    """
+    from dnz_seochecker.report_sink import JsonlReportSink, JsonlReports
+    from dnz_seochecker.sharded import ShardedCrawl
+    from dnz_seochecker.work_queue import SqliteWorkQueue
+
+    typer.echo(f"🌐 Starting sharded crawl at {url} ({shards} shards, max {max_pages} pages)")
+    profiler, _ = _start_profiling(profile, None)
+    work_queue = SqliteWorkQueue(queue)
+    worker_options = {
+        "concurrency": concurrency, "user_agent": user_agent, "robots": robots, "assets": assets,
+        "max_page_bytes": int(max_page_mb * 2**20), "content_types": _content_types(content_types),
+        "head_only": head_only,
+    }
+    sharded = ShardedCrawl(url, work_queue, shard_dir, shards=shards, max_pages=max_pages,
+                           near_duplicate_distance=near_duplicate_distance, lease_timeout=lease_timeout,
+                           worker_options=worker_options)
+    try:
+        with profiler.stage("shards"):
+            sharded.run(spawn=spawn)
+        queue_stats = work_queue.stats()
+    finally:
+        work_queue.close()
+
+    with profiler.stage("merge"):
+        with JsonlReportSink(output_jsonl) as sink:
+            site_index = sharded.merge(sink)
+    site_findings = site_index.findings()
+    with open(output_findings, "w", encoding="utf-8") as f:
+        json.dump({
+            "pages": site_index.pages,
+            "counts": dict(Counter(finding["code"] for finding in site_findings)),
+            "findings": site_findings,
+        }, f, indent=2, ensure_ascii=False)
+
+    generator = ReportGenerator(JsonlReports(output_jsonl))
+    extra = {"profile": profiler.summary()} if profiler.enabled else None
+    with profiler.stage("report_write"):
+        generator.to_json(output_json, extra=extra)
+        if html_dir:
+            output_html = generator.to_sharded_html(html_dir, pages_per_file=pages_per_file,
+                                                    site_findings=site_findings)
+        else:
+            generator.to_html(output_html, site_findings=site_findings)
+
+    typer.echo(f"\n✅ Sharded crawl complete!")
+    typer.echo(f"- JSON Lines report: {output_jsonl} ({sink.count} pages)")
+    typer.echo(f"- JSON report: {output_json}")
+    typer.echo(f"- HTML report: {output_html}")
+    severities = Counter(finding["severity"] for finding in site_findings)
+    typer.echo(f"- Site findings: {output_findings} ({severities['error']} errors, "
+               f"{severities['warning']} warnings, {severities['notice']} notices)")
+    typer.echo(f"- Queue: {queue_stats['visited']} URLs visited, {queue_stats['failed']} failed, "
+               f"{queue_stats['queued']} left unvisited; {sharded.restarts} worker restarts, "
+               f"{sharded.duplicates_dropped} repeated pages dropped")
+    if profiler.enabled:
+        typer.echo("\n⏱  Stage timings")
+        typer.echo(profiler.format_table())
+
+
+@app.command()
+def shard_worker(
+    queue: str = typer.Argument(..., help="SQLite work queue of a crawl started with crawl-sharded --no-spawn."),
+    shard: int = typer.Option(..., help="Shard to crawl (0 to shards - 1)."),
+    shard_dir: str = typer.Option("shards", help="Directory for the per-shard report streams; the coordinator merges them from there."),
+    concurrency: int = typer.Option(4, help="Pages fetched and analyzed in parallel."),
+    user_agent: str = typer.Option(DEFAULT_USER_AGENT, help="User-Agent header sent with every request."),
+    robots: bool = typer.Option(False, help="Do not crawl URLs that robots.txt disallows."),
+    max_page_mb: float = typer.Option(15, help="Read at most this many MB of each page; larger pages are audited truncated."),
+    content_types: str = typer.Option(",".join(HTML_CONTENT_TYPES), help="Comma-separated Content-Types to audit; other responses are not downloaded. Empty audits everything."),
+    head_only: bool = typer.Option(False, help="Stop reading each page after </head> and its first <h1> (links and images further down are not audited)."),
+    assets: bool = typer.Option(False, help="Probe each page's images, scripts and stylesheets for size, compression and caching.")
+  ):
+    """
+    Crawl one shard of a sharded crawl started with --no-spawn, on the machine that holds the queue.
+    """
+    from dnz_seochecker.sharded import ShardWorker, shard_stream_path
+    from dnz_seochecker.work_queue import SqliteWorkQueue
+
+    work_queue = SqliteWorkQueue(queue)
+    if work_queue.shards is None or not 0 <= shard < work_queue.shards:
+        typer.echo(f"[ERROR] {queue} holds no crawl with a shard {shard}.")
+        raise typer.Exit(code=1)
+    os.makedirs(shard_dir, exist_ok=True)
+    worker = ShardWorker(work_queue, shard, shard_stream_path(shard_dir, shard), concurrency=concurrency,
+                         user_agent=user_agent, robots=robots, assets=assets,
+                         max_page_bytes=int(max_page_mb * 2**20), content_types=_content_types(content_types),
+                         head_only=head_only)
+    try:
+        pages = worker.run()
+    finally:
+        work_queue.close()
+    typer.echo(f"✅ Shard {shard} done: {pages} pages")
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Address to listen on."),
+    port: int = typer.Option(8000, help="Port to listen on."),
+    workers: int = typer.Option(4, help="Jobs run at the same time."),
+    queue_size: int = typer.Option(32, help="Jobs allowed to wait; further requests get 503 until there is room."),
+    max_crawl_pages: int = typer.Option(500, help="Upper limit for max_pages of crawl jobs."),
+    max_crawl_concurrency: int = typer.Option(8, help="Upper limit for concurrency of crawl jobs."),
+    no_ai: bool = typer.Option(False, help="Skip AI-powered analysis for every job."),
+    user_agent: str = typer.Option(DEFAULT_USER_AGENT, help="User-Agent header sent with every request."),
+    pool_size: int = typer.Option(None, help="Max pooled connections per host (defaults to max(10, --workers * --max-crawl-concurrency))."),
+    ai_concurrency: int = typer.Option(4, help="Max AI requests in flight at once."),
+    ai_cache: str = typer.Option(None, help="SQLite file for reusing AI answers for unchanged findings."),
+    link_cache: str = typer.Option(None, help="SQLite file for sharing link check results between jobs and runs."),
+    link_cache_ttl: int = typer.Option(3600, help="Seconds a stored link check result stays valid.")
+):
+    """
+    Run a local HTTP/JSON API for check and crawl jobs, keeping connection pools and caches warm between jobs.
+    """
+    from dnz_seochecker.server import AuditService, AuditServer
+
+    ai_suggester = None
+    if not no_ai:
+        try:
+            ai_suggester = AISuggester(max_in_flight=ai_concurrency,
+                                       cache=AIResponseCache(ai_cache) if ai_cache else None)
+        except Exception as e:
+            typer.echo(f"[WARNING] Could not get AI suggestions: {e}")
+
+    link_store = None
+    if link_cache:
+        from dnz_seochecker.link_cache import DiskLinkStore
+        link_store = DiskLinkStore(link_cache, ttl=link_cache_ttl)
+
+    client = HttpClient(user_agent=user_agent, pool_connections=100,
+                        pool_maxsize=pool_size or max(10, workers * max_crawl_concurrency))
+    service = AuditService(client=client, ai_suggester=ai_suggester, link_store=link_store,
+                           workers=workers, queue_size=queue_size, max_crawl_pages=max_crawl_pages,
+                           max_crawl_concurrency=max_crawl_concurrency)
+    server = AuditServer((host, port), service)
+    typer.echo(f"🚀 Serving SEO audits on http://{host}:{server.server_address[1]}/ (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
 # if __name__ == "__main__":
 #     app()
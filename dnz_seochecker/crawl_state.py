@@ -0,0 +1,110 @@
+# dnz_seochecker/crawl_state.py
+
+import json
+import os
+import sqlite3
+
+
+class CrawlState:
+    """
+    SQLite checkpoint of a crawl: the frontier as an append-only log with a read position,
+    the visited URLs and the completed page reports.
+
+    Changes are buffered and written in one transaction every `batch_size` frontier entries,
+    so checkpointing costs a few list appends per page. A crash loses at most one batch,
+    and those pages are simply crawled again on resume.
+    """
+
+    def __init__(self, path, batch_size=25):
+        self.path = path
+        self.batch_size = batch_size
+        # The concurrent crawl checkpoints from a writer thread, never two threads at once.
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS crawl_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS frontier (seq INTEGER PRIMARY KEY, url TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS visited (url TEXT PRIMARY KEY);"
+            "CREATE TABLE IF NOT EXISTS reports (seq INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT NOT NULL, report TEXT NOT NULL);"
+        )
+        self.conn.commit()
+
+        self.start_url = self._get_meta("start_url")
+        self.consumed = int(self._get_meta("consumed") or 0)
+        self.enqueued = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM frontier").fetchone()[0]
+        self._new_frontier = []
+        self._new_visited = []
+        self._new_reports = []
+        self._pending = 0
+
+    @classmethod
+    def exists(cls, path):
+        if not os.path.exists(path):
+            return False
+        state = cls(path)
+        try:
+            return state.start_url is not None
+        finally:
+            state.conn.close()
+
+    def start(self, start_url):
+        # Written straight away so a crash before the first batch can still be resumed.
+        self.start_url = start_url
+        self.enqueue(start_url)
+        self.flush()
+        self.conn.execute("INSERT OR REPLACE INTO crawl_meta VALUES ('start_url', ?)", (start_url,))
+        self.conn.commit()
+
+    def enqueue(self, url):
+        self.enqueued += 1
+        self._new_frontier.append((self.enqueued, url))
+
+    def consume(self, visited_url=None, report=None):
+        """
+        Record that the next frontier entry was handled, with the URL it marked visited
+        and the report it produced, if any.
+        """
+        self.consumed += 1
+        if visited_url is not None:
+            self._new_visited.append((visited_url,))
+        if report is not None:
+            self._new_reports.append((report["url"], json.dumps(report, ensure_ascii=False)))
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO frontier (seq, url) VALUES (?, ?)", self._new_frontier)
+            self.conn.executemany("INSERT OR IGNORE INTO visited (url) VALUES (?)", self._new_visited)
+            self.conn.executemany("INSERT INTO reports (url, report) VALUES (?, ?)", self._new_reports)
+            self.conn.execute("INSERT OR REPLACE INTO crawl_meta VALUES ('consumed', ?)", (str(self.consumed),))
+        self._new_frontier = []
+        self._new_visited = []
+        self._new_reports = []
+        self._pending = 0
+
+    def visited_urls(self):
+        return {row[0] for row in self.conn.execute("SELECT url FROM visited")}
+
+    def frontier_urls(self):
+        for row in self.conn.execute("SELECT url FROM frontier ORDER BY seq"):
+            yield row[0]
+
+    def pending_urls(self):
+        for row in self.conn.execute("SELECT url FROM frontier WHERE seq > ? ORDER BY seq", (self.consumed,)):
+            yield row[0]
+
+    def reports(self):
+        for row in self.conn.execute("SELECT report FROM reports ORDER BY seq"):
+            yield json.loads(row[0])
+
+    def report_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM crawl_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
@@ -1,80 +1,442 @@
 # dnz_seochecker/crawler.py
-import requests
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
-from collections import deque
-from dnz_seochecker.site_checker import SiteChecker
+from collections import Counter, deque
+from dnz_seochecker.site_checker import SiteChecker, DEFAULT_MAX_PAGE_BYTES, HTML_CONTENT_TYPES
+from dnz_seochecker.audit import skipped_page_report
 from dnz_seochecker.meta_checker import MetaChecker
 from dnz_seochecker.link_checker import LinkChecker
+from dnz_seochecker.link_cache import LinkStatusCache
+from dnz_seochecker.http_client import HttpClient
+from dnz_seochecker.frontier import Frontier
+from dnz_seochecker.url_normalizer import normalize_url
 from dnz_seochecker.seo_analyzer import SEOAnalyzer
+from dnz_seochecker.rules import SiteIndex, evaluate_page
+from dnz_seochecker.near_duplicates import NearDuplicateIndex, simhash
+from dnz_seochecker.page_worker import ParsePool
+from dnz_seochecker.page_cache import PageCache, REUSED, body_hash
+from dnz_seochecker.scheduler import FetchScheduler
+from dnz_seochecker.robots import RobotsCache
+from dnz_seochecker.sitemap import iter_sitemap, newest_entries
 from dnz_seochecker.ai_suggester import AISuggester
+from dnz_seochecker.profiler import NULL_PROFILER
 
 class Crawler:
-    def __init__(self, start_url, max_pages=10, no_ai=False):
-        self.start_url = start_url
+    def __init__(self, start_url, max_pages=10, no_ai=False, concurrency=1, per_host_limit=None,
+                 link_store=None, client=None, sink=None, state=None, ai_suggester=None,
+                 profiler=None, near_duplicate_distance=3, skip_near_duplicate_links=False,
+                 workers=0, page_cache=None, link_cache=None, robots=None, sitemaps=False,
+                 max_page_bytes=DEFAULT_MAX_PAGE_BYTES, content_types=HTML_CONTENT_TYPES, head_only=False,
+                 asset_auditor=None):
+        self.start_url = normalize_url(start_url) or start_url
         self.max_pages = max_pages
         self.no_ai = no_ai
+        self.concurrency = max(1, concurrency)
+        self.per_host_limit = max(1, per_host_limit or self.concurrency)
         self.visited = set()
-        self.to_visit = deque([start_url])
+        self.to_visit = Frontier()
         self.reports = []
+        self.sink = sink
+        self.state = state
+        self.link_cache = link_cache or LinkStatusCache(store=link_store)
+        self.client = client or HttpClient(pool_maxsize=max(10, self.concurrency))
+        self.profiler = profiler or NULL_PROFILER
+        self.near_duplicates = NearDuplicateIndex(near_duplicate_distance)
+        self.skip_near_duplicate_links = skip_near_duplicate_links
+        self.workers = max(0, workers)
+        self.page_cache = page_cache
+        self.robots = robots
+        self.sitemaps = sitemaps
+        self.max_page_bytes = max_page_bytes
+        self.content_types = content_types
+        self.head_only = head_only
+        self.asset_auditor = asset_auditor
+        self.lastmod = {}
+        self.sitemap_urls_seeded = 0
+        self.blocked_by_robots = 0
+        self.downloads = Counter()
+        self._parse_pool = None
+        self.near_duplicate_pages_not_expanded = 0
+        self._finishing = deque()
 
-        parsed = urlparse(start_url)
+        # One suggester for the whole crawl: a single client, response cache and request limit.
+        self.ai_suggester = None
+        if not no_ai:
+            try:
+                self.ai_suggester = ai_suggester or AISuggester()
+            except Exception as e:
+                print(f"[WARNING] Could not get AI suggestions: {e}")
+        ai_in_flight = self.ai_suggester.max_in_flight if self.ai_suggester else 0
+        self._finishing_limit = ai_in_flight + self.concurrency
+
+        parsed = urlparse(self.start_url)
         self.base_domain = parsed.netloc
 
+        resuming = state is not None and state.start_url is not None
+        self._resuming = resuming
+        self.site_index = SiteIndex(self.start_url, track_links=not resuming)
+        if resuming:
+            # Resume: finished pages stay finished, the frontier continues where it stopped.
+            self.visited = state.visited_urls()
+            for report in state.reports():
+                self.site_index.add_page(report)
+                self.near_duplicates.add(report["url"], int(report.get("content_simhash") or "0", 16))
+            for url in state.frontier_urls():
+                self.to_visit.mark_seen(url)
+            for url in state.pending_urls():
+                self.to_visit.restore(url)
+        else:
+            self.to_visit.add(self.start_url)
+            if state is not None:
+                state.start(self.start_url)
+
     def is_internal(self, link):
-        parsed_link = urlparse(link)
-        return parsed_link.netloc == "" or parsed_link.netloc == self.base_domain
+        if urlparse(link).netloc == "":
+            return True
+        # Compared in normalized form, so Example.com and example.com:80 are this site too.
+        normalized = normalize_url(link)
+        return normalized is not None and urlparse(normalized).netloc == self.base_domain
 
     def crawl(self):
+        if self.workers and self._parse_pool is None:
+            self._parse_pool = ParsePool(self.workers)
+        try:
+            self._prepare()
+            # A single worker keeps the plain loop so small crawls pay no event loop overhead,
+            # unless robots.txt asks for a crawl delay, which the scheduler applies.
+            if self.concurrency == 1 and not (self.robots and self.robots.crawl_delay(self.start_url)):
+                self._crawl_sequential()
+            else:
+                asyncio.run(self._crawl_concurrent())
+        finally:
+            self._finish_ready(wait=True)
+            if self._parse_pool is not None:
+                self._parse_pool.close()
+                self._parse_pool = None
+        return self.reports
+
+    def _crawl_sequential(self):
         while self.to_visit and len(self.visited) < self.max_pages:
             url = self.to_visit.popleft()
-            if url in self.visited:
+            result = None if url in self.visited else self.process_page(url)
+            self._commit(url, result)
+            self._finish_ready()
+
+    async def crawl_async(self, scheduler):
+        """
+        Crawl on an event loop shared with other crawls. `scheduler` is a FetchScheduler
+        holding the worker budget and host limits they all share.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._prepare)
+            await self._crawl_concurrent(scheduler)
+        finally:
+            # Waiting for the last AI suggestions must not hold up the other crawls on the loop.
+            await loop.run_in_executor(None, self._finish_ready, True)
+        return self.reports
+
+    def _prepare(self):
+        # Requests made before the first page: the start host's robots.txt, so enqueueing
+        # never waits for it, and the sitemaps. A resumed crawl keeps its own frontier.
+        if self.robots is not None:
+            self.robots.rules(self.start_url)
+        if self.sitemaps and not self._resuming:
+            self._seed_from_sitemaps()
+
+    def _seed_from_sitemaps(self):
+        robots = self.robots or RobotsCache(self.client)
+        sitemap_urls = robots.sitemaps(self.start_url) or [urljoin(self.start_url, "/sitemap.xml")]
+
+        def accept(url):
+            if not self.is_internal(url):
+                return False
+            if self.robots is not None and not self.robots.allowed(url):
+                self.blocked_by_robots += 1
+                return False
+            return True
+
+        # The sitemaps are streamed; only the newest `max_pages` entries are kept. They are
+        # queued after the start page, newest first, ahead of any link found by crawling.
+        entries = (entry for sitemap_url in sitemap_urls for entry in iter_sitemap(self.client, sitemap_url))
+        for url, lastmod in newest_entries(entries, self.max_pages, accept):
+            url = normalize_url(url)
+            if url is None:
                 continue
+            if self.to_visit.add(url):
+                self.sitemap_urls_seeded += 1
+                if self.state is not None:
+                    self.state.enqueue(url)
+            if lastmod is not None:
+                self.lastmod[url] = lastmod
+        print(f"🗺  Seeded {self.sitemap_urls_seeded} URLs from {len(sitemap_urls)} sitemap(s)")
+
+    async def _crawl_concurrent(self, scheduler=None):
+        # Pages are fetched ahead of time in frontier order, but committed strictly in
+        # that order, so the report list matches what the sequential crawl produces.
+        own_scheduler = scheduler is None
+        if own_scheduler:
+            scheduler = FetchScheduler(self.concurrency, self.per_host_limit, robots=self.robots)
+        in_flight = {}
+        window = deque()
+        # Finished pages are written on their own thread: the loop may be shared with other crawls.
+        writer = ThreadPoolExecutor(max_workers=1)
+
+        async def run(url):
+            return await scheduler.run(url, self.process_page, url)
+
+        try:
+            while len(self.visited) < self.max_pages:
+                # Every popped entry goes through the window, so entries are committed
+                # (and checkpointed) in frontier order even when nothing is fetched for them.
+                # No more fetches start than the page budget has room for; a failed one is
+                # replaced once it is committed.
+                while self.to_visit and len(in_flight) < self.concurrency \
+                        and len(self.visited) + len(in_flight) < self.max_pages:
+                    url = self.to_visit.popleft()
+                    window.append(url)
+                    if url not in self.visited and url not in in_flight:
+                        in_flight[url] = asyncio.ensure_future(run(url))
+                if not window:
+                    break
+
+                url = window.popleft()
+                task = in_flight.get(url)
+                result = await task if task is not None else None
+                if task is not None and url not in window:
+                    del in_flight[url]
+                self._commit(url, result)
+                await self._finish_ready_async(writer)
+        finally:
+            for task in in_flight.values():
+                task.cancel()
+            writer.shutdown(wait=True)
+            if own_scheduler:
+                scheduler.close()
 
-            print(f"🔎 Crawling: {url}")
+    def _enqueue(self, url):
+        url = normalize_url(url)
+        if url is None:
+            return None
+        if self.robots is not None and not self.to_visit.has_seen(url) and not self.robots.allowed(url):
+            # Disallowed pages are never queued. Marking them seen checks the rules once per URL.
+            self.to_visit.mark_seen(url)
+            self.blocked_by_robots += 1
+            return url
+        if self.to_visit.add(url) and self.state is not None:
+            self.state.enqueue(url)
+        return url
+
+    def _commit(self, url, result):
+        # Called once per frontier entry, in frontier order.
+        if result is None or url in self.visited:
+            self._finishing.append((None, None, None, None))
+            return
+        report, links = result
+        self.visited.add(url)
+
+        # Fingerprints are matched here, in frontier order, so the earliest copy is the original.
+        expand = True
+        if report is not None:
+            self.downloads[(report.get("download") or {}).get("status")] += 1
+            duplicate_of = self.near_duplicates.add(url, int(report.get("content_simhash") or "0", 16))
+            report["near_duplicate_of"] = duplicate_of
+            if duplicate_of is not None and self.skip_near_duplicate_links:
+                expand = False
+                self.near_duplicate_pages_not_expanded += 1
+
+        # Add new internal links. Links of a skipped copy still count as inbound links.
+        internal_links = []
+        for link in links:
+            full_link = urljoin(url, link)
+            if self.is_internal(full_link):
+                target = self._enqueue(full_link) if expand else normalize_url(full_link)
+                if target is not None:
+                    internal_links.append(target)
+        self.site_index.add_links(url, internal_links)
+
+        # AI suggestions run in the background while the crawl moves on. A reused report
+        # keeps the suggestions it was stored with.
+        reused = report is not None and (report.get("http_cache") or {}).get("status") in REUSED
+        future = None
+        skipped = report is not None and (report.get("download") or {}).get("status") == "skipped"
+        if report is not None and self.ai_suggester is not None and not skipped \
+                and not (reused and "ai_suggestions" in report):
+            future = self.ai_suggester.submit(report)
+        self._finishing.append((url, report, future, links))
+
+    async def _finish_ready_async(self, writer):
+        # _finish_ready for the concurrent crawl. The wait for the oldest AI suggestions is
+        # awaited and the reports are written on `writer`, so the event loop keeps serving
+        # the other crawls.
+        while len(self._finishing) > self._finishing_limit:
+            future = self._finishing[0][2]
+            if future is None or future.done():
+                break
             try:
-                site = SiteChecker(url)
-                if not site.fetch():
-                    continue
+                await asyncio.wrap_future(future)
+            except Exception:
+                pass  # reported by _finish_ready
+        future = self._finishing[0][2] if self._finishing else None
+        if self._finishing and (future is None or future.done()):
+            await asyncio.get_running_loop().run_in_executor(writer, self._finish_ready)
+
+    def _finish_ready(self, wait=False):
+        # Entries leave in frontier order once their AI suggestions are back. If too many
+        # are waiting, block on the oldest so memory stays bounded.
+        while self._finishing:
+            url, report, future, links = self._finishing[0]
+            if future is not None and not future.done() and not wait \
+                    and len(self._finishing) <= self._finishing_limit:
+                break
+            self._finishing.popleft()
+
+            if future is not None:
+                try:
+                    ai_text, usage = future.result()
+                    report["ai_suggestions"] = ai_text
+                    report["ai_usage"] = usage
+                except Exception as e:
+                    print(f"[WARNING] Could not get AI suggestions: {e}")
+
+            if report is not None:
+                self.profiler.count("pages")
+                self.site_index.add_page(report)
+                validators = report.get("http_cache")
+                if validators is not None and validators["status"] not in REUSED:
+                    self.page_cache.store(url, validators, report, links)
+                # With a sink, reports go straight to disk instead of piling up in memory.
+                if self.sink is not None:
+                    with self.profiler.stage("report_write"):
+                        self.sink.write(report)
+                else:
+                    self.reports.append(report)
+            if self.state is not None:
+                self.state.consume(visited_url=url, report=report)
 
-                self.visited.add(url)
+    def process_page(self, url):
+        """
+        Fetch and analyze one page. Returns (report, links), or None if the page could not be fetched.
+        """
+        print(f"🔎 Crawling: {url}")
+        fingerprint = None
+        validators = None
+        try:
+            site = SiteChecker(url, client=self.client, profiler=self.profiler, max_bytes=self.max_page_bytes,
+                               content_types=self.content_types, head_only=self.head_only)
+            cached = self.page_cache.lookup(url) if self.page_cache is not None else None
+            lastmod = self.lastmod.get(url)
+            if cached is not None and lastmod is not None and lastmod <= cached["stored_at"]:
+                # The sitemap says the page has not changed since it was analyzed: no request at all.
+                validators = {"status": "lastmod"}
+                validators.update((key, cached[key]) for key in ("etag", "last_modified", "body_hash", "body_bytes"))
+                return self._reuse_cached(url, None, cached, validators)
+            parse_here = self._parse_pool is None and self.page_cache is None
+            if not site.fetch(parse=parse_here, headers=PageCache.conditional_headers(cached)):
+                return None
 
-                # Add new internal links
-                for link in site.get_all_links():
-                    full_link = urljoin(url, link)
-                    if self.is_internal(full_link) and full_link not in self.visited:
-                        self.to_visit.append(full_link)
+            if self.page_cache is not None:
+                validators = self._cache_validators(site, cached)
+                if validators["status"] in REUSED:
+                    return self._reuse_cached(url, site.timing, cached, validators)
 
-                # Run your analysis logic
-                meta_checker = MetaChecker(site.soup)
-                link_checker = LinkChecker(url, site.get_all_links())
+            if site.skipped:
+                report = skipped_page_report(url, site)
+                if validators is not None:
+                    report["http_cache"] = validators
+                return report, []
+
+            if self._parse_pool is not None:
+                # This thread waits on a worker process, leaving the GIL to the other fetches.
+                with self.profiler.stage("parse"):
+                    site.facts, fingerprint = self._parse_pool.parse(site.content, site.encoding)
+            elif site.facts is None:
+                site.parse()
+            # Resolved against the URL the page was served from, which may differ after a redirect.
+            links = [urljoin(site.final_url, link) for link in site.get_all_links()]
+        except Exception as e:
+            print(f"[ERROR] Failed to crawl {url}: {e}")
+            return None
+
+        try:
+            # Run your analysis logic
+            link_checker = LinkChecker(url, links, cache=self.link_cache, client=self.client)
+            with self.profiler.stage("link_check"):
                 broken_links = link_checker.check_links()
+            self.profiler.count("links_checked", len(links))
+
+            assets = None
+            if self.asset_auditor is not None:
+                with self.profiler.stage("assets"):
+                    assets = self.asset_auditor.audit(site.final_url, site.facts, site.download["bytes"])
+
+            with self.profiler.stage("extract"):
+                report = self._build_report(url, site, broken_links, link_checker, fingerprint)
+            if assets is not None:
+                report["assets"] = assets
 
-                report = {
-                    "url": url,
-                    "status_code": site.status_code,
-                    "title": site.get_title(),
-                    "meta": meta_checker.get_meta_tags(),
-                    "description": meta_checker.get_description(),
-                    "keywords": meta_checker.get_keywords(),
-                    "broken_links": broken_links,
-                    "images": site.get_images_with_alt()
-                }
-
-                analyzer = SEOAnalyzer(report, site.soup)
+            with self.profiler.stage("analyze"):
+                analyzer = SEOAnalyzer(report, facts=site.facts)
                 suggestions = analyzer.run_all_checks()
-                report["suggestions"] = suggestions
+            report["suggestions"] = suggestions
+            report["findings"] = evaluate_page(report)
+            if validators is not None:
+                report["http_cache"] = validators
 
-                if not self.no_ai:
-                    try:
-                        ai_suggester = AISuggester()
-                        ai_text = ai_suggester.get_ai_suggestions(report)
-                        report["ai_suggestions"] = ai_text
-                    except Exception as e:
-                        print(f"[WARNING] Could not get AI suggestions: {e}")
+            return report, links
 
-                self.reports.append(report)
+        except Exception as e:
+            print(f"[ERROR] Failed to crawl {url}: {e}")
+            # The page was fetched, so it still counts as visited and its links are followed.
+            return None, links
 
-            except Exception as e:
-                print(f"[ERROR] Failed to crawl {url}: {e}")
+    def _cache_validators(self, site, cached):
+        if site.not_modified:
+            validators = {"status": "not_modified"}
+            validators.update((key, cached[key]) for key in ("etag", "last_modified", "body_hash", "body_bytes"))
+            return validators
+        digest = body_hash(site.content)
+        if cached is None:
+            status = "miss"
+        else:
+            status = "unchanged" if cached["body_hash"] == digest else "changed"
+        return {
+            "status": status,
+            "etag": site.headers.get("ETag"),
+            "last_modified": site.headers.get("Last-Modified"),
+            "body_hash": digest,
+            "body_bytes": len(site.content),
+        }
 
-        return self.reports
+    def _reuse_cached(self, url, timing, cached, validators):
+        # Nothing changed: skip parsing, link checks and analysis and serve the stored report.
+        bytes_saved = cached["body_bytes"] if validators["status"] != "unchanged" else 0
+        self.page_cache.record_reuse(url, validators["status"], bytes_saved)
+        self.profiler.count("pages_reused")
+        report = cached["report"]
+        report["fetch_timing"] = timing
+        report["http_cache"] = validators
+        return report, cached["links"]
+
+    def _build_report(self, url, site, broken_links, link_checker, fingerprint=None):
+        if fingerprint is None:
+            fingerprint = simhash(site.facts.text)
+        meta_checker = MetaChecker(facts=site.facts)
+        return {
+            "url": url,
+            "status_code": site.status_code,
+            "fetch_timing": site.timing,
+            "download": site.download,
+            "title": site.get_title(),
+            "meta": meta_checker.get_meta_tags(),
+            "description": meta_checker.get_description(),
+            "keywords": meta_checker.get_keywords(),
+            "h1": site.get_h1(),
+            "h1_count": site.get_h1_count(),
+            "broken_links": broken_links,
+            "images": site.get_images_with_alt(),
+            "link_cache": {"hits": link_checker.cache_hits, "misses": link_checker.cache_misses},
+            "short_circuited": link_checker.short_circuited,
+            "content_simhash": f"{fingerprint:016x}"
+        }
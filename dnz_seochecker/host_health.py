@@ -0,0 +1,156 @@
+# dnz_seochecker/host_health.py
+
+import random
+import threading
+import time
+from requests.exceptions import ConnectionError, SSLError, Timeout
+
+# Statuses worth another try: the server is up but asked us to come back.
+TRANSIENT_STATUSES = {429, 502, 503, 504}
+# Only link checks get adaptive timeouts. A page fetch always gets the caller's timeout:
+# a page can take far longer than the HEAD answers of the same host.
+ADAPTIVE_METHODS = {"HEAD"}
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    Raised instead of sending a request to a host that keeps failing. The message is the
+    host's last error, so short-circuited links are reported the same way.
+    """
+
+
+def is_transient(error):
+    # Timeouts and dropped connections may succeed on a retry; DNS and TLS failures will not.
+    if isinstance(error, CircuitOpenError) or isinstance(error, SSLError):
+        return False
+    if isinstance(error, Timeout):
+        return True
+    if isinstance(error, ConnectionError):
+        text = str(error)
+        return "NameResolutionError" not in text and "Name or service not known" not in text
+    return False
+
+
+class _Host:
+    __slots__ = ("failures", "open_until", "last_error", "rtt")
+
+    def __init__(self):
+        self.failures = 0
+        self.open_until = 0.0
+        self.last_error = None
+        # Response times per request method: [smoothed mean, mean deviation, samples].
+        self.rtt = {}
+
+
+class HostHealth:
+    """
+    Per-host health shared by every request of an audit.
+
+    - Circuit breaker: after `failure_threshold` consecutive failed attempts, requests to
+      the host fail at once with its last error for `reset_after` seconds. After that,
+      one request is let through to probe it.
+    - Adaptive timeouts (off by default): once a host has answered a few HEAD requests,
+      the timeout of its link checks follows their observed time to first byte (smoothed
+      mean + 4 deviations, as TCP does), between `min_timeout` and the caller's timeout.
+      Each request method keeps its own timings, and page fetches are never shortened.
+    - Retries: transient errors are retried up to `max_retries` times with jittered
+      exponential backoff starting at `backoff` seconds.
+    """
+
+    def __init__(self, failure_threshold=5, reset_after=30, max_retries=2, backoff=0.5,
+                 max_backoff=8, min_timeout=2.0, adaptive_timeouts=False):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_after = reset_after
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.min_timeout = min_timeout
+        self.adaptive_timeouts = adaptive_timeouts
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self.short_circuited = 0
+        self.retries = 0
+        self.circuits_opened = 0
+
+    def _host(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _Host()
+        return state
+
+    def before_request(self, host):
+        """
+        Raise CircuitOpenError if the host's circuit is open.
+        """
+        with self._lock:
+            state = self._host(host)
+            if state.failures < self.failure_threshold:
+                return
+            now = time.monotonic()
+            if now >= state.open_until:
+                # Half-open: this request probes the host, the others keep failing fast.
+                state.open_until = now + self.reset_after
+                return
+            self.short_circuited += 1
+            raise CircuitOpenError(state.last_error)
+
+    def timeout(self, host, method, timeout):
+        if not self.adaptive_timeouts or method not in ADAPTIVE_METHODS:
+            return timeout
+        with self._lock:
+            state = self._hosts.get(host)
+            rtt = state.rtt.get(method) if state is not None else None
+            if rtt is None or rtt[2] < 3:
+                return timeout
+            return min(timeout, max(self.min_timeout, rtt[0] + 4 * rtt[1]))
+
+    def record_success(self, host, method, seconds):
+        with self._lock:
+            state = self._host(host)
+            state.failures = 0
+            state.open_until = 0.0
+            rtt = state.rtt.get(method)
+            if rtt is None:
+                state.rtt[method] = [seconds, seconds / 2, 1]
+            else:
+                rtt[1] = 0.75 * rtt[1] + 0.25 * abs(seconds - rtt[0])
+                rtt[0] = 0.875 * rtt[0] + 0.125 * seconds
+                rtt[2] += 1
+
+    def record_failure(self, host, error):
+        """
+        Count a failed attempt. Returns True if the circuit is now open.
+        """
+        with self._lock:
+            state = self._host(host)
+            state.failures += 1
+            state.last_error = str(error)
+            if state.failures == self.failure_threshold:
+                state.open_until = time.monotonic() + self.reset_after
+                self.circuits_opened += 1
+                print(f"[WARNING] {host} failed {state.failures} times in a row; "
+                      f"skipping its requests for {self.reset_after}s.")
+            return state.failures >= self.failure_threshold
+
+    def retry_delay(self, attempt, retry_after=None):
+        """
+        Seconds to wait before retry number `attempt` (0-based), or None if retries are used up.
+        """
+        if attempt >= self.max_retries:
+            return None
+        with self._lock:
+            self.retries += 1
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        return delay * random.uniform(0.5, 1.5)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "short_circuited": self.short_circuited,
+                "retries": self.retries,
+                "circuits_opened": self.circuits_opened,
+                "open_hosts": sorted(host for host, state in self._hosts.items()
+                                     if state.failures >= self.failure_threshold),
+            }
@@ -0,0 +1,205 @@
+# dnz_seochecker/http_client.py
+
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+from dnz_seochecker.host_health import HostHealth, TRANSIENT_STATUSES, is_transient
+
+DEFAULT_USER_AGENT = "SEO-Auditor-AI/1.0 (+https://github.com/KingofPythonn/SEO-Auditor-AI)"
+
+# Time spent opening connections (DNS lookup, TCP connect and TLS handshake) by the current thread.
+_connect_local = threading.local()
+
+
+def _record_connect(started):
+    _connect_local.seconds = getattr(_connect_local, "seconds", 0.0) + time.perf_counter() - started
+    _connect_local.opened = getattr(_connect_local, "opened", 0) + 1
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(started)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(started)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class HttpClient:
+    """
+    Keep-alive HTTP client shared by every fetcher of an audit.
+
+    Connections are pooled per host (`pool_connections` hosts, `pool_maxsize` connections each),
+    responses are negotiated with gzip (and brotli when a brotli package is installed), and every
+    response carries a `timing` dict with `connect`, `ttfb` and `total` seconds.
+    Requests go through `health` (a HostHealth) for circuit breaking, adaptive timeouts and retries.
+    """
+
+    def __init__(self, user_agent=DEFAULT_USER_AGENT, pool_connections=10, pool_maxsize=10, health=None):
+        self.user_agent = user_agent
+        self.health = health or HostHealth()
+        self.session = requests.Session()
+        adapter = _TimedAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept-Encoding": ACCEPT_ENCODING,
+        })
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.connect_time = 0.0
+        self.ttfb_time = 0.0
+        self.total_time = 0.0
+
+    def get(self, url, timeout=10, **kwargs):
+        return self.request("GET", url, timeout=timeout, **kwargs)
+
+    def head(self, url, timeout=5, **kwargs):
+        return self.request("HEAD", url, timeout=timeout, **kwargs)
+
+    def request(self, method, url, timeout=10, stream=False, **kwargs):
+        """
+        Send a request; `timeout` is the upper bound of the host's adaptive timeout, if any.
+        Transient failures are retried, and a failing host's circuit may short-circuit it
+        with CircuitOpenError.
+        """
+        host = urlsplit(url).netloc
+        health = self.health
+        attempt = 0
+        while True:
+            health.before_request(host)
+            try:
+                response = self._send(method, url, health.timeout(host, method, timeout), stream, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                circuit_open = health.record_failure(host, e)
+                delay = health.retry_delay(attempt) if is_transient(e) and not circuit_open else None
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            # Any answer, even an error status, shows the host is up.
+            health.record_success(host, method, response.timing["ttfb"])
+            if response.status_code in TRANSIENT_STATUSES:
+                delay = health.retry_delay(attempt, _retry_after(response))
+                if delay is not None:
+                    response.close()
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+            return response
+
+    def _send(self, method, url, timeout, stream, **kwargs):
+        _connect_local.seconds = 0.0
+        _connect_local.opened = 0
+        started = time.perf_counter()
+
+        response = self.session.request(method, url, timeout=timeout, stream=True, **kwargs)
+        ttfb = time.perf_counter() - started
+        if not stream:
+            response.content  # read the body so the connection goes back to the pool
+        total = time.perf_counter() - started
+
+        response.timing = {
+            "connect": round(_connect_local.seconds, 6),
+            "ttfb": round(ttfb, 6),
+            "total": round(total, 6),
+        }
+        with self._lock:
+            self.requests += 1
+            self.connections_opened += _connect_local.opened
+            self.connect_time += _connect_local.seconds
+            self.ttfb_time += ttfb
+            self.total_time += total
+        return response
+
+    def add_body_time(self, seconds):
+        # Streamed bodies are read after request() returns; count that time in the totals.
+        with self._lock:
+            self.total_time += seconds
+
+    def stats(self):
+        with self._lock:
+            count = self.requests or 1
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "avg_connect": round(self.connect_time / count, 6),
+                "avg_ttfb": round(self.ttfb_time / count, 6),
+                "avg_total": round(self.total_time / count, 6),
+            }
+
+    def close(self):
+        self.session.close()
+
+
+def _retry_after(response):
+    # Only the delay-seconds form; HTTP dates fall back to the normal backoff.
+    value = response.headers.get("Retry-After", "")
+    return float(value) if value.strip().isdigit() else None
+
+
+def decode_body(content, encoding):
+    """
+    Decode a response body the way requests' Response.text does, for bodies that are
+    decoded away from their response (e.g. in a parse worker process).
+    """
+    if not content:
+        return ""
+    if encoding is None and chardet is not None:
+        encoding = chardet.detect(content)["encoding"]
+    try:
+        return str(content, encoding or "utf-8", errors="replace")
+    except (LookupError, TypeError):
+        return str(content, errors="replace")
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_default_client():
+    """
+    Process-wide client used by fetchers that were not given one explicitly.
+    """
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
@@ -0,0 +1,157 @@
+# dnz_seochecker/link_cache.py
+
+import sqlite3
+import threading
+import time
+from dnz_seochecker.url_normalizer import normalize_url
+
+# Seconds before a link whose check failed with a network error is checked once more.
+ERROR_RETRY_AFTER = 30
+
+
+class LinkStatusCache:
+    """
+    Link statuses shared by every page of a crawl. Each distinct link is checked once;
+    concurrent lookups of a link that is still being checked wait for that one request.
+
+    Only answers are kept for the whole crawl. A network error (a string, or a dict with
+    an "error" key from the asset probes) is reused for `retry_after` seconds, then the
+    link is checked once more, so a short outage does not mark it broken everywhere.
+    """
+
+    def __init__(self, store=None, retry_after=ERROR_RETRY_AFTER):
+        self.store = store
+        self.retry_after = retry_after
+        self.hits = 0
+        self.misses = 0
+        self._results = {}
+        # key -> [error, failed_at, checks]
+        self._errors = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, url, check):
+        """
+        Return (status, hit). `check` is called with the URL only on a miss.
+        """
+        # The fetch form, not url_key(): `/a` and `/a/` may answer differently.
+        key = normalize_url(url) or url
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                return self._results[key], True
+
+            failed = self._errors.get(key)
+            if failed is not None and key not in self._pending and \
+                    (failed[2] > 1 or time.monotonic() - failed[1] < self.retry_after):
+                self.hits += 1
+                return failed[0], True
+
+            event = self._pending.get(key)
+            if event is None and self.store is not None:
+                status = self.store.get(key)
+                if status is not None:
+                    self._results[key] = status
+                    self.hits += 1
+                    return status, True
+
+            if event is not None:
+                self.hits += 1
+                owner = False
+            else:
+                event = threading.Event()
+                self._pending[key] = event
+                self.misses += 1
+                owner = True
+
+        if not owner:
+            event.wait()
+            with self._lock:
+                if key in self._results:
+                    return self._results[key], True
+                failed = self._errors.get(key)
+            return (failed[0] if failed is not None else None), True
+
+        status = None
+        try:
+            status = check(url)
+        finally:
+            with self._lock:
+                if _is_error(status):
+                    failed = self._errors.get(key)
+                    self._errors[key] = [status, time.monotonic(), failed[2] + 1 if failed else 1]
+                else:
+                    self._results[key] = status
+                    self._errors.pop(key, None)
+                del self._pending[key]
+            event.set()
+
+        if self.store is not None and isinstance(status, int):
+            self.store.put(key, status)
+        return status, False
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def _is_error(status):
+    return status is None or isinstance(status, str) or (isinstance(status, dict) and "error" in status)
+
+
+class DiskLinkStore:
+    """
+    SQLite-backed link statuses kept between runs. Entries older than `ttl` seconds are ignored,
+    and the oldest entries are evicted once the store grows past `max_entries`.
+    Only HTTP status codes are stored; network errors are retried on the next run.
+    """
+
+    def __init__(self, path, ttl=86400, max_entries=100000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS link_status ("
+            "url TEXT PRIMARY KEY, status INTEGER NOT NULL, checked_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS link_status_age ON link_status (checked_at)")
+        self.conn.commit()
+
+    def get(self, url):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT status, checked_at FROM link_status WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return row[0]
+
+    def put(self, url, status):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO link_status (url, status, checked_at) VALUES (?, ?, ?)",
+                (url, status, time.time()),
+            )
+            self._writes += 1
+            # Commit and trim in batches rather than on every link.
+            if self._writes % 200 == 0:
+                self._evict()
+                self.conn.commit()
+
+    def _evict(self):
+        self.conn.execute("DELETE FROM link_status WHERE checked_at < ?", (time.time() - self.ttl,))
+        count = self.conn.execute("SELECT COUNT(*) FROM link_status").fetchone()[0]
+        if count > self.max_entries:
+            self.conn.execute(
+                "DELETE FROM link_status WHERE url IN ("
+                "SELECT url FROM link_status ORDER BY checked_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def close(self):
+        with self._lock:
+            self._evict()
+            self.conn.commit()
+            self.conn.close()
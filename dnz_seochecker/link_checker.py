@@ -1,21 +1,45 @@
 # dnz_seochecker/link_checker.py
 
-import requests
 from urllib.parse import urljoin
+from dnz_seochecker.http_client import get_default_client
+from dnz_seochecker.host_health import CircuitOpenError
 
 class LinkChecker:
-    def __init__(self, base_url, links):
+    def __init__(self, base_url, links, cache=None, client=None):
         self.base_url = base_url
         self.links = links
+        self.cache = cache
+        self.client = client or get_default_client()
         self.broken_links = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.short_circuited = 0
 
     def check_links(self, timeout=5):
         for link in self.links:
             absolute_url = urljoin(self.base_url, link)
-            try:
-                response = requests.head(absolute_url, timeout=timeout, allow_redirects=True)
-                if response.status_code >= 400:
-                    self.broken_links.append((absolute_url, response.status_code))
-            except Exception as e:
-                self.broken_links.append((absolute_url, str(e)))
+            if self.cache is None:
+                status = self.check_url(absolute_url, timeout)
+            else:
+                status, hit = self.cache.lookup(absolute_url, lambda u: self.check_url(u, timeout))
+                if hit:
+                    self.cache_hits += 1
+                else:
+                    self.cache_misses += 1
+            if isinstance(status, str) or status >= 400:
+                self.broken_links.append((absolute_url, status))
         return self.broken_links
+
+    def check_url(self, url, timeout=5):
+        """
+        Return the HTTP status code for `url`, or the error message if the request failed.
+        """
+        try:
+            response = self.client.head(url, timeout=timeout, allow_redirects=True)
+            return response.status_code
+        except CircuitOpenError as e:
+            # The host is failing; report its last error without another request.
+            self.short_circuited += 1
+            return str(e)
+        except Exception as e:
+            return str(e)
@@ -1,10 +1,13 @@
 # dnz_seochecker/meta_checker.py
 
 class MetaChecker:
-    def __init__(self, soup):
+    def __init__(self, soup=None, facts=None):
         self.soup = soup
+        self.facts = facts
 
     def get_meta_tags(self):
+        if self.facts is not None:
+            return dict(self.facts.meta)
         meta_data = {}
         for meta in self.soup.find_all('meta'):
             name = meta.get('name') or meta.get('property')
@@ -14,12 +17,16 @@ class MetaChecker:
         return meta_data
 
     def get_description(self):
+        if self.facts is not None:
+            return self.facts.description
         meta = self.soup.find('meta', attrs={'name': 'description'})
         if meta and meta.get('content'):
             return meta['content']
         return None
 
     def get_keywords(self):
+        if self.facts is not None:
+            return self.facts.keywords
         meta = self.soup.find('meta', attrs={'name': 'keywords'})
         if meta and meta.get('content'):
             return meta['content']
@@ -0,0 +1,98 @@
+# dnz_seochecker/near_duplicates.py
+
+import re
+from hashlib import blake2b
+
+_WORD = re.compile(r"\w+")
+
+# Words per shingle. Three keeps pages with the same words in a different order apart.
+SHINGLE_SIZE = 3
+
+# _BIT_TABLES[k] maps every byte value to its bit 7 - k, most significant bit first.
+_BIT_TABLES = [bytes((value >> (7 - k)) & 1 for value in range(256)) for k in range(8)]
+
+
+def simhash(text):
+    """
+    64-bit SimHash of the word shingles in `text`. Pages whose text differs only a little
+    get fingerprints that differ in only a few bits. Returns 0 for pages without text.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) > SHINGLE_SIZE:
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    else:
+        shingles = {" ".join(words)} if words else set()
+    if not shingles:
+        return 0
+
+    # Bit i of the fingerprint is set when most shingle hashes have bit i set. The hashes
+    # are laid out as one byte string so each per-bit count is a slice, translate and
+    # count in C rather than a Python loop over every shingle.
+    digests = b"".join(blake2b(s.encode("utf-8"), digest_size=8).digest() for s in shingles)
+    half = len(shingles) / 2
+    fingerprint = 0
+    for byte in range(8):
+        column = digests[byte::8]
+        for table in _BIT_TABLES:
+            fingerprint = (fingerprint << 1) | (column.translate(table).count(1) > half)
+    return fingerprint
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateIndex:
+    """
+    Locality-sensitive index of page fingerprints. The 64 bits are split into
+    `max_distance + 1` bands; two fingerprints within `max_distance` bits must agree on
+    at least one whole band, so only pages sharing a band value are compared.
+
+    Only the first page of each cluster is indexed. Copies never grow the buckets, so a
+    lookup costs a few dict probes plus a handful of comparisons at any crawl size.
+    """
+
+    def __init__(self, max_distance=3):
+        self.max_distance = max(0, min(max_distance, 63))
+        bands = self.max_distance + 1
+        widths = [64 // bands + (1 if i < 64 % bands else 0) for i in range(bands)]
+        self._bands = []
+        shift = 64
+        for width in widths:
+            shift -= width
+            self._bands.append((shift, (1 << width) - 1))
+        self._buckets = [{} for _ in self._bands]
+        self._urls = []
+        self._fingerprints = []
+        self.pages = 0
+        self.duplicates = 0
+
+    def add(self, url, fingerprint):
+        """
+        Index a page. Returns the URL of the earlier page it nearly duplicates, or None.
+        Pages without text (fingerprint 0) are never matched.
+        """
+        self.pages += 1
+        if not fingerprint:
+            return None
+
+        keys = [(fingerprint >> shift) & mask for shift, mask in self._bands]
+        best = None
+        for bucket, key in zip(self._buckets, keys):
+            for representative in bucket.get(key, ()):
+                distance = hamming_distance(fingerprint, self._fingerprints[representative])
+                if distance <= self.max_distance and (best is None or (distance, representative) < best):
+                    best = (distance, representative)
+        if best is not None:
+            self.duplicates += 1
+            return self._urls[best[1]]
+
+        representative = len(self._urls)
+        self._urls.append(url)
+        self._fingerprints.append(fingerprint)
+        for bucket, key in zip(self._buckets, keys):
+            bucket.setdefault(key, []).append(representative)
+        return None
+
+    def stats(self):
+        return {"pages": self.pages, "near_duplicates": self.duplicates, "clusters_indexed": len(self._urls)}
@@ -0,0 +1,147 @@
+# dnz_seochecker/page_cache.py
+
+import json
+import sqlite3
+import threading
+import time
+from hashlib import blake2b
+
+
+# http_cache statuses of pages whose previous report was reused. "lastmod" pages were not
+# requested at all: their sitemap lastmod is older than the stored report.
+REUSED = ("not_modified", "unchanged", "lastmod")
+
+
+def body_hash(content):
+    return blake2b(content, digest_size=16).hexdigest()
+
+
+class PageCache:
+    """
+    SQLite store of finished page reports for incremental re-crawls. Each entry keeps the
+    response's ETag, Last-Modified and body hash next to the report and the page's links,
+    so the next run can send a conditional GET and reuse the report when nothing changed.
+
+    Entries older than `max_age` seconds are fetched and analyzed in full again, so rule
+    changes and link rot are picked up eventually. Once the stored reports exceed
+    `max_bytes`, the least recently used entries are evicted.
+    """
+
+    def __init__(self, path, max_age=7 * 86400, max_bytes=512 * 2**20):
+        self.path = path
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.lastmod = 0
+        self.analyzed = 0
+        self.bytes_saved = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS page_cache ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body_hash TEXT NOT NULL, "
+            "body_bytes INTEGER NOT NULL, report TEXT NOT NULL, links TEXT NOT NULL, "
+            "size INTEGER NOT NULL, stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS page_cache_used ON page_cache (used_at)")
+        self.conn.commit()
+
+    def lookup(self, url):
+        """
+        The cached entry for `url` as a dict, or None if there is none or it is too old.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, body_hash, body_bytes, report, links, stored_at "
+                "FROM page_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or time.time() - row[6] > self.max_age:
+            return None
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "body_hash": row[2],
+            "body_bytes": row[3],
+            "report": json.loads(row[4]),
+            "links": json.loads(row[5]),
+            "stored_at": row[6],
+        }
+
+    @staticmethod
+    def conditional_headers(entry):
+        if entry is None:
+            return None
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers or None
+
+    def record_reuse(self, url, status, bytes_saved=0):
+        with self._lock:
+            if status == "not_modified":
+                self.not_modified += 1
+            elif status == "lastmod":
+                self.lastmod += 1
+            else:
+                self.unchanged += 1
+            self.bytes_saved += bytes_saved
+            self.conn.execute("UPDATE page_cache SET used_at = ? WHERE url = ?", (time.time(), url))
+            self._count_write()
+
+    def store(self, url, validators, report, links):
+        """
+        Store a freshly analyzed page. `validators` is the report's http_cache dict.
+        """
+        report = {key: value for key, value in report.items() if key != "http_cache"}
+        report_json = json.dumps(report, ensure_ascii=False)
+        links_json = json.dumps(links, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self.analyzed += 1
+            self.conn.execute(
+                "INSERT OR REPLACE INTO page_cache (url, etag, last_modified, body_hash, body_bytes, "
+                "report, links, size, stored_at, used_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, validators.get("etag"), validators.get("last_modified"), validators["body_hash"],
+                 validators["body_bytes"], report_json, links_json,
+                 len(report_json) + len(links_json), now, now),
+            )
+            self._count_write()
+
+    def _count_write(self):
+        self._writes += 1
+        # Commit and trim in batches rather than on every page.
+        if self._writes % 200 == 0:
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM page_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for url, size in self.conn.execute("SELECT url, size FROM page_cache ORDER BY used_at"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((url,))
+            total -= size
+        self.conn.executemany("DELETE FROM page_cache WHERE url = ?", doomed)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "not_modified": self.not_modified,
+                "unchanged": self.unchanged,
+                "lastmod": self.lastmod,
+                "analyzed": self.analyzed,
+                "bytes_saved": self.bytes_saved,
+            }
+
+    def close(self):
+        with self._lock:
+            self._evict()
+            self.conn.commit()
+            self.conn.close()
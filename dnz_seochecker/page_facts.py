@@ -0,0 +1,134 @@
+# dnz_seochecker/page_facts.py
+
+from html.parser import HTMLParser
+
+
+class PageFacts:
+    """
+    Everything the audit needs from a page, collected in one pass over the HTML.
+    """
+    __slots__ = ("title", "meta", "description", "keywords", "links", "images", "scripts", "stylesheets",
+                 "h1", "h1_count", "text")
+
+    def __init__(self):
+        self.title = None
+        self.meta = {}
+        self.description = None
+        self.keywords = None
+        self.links = []
+        self.images = []
+        self.scripts = []
+        self.stylesheets = []
+        self.h1 = None
+        self.h1_count = 0
+        self.text = ""
+
+
+# Elements whose content is not visible page text.
+_NON_TEXT_TAGS = {"script", "style", "noscript", "template"}
+
+
+class PageFactsParser(HTMLParser):
+    """
+    Streaming extractor: feed() HTML in chunks, then close() and read `facts`.
+    No tree is built, so memory stays proportional to the facts, not the page.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.facts = PageFacts()
+        self._title_parts = None
+        self._title_done = False
+        self._h1_parts = None
+        self._text_parts = []
+        self._non_text_depth = 0
+        self._description_seen = False
+        self._keywords_seen = False
+
+    def handle_starttag(self, tag, attrs):
+        facts = self.facts
+        if tag in _NON_TEXT_TAGS:
+            self._non_text_depth += 1
+            if tag == "script":
+                src = dict(attrs).get("src")
+                if src:
+                    facts.scripts.append(src)
+        elif tag == "a":
+            attrs = dict(attrs)
+            if "href" in attrs:
+                facts.links.append(attrs["href"] or "")
+        elif tag == "img":
+            attrs = dict(attrs)
+            facts.images.append({"src": _attr(attrs, "src"), "alt": _attr(attrs, "alt")})
+        elif tag == "meta":
+            self._handle_meta(dict(attrs))
+        elif tag == "link":
+            attrs = dict(attrs)
+            if "stylesheet" in (attrs.get("rel") or "").lower().split() and attrs.get("href"):
+                facts.stylesheets.append(attrs["href"])
+        elif tag == "h1":
+            facts.h1_count += 1
+            if facts.h1_count == 1:
+                self._h1_parts = []
+        elif tag == "title" and not self._title_done and self._title_parts is None:
+            self._title_parts = []
+
+    def handle_endtag(self, tag):
+        if tag in _NON_TEXT_TAGS:
+            self._non_text_depth = max(0, self._non_text_depth - 1)
+        elif tag == "title" and self._title_parts is not None:
+            self.facts.title = "".join(self._title_parts).strip()
+            self._title_parts = None
+            self._title_done = True
+        elif tag == "h1" and self._h1_parts is not None:
+            self.facts.h1 = " ".join("".join(self._h1_parts).split())
+            self._h1_parts = None
+
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        if self._h1_parts is not None:
+            self._h1_parts.append(data)
+        if not self._non_text_depth and self._title_parts is None:
+            self._text_parts.append(data)
+
+    def close(self):
+        super().close()
+        # An unclosed <title> still counts, matching BeautifulSoup.
+        if self._title_parts is not None:
+            self.facts.title = "".join(self._title_parts).strip()
+            self._title_parts = None
+        if self._h1_parts is not None:
+            self.facts.h1 = " ".join("".join(self._h1_parts).split())
+            self._h1_parts = None
+        self.facts.text = " ".join(self._text_parts)
+        self._text_parts = []
+        return self.facts
+
+    def _handle_meta(self, attrs):
+        facts = self.facts
+        name = attrs.get("name") or attrs.get("property")
+        content = attrs.get("content")
+        if name and content:
+            facts.meta[name.lower()] = content
+
+        # Like soup.find(), only the first matching tag counts.
+        if attrs.get("name") == "description" and not self._description_seen:
+            self._description_seen = True
+            facts.description = content or None
+        elif attrs.get("name") == "keywords" and not self._keywords_seen:
+            self._keywords_seen = True
+            facts.keywords = content or None
+
+
+def _attr(attrs, name):
+    # BeautifulSoup reports valueless attributes as "" and missing ones as None.
+    if name not in attrs:
+        return None
+    return attrs[name] or ""
+
+
+def extract_page_facts(html):
+    parser = PageFactsParser()
+    parser.feed(html)
+    return parser.close()
@@ -0,0 +1,37 @@
+# dnz_seochecker/page_worker.py
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dnz_seochecker.http_client import decode_body
+from dnz_seochecker.page_facts import extract_page_facts
+from dnz_seochecker.near_duplicates import simhash
+
+
+def parse_page(content, encoding):
+    """
+    Decode, parse and fingerprint one page body. Runs in a worker process, so it returns
+    only the compact PageFacts and the text fingerprint, never the HTML or a tree.
+    """
+    facts = extract_page_facts(decode_body(content, encoding))
+    fingerprint = simhash(facts.text)
+    facts.text = ""
+    return facts, fingerprint
+
+
+class ParsePool:
+    """
+    Process pool for the CPU-bound part of a crawl. Fetch threads hand it raw response
+    bytes and wait for the facts, so parsing runs on every core instead of under one GIL.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        # spawn rather than fork: the crawler already has HTTP and AI threads running.
+        self._executor = ProcessPoolExecutor(max_workers=workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+
+    def parse(self, content, encoding):
+        return self._executor.submit(parse_page, content, encoding).result()
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
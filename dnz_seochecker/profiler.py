@@ -0,0 +1,105 @@
+# dnz_seochecker/profiler.py
+
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# Order used when printing; stages not listed here are printed after these.
+STAGES = ["fetch", "parse", "extract", "link_check", "assets", "analyze", "ai", "report_write"]
+
+
+class StageProfiler:
+    """
+    Per-stage wall-clock timers and counters, safe to share between crawler threads.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self._samples = defaultdict(list)
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._samples[name].append(seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def summary(self):
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+            counters = dict(self.counters)
+
+        order = [s for s in STAGES if s in samples] + sorted(s for s in samples if s not in STAGES)
+        stages = {}
+        for name in order:
+            values = samples[name]
+            stages[name] = {
+                "count": len(values),
+                "total": round(sum(values), 6),
+                "p50": round(_percentile(values, 50), 6),
+                "p95": round(_percentile(values, 95), 6),
+                "max": round(values[-1], 6),
+            }
+        return {"stages": stages, "counters": counters}
+
+    def format_table(self):
+        summary = self.summary()
+        lines = [f"{'stage':<14}{'count':>8}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+        for name, s in summary["stages"].items():
+            lines.append(
+                f"{name:<14}{s['count']:>8}{s['total']:>10.3f}"
+                f"{s['p50'] * 1000:>10.2f}{s['p95'] * 1000:>10.2f}{s['max'] * 1000:>10.2f}"
+            )
+        for name, value in sorted(summary["counters"].items()):
+            lines.append(f"{name:<14}{value:>8}")
+        return "\n".join(lines)
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullProfiler:
+    """
+    Stand-in used when profiling is off: every call is a no-op on a shared object.
+    """
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name):
+        return self._stage
+
+    def record(self, name, seconds):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def _percentile(sorted_values, percent):
+    # Nearest-rank percentile.
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
@@ -1,25 +1,180 @@
 
 
+import heapq
 import json
 import html
+import os
+import re
+from collections import Counter
+
+# Site-wide findings shown in HTML; the full list is in the findings JSON file.
+MAX_HTML_SITE_FINDINGS = 100
 
 class ReportGenerator:
     def __init__(self, data):
         self.data = data
 
-    def to_json(self, path):
+    def is_multi_page(self):
+        # Crawl reports are a list of pages or any re-iterable of them, e.g. JsonlReports.
+        return not isinstance(self.data, dict)
+
+    def to_json(self, path, extra=None):
+        """
+        For crawl reports, `extra` (e.g. {"profile": ...}) turns the page list into
+        {"pages": [...], **extra}; without it the output is the plain list.
+        """
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=2, ensure_ascii=False)
+            if self.is_multi_page() and extra:
+                f.write('{\n  "pages": ')
+                self._write_json_list(f, prefix="  ")
+                for key, value in extra.items():
+                    value_json = json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+                    f.write(f",\n  {json.dumps(key)}: {value_json}")
+                f.write("\n}")
+            elif self.is_multi_page():
+                self._write_json_list(f)
+            else:
+                json.dump(self.data, f, indent=2, ensure_ascii=False)
         print(f"[INFO] JSON report written to {path}")
 
-    def to_html(self, path):
-        html_content = self.build_html()
+    def _write_json_list(self, f, prefix=""):
+        # Same output as json.dump(pages, indent=2), written one page at a time.
+        first = True
+        for page in self.data:
+            page_json = json.dumps(page, indent=2, ensure_ascii=False)
+            f.write(f"[\n{prefix}  " if first else f",\n{prefix}  ")
+            f.write(page_json.replace("\n", f"\n{prefix}  "))
+            first = False
+        f.write("[]" if first else f"\n{prefix}]")
+
+    def to_html(self, path, site_findings=None):
         with open(path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            if self.is_multi_page():
+                first = True
+                for part in self.iter_multi_page_html(site_findings):
+                    if not first:
+                        f.write("\n")
+                    f.write(part)
+                    first = False
+            else:
+                f.write(self.build_single_page_html())
         print(f"[INFO] HTML report written to {path}")
 
+    def to_sharded_html(self, directory, pages_per_file=100, worst_pages=20, site_findings=None):
+        """
+        Write a summary index.html plus paginated per-page detail files under pages/.
+        Pages are streamed from the report data, so nothing is held beyond one page.
+        """
+        os.makedirs(os.path.join(directory, "pages"), exist_ok=True)
+        summary = _SiteSummary(worst_pages)
+        shards = []
+        shard = None
+
+        for number, page in enumerate(self.data, 1):
+            if shard is None or number - shards[-1][1] == pages_per_file:
+                name = f"pages/page-{len(shards) + 1:05d}.html"
+                if shard is not None:
+                    self._close_shard(shard, name)
+                shard = open(os.path.join(directory, name), 'w', encoding='utf-8')
+                previous = shards[-1][0] if shards else None
+                shards.append([name, number, number])
+                self._open_shard(shard, len(shards), previous)
+
+            anchor = f"page-{number}"
+            shard.write("\n".join(self._page_parts(page, anchor)))
+            shard.write("\n")
+            shards[-1][2] = number
+            summary.add(page, f"{shards[-1][0]}#{anchor}")
+
+        if shard is not None:
+            self._close_shard(shard, None)
+
+        index_path = os.path.join(directory, "index.html")
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(self._index_parts(summary, shards, site_findings)))
+        print(f"[INFO] HTML report written to {index_path} ({summary.pages} pages in {len(shards)} files)")
+        return index_path
+
+    def _open_shard(self, f, number, previous):
+        nav = ["<a href='../index.html'>Summary</a>"]
+        if previous:
+            nav.append(f"<a href='{os.path.basename(previous)}'>← Previous</a>")
+        f.write("\n".join([
+            f"<html><head><meta charset='utf-8'><title>SEO Site Crawl Report – Part {number}</title>",
+            self._css(),
+            "</head><body>",
+            f"<p>{' | '.join(nav)}</p>",
+            f"<h1>SEO Site Crawl Report – Part {number}</h1>",
+        ]))
+        f.write("\n")
+
+    def _close_shard(self, f, next_name):
+        nav = ["<a href='../index.html'>Summary</a>"]
+        if next_name:
+            nav.append(f"<a href='{os.path.basename(next_name)}'>Next →</a>")
+        f.write(f"<hr>\n<p>{' | '.join(nav)}</p>\n</body></html>")
+        f.close()
+
+    def _index_parts(self, summary, shards, site_findings=None):
+        def row(label, value):
+            return f"<tr><th>{html.escape(label)}</th><td>{value}</td></tr>"
+
+        statuses = ", ".join(f"{code}: {count}" for code, count in sorted(summary.status_codes.items(), key=str))
+        html_parts = [
+            "<html><head><meta charset='utf-8'><title>SEO Site Crawl Summary</title>",
+            self._css(),
+            "</head><body>",
+            "<h1>SEO Site Crawl Summary</h1>",
+            "<h2>Site-wide Counts</h2>",
+            "<table>",
+            row("Pages", summary.pages),
+            row("Status codes", html.escape(statuses)),
+            row("Pages missing a title", summary.missing_title),
+            row("Pages missing a meta description", summary.missing_description),
+            row("Broken links", summary.broken_links),
+            row("Images", summary.images),
+            row("Images missing alt text", summary.images_missing_alt),
+            row("Errors", summary.errors),
+            row("Warnings", summary.warnings),
+            "</table>",
+            "<h2>Issue Totals</h2>",
+        ]
+
+        if summary.issues:
+            html_parts.append("<table>")
+            for issue, count in summary.issues.most_common():
+                html_parts.append(f"<tr><td class='{self._suggestion_class(issue)}'>{html.escape(issue)}</td><td>{count}</td></tr>")
+            html_parts.append("</table>")
+        else:
+            html_parts.append("<p class='ok'>✅ No issues found.</p>")
+
+        if site_findings is not None:
+            html_parts.extend(self._site_findings_parts(site_findings))
+
+        html_parts.append("<h2>Worst Pages</h2>")
+        worst = summary.worst()
+        if worst:
+            html_parts.append("<ol>")
+            for (errors, warnings, broken), _, url, href in worst:
+                html_parts.append(
+                    f"<li><a href='{html.escape(href)}'>{html.escape(url)}</a> – "
+                    f"<span class='error'>{errors} errors</span>, <span class='warn'>{warnings} warnings</span>, "
+                    f"{broken} broken links</li>"
+                )
+            html_parts.append("</ol>")
+        else:
+            html_parts.append("<p class='ok'>✅ No pages with issues.</p>")
+
+        html_parts.append("<h2>Page Details</h2>")
+        html_parts.append("<ul>")
+        for name, first, last in shards:
+            html_parts.append(f"<li><a href='{name}'>Pages {first}–{last}</a></li>")
+        html_parts.append("</ul>")
+        html_parts.append("</body></html>")
+        return html_parts
+
     def build_html(self):
-        if isinstance(self.data, list):
+        if self.is_multi_page():
             return self.build_multi_page_html()
         else:
             return self.build_single_page_html()
@@ -29,14 +184,6 @@ class ReportGenerator:
         url = html.escape(self.data.get("url") or "")
         status_code = self.data.get("status_code")
 
-        meta = self.data.get("meta", {})
-        broken_links = self.data.get("broken_links", [])
-        suggestions = self.data.get("suggestions", [])
-        ai_suggestions = self.data.get("ai_suggestions", "")
-
-        def section(title, content):
-            return f"<h2>{title}</h2>\n{content}"
-
         html_parts = [
             "<html><head><meta charset='utf-8'><title>SEO Report</title>",
             self._css(),
@@ -45,133 +192,156 @@ class ReportGenerator:
             f"<p><strong>Status Code:</strong> {status_code}</p>",
             f"<p><strong>Page Title:</strong> {title}</p>",
         ]
+        html_parts.extend(self._page_sections(self.data, "h2"))
+        html_parts.append("</body></html>")
+        return "\n".join(html_parts)
+
+    def build_multi_page_html(self):
+        return "\n".join(self.iter_multi_page_html())
+
+    def iter_multi_page_html(self, site_findings=None):
+        yield "<html><head><meta charset='utf-8'><title>SEO Site Crawl Report</title>"
+        yield self._css()
+        yield "</head><body>"
+        yield "<h1>SEO Site Crawl Report</h1>"
+        if site_findings is not None:
+            yield from self._site_findings_parts(site_findings)
+
+        for page in self.data:
+            yield from self._page_parts(page)
+
+        yield "</body></html>"
+
+    def _page_parts(self, page, anchor=None):
+        url = html.escape(page.get("url", ""))
+        title = html.escape(page.get("title") or "No title found")
+        status_code = page.get("status_code")
+        heading_id = f" id='{anchor}'" if anchor else ""
+
+        html_parts = [
+            "<hr>",
+            f"<h2{heading_id}>Page: <a href='{url}'>{url}</a></h2>",
+            f"<p><strong>Status Code:</strong> {status_code}</p>",
+            f"<p><strong>Page Title:</strong> {title}</p>",
+        ]
+        download_note = self._download_note(page.get("download") or {})
+        if download_note:
+            html_parts.append(f"<p class='warn'><strong>Download:</strong> {html.escape(download_note)}</p>")
+        html_parts.extend(self._page_sections(page, "h3"))
+        return html_parts
+
+    @staticmethod
+    def _download_note(download):
+        status = download.get("status")
+        if status == "truncated":
+            return f"Truncated after {download['bytes']} bytes; the rest of the page was not audited."
+        if status == "head_only":
+            return f"Read up to the first <h1> only ({download['bytes']} bytes)."
+        if status == "skipped":
+            return f"Not audited: {download.get('content_type')} is not HTML."
+        return None
+
+    def _page_sections(self, page, heading):
+        meta = page.get("meta", {})
+        images = page.get("images", [])
+        broken_links = page.get("broken_links", [])
+        suggestions = page.get("suggestions", [])
+        ai_suggestions = page.get("ai_suggestions", "")
+
+        def section(title, content):
+            return f"<{heading}>{title}</{heading}>\n{content}"
 
         # Meta Tags
-        meta_html = "<ul>"
-        for k, v in meta.items():
-            meta_html += f"<li><strong>{html.escape(k)}:</strong> {html.escape(v)}</li>"
-        meta_html += "</ul>"
-        html_parts.append(section("Meta Tags", meta_html))
+        items = [f"<li><strong>{html.escape(k)}:</strong> {html.escape(v)}</li>" for k, v in meta.items()]
+        meta_html = "<ul>" + "".join(items) + "</ul>"
 
         # Images
-        images = self.data.get("images", [])
         if images:
-            images_html = "<ul>"
+            items = []
             for img in images:
                 src = html.escape(img.get("src") or "")
                 alt = img.get("alt")
                 if alt and alt.strip():
-                    images_html += f"<li class='ok'><strong>src:</strong> {src} | <strong>alt:</strong> {html.escape(alt)}</li>"
+                    items.append(f"<li class='ok'><strong>src:</strong> {src} | <strong>alt:</strong> {html.escape(alt)}</li>")
                 else:
-                    images_html += f"<li class='error'><strong>src:</strong> {src} | <strong>alt:</strong> MISSING</li>"
-            images_html += "</ul>"
+                    items.append(f"<li class='error'><strong>src:</strong> {src} | <strong>alt:</strong> MISSING</li>")
+            images_html = "<ul>" + "".join(items) + "</ul>"
         else:
             images_html = "<p class='warn'>⚠️ No images found on this page.</p>"
-        html_parts.append(section("Images and Alt Attributes", images_html))
 
         # Broken Links
         if broken_links:
-            broken_html = "<ul>"
-            for link, err in broken_links:
-                err_text = html.escape(str(err))
-                broken_html += f"<li class='error'>{html.escape(link)} → {err_text}</li>"
-            broken_html += "</ul>"
+            items = [f"<li class='error'>{html.escape(link)} → {html.escape(str(err))}</li>" for link, err in broken_links]
+            broken_html = "<ul>" + "".join(items) + "</ul>"
         else:
             broken_html = "<p class='ok'>✅ No broken links found.</p>"
-        html_parts.append(section("Broken Links", broken_html))
 
         # Suggestions
-        sugg_html = "<ul>"
-        for s in suggestions:
-            s_class = "ok" if s.startswith("✅") else "warn" if s.startswith("⚠️") else "error"
-            sugg_html += f"<li class='{s_class}'>{html.escape(s)}</li>"
-        sugg_html += "</ul>"
-        html_parts.append(section("Local Analysis Suggestions", sugg_html))
+        items = [f"<li class='{self._suggestion_class(s)}'>{html.escape(s)}</li>" for s in suggestions]
+        sugg_html = "<ul>" + "".join(items) + "</ul>"
 
         # AI Suggestions
         if ai_suggestions:
             ai_html = f"<pre>{html.escape(ai_suggestions)}</pre>"
         else:
             ai_html = "<p class='warn'>⚠️ No AI suggestions generated.</p>"
-        html_parts.append(section("AI-Powered SEO Suggestions", ai_html))
 
-        html_parts.append("</body></html>")
-        return "\n".join(html_parts)
+        parts = [
+            section("Meta Tags", meta_html),
+            section("Images and Alt Attributes", images_html),
+            section("Broken Links", broken_html),
+        ]
+        # Only pages audited with --assets have page weight data.
+        if page.get("assets"):
+            parts.append(section("Page Weight and Assets", self._assets_html(page["assets"])))
+        parts.extend([
+            section("Local Analysis Suggestions", sugg_html),
+            section("AI-Powered SEO Suggestions", ai_html),
+        ])
+        return parts
 
-    def build_multi_page_html(self):
-        html_parts = [
-            "<html><head><meta charset='utf-8'><title>SEO Site Crawl Report</title>",
-            self._css(),
-            "</head><body>",
-            "<h1>SEO Site Crawl Report</h1>"
+    @staticmethod
+    def _assets_html(assets):
+        weight_class = "warn" if assets["heavy"] else "ok"
+        items = [
+            f"<li class='{weight_class}'><strong>Page weight:</strong> {assets['page_weight'] / 1024:.1f} KB "
+            f"({assets['images']} images, {assets['scripts']} scripts, {assets['stylesheets']} stylesheets: "
+            f"{assets['bytes'] / 1024:.1f} KB)</li>"
         ]
+        for src, size in assets["oversized_images"]:
+            items.append(f"<li class='warn'>Oversized image: {html.escape(src)} ({size / 1024:.1f} KB)</li>")
+        for src, size in assets["uncompressed"]:
+            items.append(f"<li class='warn'>Not compressed: {html.escape(src)} ({size / 1024:.1f} KB)</li>")
+        for src in assets["uncacheable"]:
+            items.append(f"<li class='warn'>No cache lifetime: {html.escape(src)}</li>")
+        for src, err in assets["broken"]:
+            items.append(f"<li class='error'>Could not load: {html.escape(src)} → {html.escape(str(err))}</li>")
+        return "<ul>" + "".join(items) + "</ul>"
 
-        for page in self.data:
-            url = html.escape(page.get("url", ""))
-            title = html.escape(page.get("title") or "No title found")
-            status_code = page.get("status_code")
-
-            meta = page.get("meta", {})
-            broken_links = page.get("broken_links", [])
-            suggestions = page.get("suggestions", [])
-            ai_suggestions = page.get("ai_suggestions", "")
-            images = page.get("images", [])
-
-            html_parts.append("<hr>")
-            html_parts.append(f"<h2>Page: <a href='{url}'>{url}</a></h2>")
-            html_parts.append(f"<p><strong>Status Code:</strong> {status_code}</p>")
-            html_parts.append(f"<p><strong>Page Title:</strong> {title}</p>")
-
-            # Meta
-            meta_html = "<ul>"
-            for k, v in meta.items():
-                meta_html += f"<li><strong>{html.escape(k)}:</strong> {html.escape(v)}</li>"
-            meta_html += "</ul>"
-            html_parts.append(f"<h3>Meta Tags</h3>\n{meta_html}")
-
-            # Images
-            if images:
-                images_html = "<ul>"
-                for img in images:
-                    src = html.escape(img.get("src") or "")
-                    alt = img.get("alt")
-                    if alt and alt.strip():
-                        images_html += f"<li class='ok'><strong>src:</strong> {src} | <strong>alt:</strong> {html.escape(alt)}</li>"
-                    else:
-                        images_html += f"<li class='error'><strong>src:</strong> {src} | <strong>alt:</strong> MISSING</li>"
-                images_html += "</ul>"
-            else:
-                images_html = "<p class='warn'>⚠️ No images found on this page.</p>"
-            html_parts.append(f"<h3>Images and Alt Attributes</h3>\n{images_html}")
-
-            # Broken Links
-            if broken_links:
-                broken_html = "<ul>"
-                for link, err in broken_links:
-                    err_text = html.escape(str(err))
-                    broken_html += f"<li class='error'>{html.escape(link)} → {err_text}</li>"
-                broken_html += "</ul>"
-            else:
-                broken_html = "<p class='ok'>✅ No broken links found.</p>"
-            html_parts.append(f"<h3>Broken Links</h3>\n{broken_html}")
-
-            # Suggestions
-            sugg_html = "<ul>"
-            for s in suggestions:
-                s_class = "ok" if s.startswith("✅") else "warn" if s.startswith("⚠️") else "error"
-                sugg_html += f"<li class='{s_class}'>{html.escape(s)}</li>"
-            sugg_html += "</ul>"
-            html_parts.append(f"<h3>Local Analysis Suggestions</h3>\n{sugg_html}")
-
-            # AI Suggestions
-            if ai_suggestions:
-                ai_html = f"<pre>{html.escape(ai_suggestions)}</pre>"
-            else:
-                ai_html = "<p class='warn'>⚠️ No AI suggestions generated.</p>"
-            html_parts.append(f"<h3>AI-Powered SEO Suggestions</h3>\n{ai_html}")
+    def _site_findings_parts(self, findings):
+        html_parts = ["<h2>Site-wide Findings</h2>"]
+        if not findings:
+            html_parts.append("<p class='ok'>✅ No site-wide issues found.</p>")
+            return html_parts
 
-        html_parts.append("</body></html>")
-        return "\n".join(html_parts)
+        severity_class = {"error": "error", "warning": "warn", "notice": ""}
+        html_parts.append("<table>")
+        for finding in findings[:MAX_HTML_SITE_FINDINGS]:
+            urls = ", ".join(f"<a href='{html.escape(u)}'>{html.escape(u)}</a>" for u in finding["urls"])
+            if finding["count"] > len(finding["urls"]):
+                urls += f" and {finding['count'] - len(finding['urls'])} more"
+            html_parts.append(
+                f"<tr><td class='{severity_class.get(finding['severity'], '')}'>{html.escape(finding['severity'])}</td>"
+                f"<td>{html.escape(finding['message'])}</td><td>{urls}</td></tr>"
+            )
+        html_parts.append("</table>")
+        if len(findings) > MAX_HTML_SITE_FINDINGS:
+            html_parts.append(f"<p>{len(findings) - MAX_HTML_SITE_FINDINGS} more findings are in the findings JSON file.</p>")
+        return html_parts
+
+    @staticmethod
+    def _suggestion_class(suggestion):
+        return "ok" if suggestion.startswith("✅") else "warn" if suggestion.startswith("⚠️") else "error"
 
     def _css(self):
         return (
@@ -181,5 +351,68 @@ class ReportGenerator:
             "ul{list-style:disc;margin-left:20px;} "
             ".error{color:red;} .ok{color:green;} .warn{color:orange;} "
             "pre{background:#f4f4f4;padding:10px;}"
+            "table{border-collapse:collapse;} th,td{text-align:left;padding:2px 12px 2px 0;}"
             "</style>"
         )
+
+
+class _SiteSummary:
+    """
+    Site-wide counters for the sharded report index, updated one page at a time.
+    """
+
+    def __init__(self, worst_pages):
+        self.worst_pages = worst_pages
+        self.pages = 0
+        self.status_codes = Counter()
+        self.missing_title = 0
+        self.missing_description = 0
+        self.broken_links = 0
+        self.images = 0
+        self.images_missing_alt = 0
+        self.errors = 0
+        self.warnings = 0
+        self.issues = Counter()
+        self._worst = []
+
+    def add(self, page, href):
+        self.pages += 1
+        self.status_codes[page.get("status_code")] += 1
+        if (page.get("download") or {}).get("status") == "skipped":
+            return
+        if not page.get("title"):
+            self.missing_title += 1
+        if not page.get("description"):
+            self.missing_description += 1
+
+        broken = len(page.get("broken_links", []))
+        self.broken_links += broken
+        images = page.get("images", [])
+        self.images += len(images)
+        self.images_missing_alt += sum(1 for img in images if not (img.get("alt") or "").strip())
+
+        errors = warnings = 0
+        for suggestion in page.get("suggestions", []):
+            if suggestion.startswith("✅"):
+                continue
+            if suggestion.startswith("⚠️"):
+                warnings += 1
+            else:
+                errors += 1
+            # Counts differ from page to page, so group issues by their wording alone.
+            self.issues[re.sub(r"\d+", "N", suggestion)] += 1
+        self.errors += errors
+        self.warnings += warnings
+
+        score = (errors, warnings, broken)
+        if score == (0, 0, 0):
+            return
+        # Bounded min-heap; on equal scores the earlier page is kept.
+        entry = (score, -self.pages, page.get("url", ""), href)
+        if len(self._worst) < self.worst_pages:
+            heapq.heappush(self._worst, entry)
+        elif entry > self._worst[0]:
+            heapq.heapreplace(self._worst, entry)
+
+    def worst(self):
+        return sorted(self._worst, reverse=True)
@@ -0,0 +1,75 @@
+# dnz_seochecker/report_sink.py
+
+import json
+
+
+class JsonlReportSink:
+    """
+    Writes each page report as one JSON Lines record as soon as it is ready,
+    so a crawl keeps no reports in memory and a crash loses at most the current page.
+    """
+
+    def __init__(self, path, append=False):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def write(self, report):
+        self._file.write(json.dumps(report, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonlReports:
+    """
+    Re-iterable view of a JSON Lines report file. Each pass streams the file from disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A record cut short by a crash mid-write.
+                    print(f"[WARNING] Skipping unreadable line in {self.path}")
+
+
+class FanoutSink:
+    """
+    Writes each report to several sinks, e.g. the JSON Lines stream and a ReportStore.
+    """
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+        self.count = 0
+
+    def write(self, report):
+        for sink in self.sinks:
+            sink.write(report)
+        self.count += 1
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
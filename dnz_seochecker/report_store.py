@@ -0,0 +1,335 @@
+# dnz_seochecker/report_store.py
+
+import json
+import sqlite3
+
+# Report fields kept as columns of the pages table. "text" values are interned in the
+# strings table, so a title or URL shared by many pages is stored once; "int" values are
+# stored as they are.
+_COLUMNS = [
+    ("url", "text"),
+    ("status_code", "int"),
+    ("title", "text"),
+    ("description", "text"),
+    ("keywords", "text"),
+    ("h1", "text"),
+    ("h1_count", "int"),
+    ("short_circuited", "int"),
+    ("content_simhash", "text"),
+    ("near_duplicate_of", "text"),
+    ("ai_suggestions", "text"),
+]
+_COLUMN_KINDS = dict(_COLUMNS)
+
+# Text column value of a page whose report has no such field, so queries can tell it
+# apart from a field that is present but empty (NULL). No string has id 0.
+_ABSENT = 0
+
+# Fields that can be checked by pages_missing().
+MISSING_FIELDS = ("title", "description", "keywords", "h1")
+
+
+def _is_text(value):
+    return value is None or isinstance(value, str)
+
+
+def _is_int(value):
+    return value is None or (isinstance(value, int) and not isinstance(value, bool))
+
+
+# Fields kept in their own tables, one row per item: (field, table, check of the whole value).
+# Values that do not have the expected shape are kept in the page's extra JSON instead.
+_TABLE_FIELDS = [
+    ("meta", lambda value: isinstance(value, dict)
+        and all(isinstance(k, str) and isinstance(v, str) for k, v in value.items())),
+    ("images", lambda value: isinstance(value, list)
+        and all(isinstance(img, dict) and list(img) == ["src", "alt"]
+                and _is_text(img["src"]) and _is_text(img["alt"]) for img in value)),
+    ("broken_links", lambda value: isinstance(value, list)
+        and all(isinstance(link, (list, tuple)) and len(link) == 2 and isinstance(link[0], str)
+                for link in value)),
+    ("suggestions", lambda value: isinstance(value, list) and all(isinstance(s, str) for s in value)),
+    ("findings", lambda value: isinstance(value, list)
+        and all(isinstance(f, dict) and list(f)[:3] == ["code", "severity", "message"]
+                and set(f) <= {"code", "severity", "message", "details"}
+                and all(isinstance(f[key], str) for key in ("code", "severity", "message")) for f in value)),
+]
+_TABLE_CHECKS = dict(_TABLE_FIELDS)
+
+
+class ReportStore:
+    """
+    Compact SQLite store of crawl page reports, written like a report sink.
+
+    Every string (URLs, titles, meta values, image sources, link errors, suggestion and
+    finding texts) is interned once in a strings table. Pages, meta tags, images, broken
+    links, suggestions and findings are rows of integer ids. Fields without a column of
+    their own (timings, cache and usage details) are kept as a small JSON object per
+    page. Iterating the store rebuilds every report exactly, key order included, streaming
+    from disk. The query methods run in SQL without loading the crawl.
+
+    Rows are buffered and written in one transaction every `batch_size` pages.
+    """
+
+    def __init__(self, path, append=False, batch_size=200, max_cached_strings=200000):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_cached_strings = max_cached_strings
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        text_columns = ", ".join(f"{field} INTEGER" for field, _ in _COLUMNS)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS strings (id INTEGER PRIMARY KEY, value TEXT NOT NULL UNIQUE);"
+            f"CREATE TABLE IF NOT EXISTS pages (id INTEGER PRIMARY KEY, shape INTEGER NOT NULL, {text_columns}, extra TEXT);"
+            "CREATE TABLE IF NOT EXISTS meta (page INTEGER NOT NULL, name INTEGER NOT NULL, value INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS images (page INTEGER NOT NULL, src INTEGER, alt INTEGER);"
+            "CREATE TABLE IF NOT EXISTS broken_links (page INTEGER NOT NULL, target INTEGER NOT NULL, error INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS suggestions (page INTEGER NOT NULL, text INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS findings (page INTEGER NOT NULL, code INTEGER NOT NULL, severity INTEGER NOT NULL, "
+            "message INTEGER NOT NULL, details INTEGER);"
+            "CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+        )
+        if not append:
+            self.conn.executescript(
+                "DELETE FROM pages; DELETE FROM meta; DELETE FROM images; DELETE FROM broken_links;"
+                "DELETE FROM suggestions; DELETE FROM findings; DELETE FROM strings; DELETE FROM store_meta;"
+            )
+        self.conn.commit()
+
+        self.count = self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        self._next_page = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM pages").fetchone()[0]
+        self._string_ids = {}
+        # While every stored string is in the cache, a cache miss means a new string.
+        self._cache_complete = self.conn.execute("SELECT COUNT(*) FROM strings").fetchone()[0] == 0
+        self._rows = {table: [] for table in ("pages", "meta", "images", "broken_links", "suggestions", "findings")}
+        self._pending = 0
+
+    def _intern(self, value):
+        if value is None:
+            return None
+        string_id = self._string_ids.get(value)
+        if string_id is not None:
+            return string_id
+        row = None if self._cache_complete else \
+            self.conn.execute("SELECT id FROM strings WHERE value = ?", (value,)).fetchone()
+        string_id = row[0] if row else self.conn.execute("INSERT INTO strings (value) VALUES (?)", (value,)).lastrowid
+        if len(self._string_ids) >= self.max_cached_strings:
+            self._string_ids.clear()
+            self._cache_complete = False
+        self._string_ids[value] = string_id
+        return string_id
+
+    def _intern_json(self, value):
+        return self._intern(json.dumps(value, ensure_ascii=False))
+
+    def write(self, report):
+        page = self._next_page
+        self._next_page += 1
+        columns = {}
+        extra = {}
+        for key, value in report.items():
+            kind = _COLUMN_KINDS.get(key)
+            if kind == "text" and _is_text(value):
+                columns[key] = self._intern(value)
+            elif kind == "int" and _is_int(value):
+                columns[key] = value
+            elif key in _TABLE_CHECKS and _TABLE_CHECKS[key](value):
+                self._add_items(page, key, value)
+            else:
+                extra[key] = value
+
+        row = [page, self._intern_json(list(report))]
+        for field, kind in _COLUMNS:
+            row.append(columns.get(field, _ABSENT if kind == "text" else None))
+        row.append(json.dumps(extra, ensure_ascii=False) if extra else None)
+        self._rows["pages"].append(row)
+
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def _add_items(self, page, field, value):
+        rows = self._rows[field]
+        intern = self._intern
+        if field == "meta":
+            rows.extend((page, intern(name), intern(content)) for name, content in value.items())
+        elif field == "images":
+            rows.extend((page, intern(img["src"]), intern(img["alt"])) for img in value)
+        elif field == "broken_links":
+            # Errors are status codes or messages; JSON keeps the type.
+            rows.extend((page, intern(target), self._intern_json(error)) for target, error in value)
+        elif field == "suggestions":
+            rows.extend((page, intern(text)) for text in value)
+        else:
+            rows.extend((page, intern(f["code"]), intern(f["severity"]), intern(f["message"]),
+                         self._intern_json(f["details"]) if "details" in f else None) for f in value)
+
+    def flush(self):
+        rows = self._rows
+        placeholders = ", ".join("?" * (len(_COLUMNS) + 3))
+        self.conn.executemany(f"INSERT INTO pages VALUES ({placeholders})", rows["pages"])
+        self.conn.executemany("INSERT INTO meta VALUES (?, ?, ?)", rows["meta"])
+        self.conn.executemany("INSERT INTO images VALUES (?, ?, ?)", rows["images"])
+        self.conn.executemany("INSERT INTO broken_links VALUES (?, ?, ?)", rows["broken_links"])
+        self.conn.executemany("INSERT INTO suggestions VALUES (?, ?)", rows["suggestions"])
+        self.conn.executemany("INSERT INTO findings VALUES (?, ?, ?, ?, ?)", rows["findings"])
+        self.conn.commit()
+        for table_rows in rows.values():
+            table_rows.clear()
+        self._pending = 0
+
+    def set_site_findings(self, findings):
+        self.conn.execute("INSERT OR REPLACE INTO store_meta VALUES ('site_findings', ?)",
+                          (json.dumps(findings, ensure_ascii=False),))
+        self.conn.commit()
+
+    def site_findings(self):
+        row = self.conn.execute("SELECT value FROM store_meta WHERE key = 'site_findings'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """
+        The stored reports in crawl order, rebuilt one page at a time. Each child table is
+        read by one cursor in page order alongside the pages, so nothing is loaded in full.
+        """
+        self.flush()
+        joins = " ".join(f"LEFT JOIN strings s_{field} ON s_{field}.id = p.{field}"
+                         for field, kind in _COLUMNS if kind == "text")
+        selected = ", ".join(f"s_{field}.value" if kind == "text" else f"p.{field}" for field, kind in _COLUMNS)
+        pages = self.conn.execute(
+            f"SELECT p.id, shape.value, {selected}, p.extra FROM pages p "
+            f"JOIN strings shape ON shape.id = p.shape {joins} ORDER BY p.id"
+        )
+        children = {
+            "meta": _ChildRows(self.conn, "meta", ("name", "value")),
+            "images": _ChildRows(self.conn, "images", ("src", "alt")),
+            "broken_links": _ChildRows(self.conn, "broken_links", ("target", "error")),
+            "suggestions": _ChildRows(self.conn, "suggestions", ("text",)),
+            "findings": _ChildRows(self.conn, "findings", ("code", "severity", "message", "details")),
+        }
+
+        for row in pages:
+            page = row[0]
+            values = dict(zip((field for field, _ in _COLUMNS), row[2:-1]))
+            if row[-1]:
+                values.update(json.loads(row[-1]))
+            items = {field: rows.take(page) for field, rows in children.items()}
+
+            report = {}
+            for key in json.loads(row[1]):
+                if key in values:
+                    report[key] = values[key]
+                elif key == "meta":
+                    report[key] = {name: content for name, content in items["meta"]}
+                elif key == "images":
+                    report[key] = [{"src": src, "alt": alt} for src, alt in items["images"]]
+                elif key == "broken_links":
+                    report[key] = [[target, json.loads(error)] for target, error in items["broken_links"]]
+                elif key == "suggestions":
+                    report[key] = [text for (text,) in items["suggestions"]]
+                elif key == "findings":
+                    report[key] = [_finding(*finding) for finding in items["findings"]]
+            yield report
+
+    def pages_missing(self, field, limit=None):
+        """
+        URLs of pages whose `field` (title, description, keywords or h1) is missing or
+        empty, in crawl order. Pages whose report has no such field (e.g. skipped downloads)
+        are left out.
+        """
+        if field not in MISSING_FIELDS:
+            raise ValueError(f"field must be one of {', '.join(MISSING_FIELDS)}")
+        self.flush()
+        rows = self.conn.execute(
+            f"SELECT url.value FROM pages p JOIN strings url ON url.id = p.url "
+            f"LEFT JOIN strings v ON v.id = p.{field} "
+            f"WHERE p.{field} IS NULL OR (p.{field} != {_ABSENT} AND v.value = '') ORDER BY p.id"
+            + (" LIMIT ?" if limit is not None else ""),
+            (limit,) if limit is not None else (),
+        )
+        return [url for (url,) in rows]
+
+    def count_missing(self, field):
+        if field not in MISSING_FIELDS:
+            raise ValueError(f"field must be one of {', '.join(MISSING_FIELDS)}")
+        self.flush()
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM pages p LEFT JOIN strings v ON v.id = p.{field} "
+            f"WHERE p.{field} IS NULL OR (p.{field} != {_ABSENT} AND v.value = '')"
+        ).fetchone()[0]
+
+    def top_broken_targets(self, limit=10):
+        """
+        The broken link targets found on the most pages:
+        [{"url", "error", "pages"}], most pages first.
+        """
+        self.flush()
+        rows = self.conn.execute(
+            "SELECT target.value, error.value, b.pages FROM "
+            "(SELECT target, MIN(error) AS error, COUNT(DISTINCT page) AS pages FROM broken_links GROUP BY target) b "
+            "JOIN strings target ON target.id = b.target JOIN strings error ON error.id = b.error "
+            "ORDER BY b.pages DESC, target.value LIMIT ?", (limit,)
+        )
+        return [{"url": url, "error": json.loads(error), "pages": pages} for url, error, pages in rows]
+
+    def issue_counts(self):
+        """
+        Pages per page finding: [{"code", "severity", "pages"}], most pages first.
+        """
+        self.flush()
+        rows = self.conn.execute(
+            "SELECT code.value, severity.value, f.pages FROM "
+            "(SELECT code, severity, COUNT(DISTINCT page) AS pages FROM findings GROUP BY code, severity) f "
+            "JOIN strings code ON code.id = f.code JOIN strings severity ON severity.id = f.severity "
+            "ORDER BY f.pages DESC, code.value"
+        )
+        return [{"code": code, "severity": severity, "pages": pages} for code, severity, pages in rows]
+
+    def stats(self):
+        self.flush()
+        return {
+            "pages": self.count,
+            "strings": self.conn.execute("SELECT COUNT(*) FROM strings").fetchone()[0],
+            "bytes": self.conn.execute(
+                "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()").fetchone()[0],
+        }
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _finding(code, severity, message, details):
+    finding = {"code": code, "severity": severity, "message": message}
+    if details is not None:
+        finding["details"] = json.loads(details)
+    return finding
+
+
+class _ChildRows:
+    """
+    Rows of one child table in page order, with their string ids resolved, taken page by
+    page while the pages are read.
+    """
+
+    def __init__(self, conn, table, columns):
+        selected = ", ".join(f"s{i}.value" for i in range(len(columns)))
+        joins = " ".join(f"LEFT JOIN strings s{i} ON s{i}.id = t.{column}" for i, column in enumerate(columns))
+        self._cursor = conn.execute(f"SELECT t.page, {selected} FROM {table} t {joins} ORDER BY t.rowid")
+        self._next = next(self._cursor, None)
+
+    def take(self, page):
+        rows = []
+        while self._next is not None and self._next[0] == page:
+            rows.append(self._next[1:])
+            self._next = next(self._cursor, None)
+        return rows
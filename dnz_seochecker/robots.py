@@ -0,0 +1,100 @@
+# dnz_seochecker/robots.py
+
+import threading
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+
+class RobotsCache:
+    """
+    robots.txt rules, fetched once per host and shared by every crawl that uses the cache.
+
+    Missing files (404 and other 4xx) allow everything, 401/403 disallow everything. A
+    server error or an unreachable robots.txt also disallows the host (RFC 9309 §2.3.1.4).
+    The `user_agent` is matched against the groups in the file by its product token.
+    """
+
+    def __init__(self, client, user_agent=None, timeout=10):
+        self.client = client
+        self.user_agent = user_agent or client.user_agent
+        self.timeout = timeout
+        self._rules = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.fetched = 0
+        self.blocked = 0
+
+    def rules(self, url):
+        """
+        The RobotFileParser for the host of `url`, fetching robots.txt on first use.
+        Concurrent first lookups of a host wait for one fetch.
+        """
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            rules = self._rules.get(key)
+            if rules is not None:
+                return rules
+            event = self._pending.get(key)
+            owner = event is None
+            if owner:
+                event = self._pending[key] = threading.Event()
+        if not owner:
+            event.wait()
+            return self._rules[key]
+
+        rules = RobotFileParser(key + "/robots.txt")
+        try:
+            rules = self._fetch(rules)
+        finally:
+            with self._lock:
+                self._rules[key] = rules
+                del self._pending[key]
+            event.set()
+        return rules
+
+    def _fetch(self, rules):
+        try:
+            response = self.client.get(rules.url, timeout=self.timeout)
+        except Exception as e:
+            print(f"[WARNING] Could not fetch {rules.url} ({e}); not crawling the host.")
+            rules.disallow_all = True
+            return rules
+        with self._lock:
+            self.fetched += 1
+        if response.status_code in (401, 403):
+            rules.disallow_all = True
+        elif response.status_code >= 500:
+            print(f"[WARNING] {rules.url} answered {response.status_code}; not crawling the host.")
+            rules.disallow_all = True
+        elif response.status_code >= 400:
+            rules.allow_all = True
+        else:
+            rules.parse(response.text.splitlines())
+        # can_fetch() refuses everything until the rules are marked as read.
+        rules.modified()
+        return rules
+
+    def allowed(self, url):
+        if self.rules(url).can_fetch(self.user_agent, url):
+            return True
+        with self._lock:
+            self.blocked += 1
+        return False
+
+    def crawl_delay(self, url):
+        """
+        Seconds the host asks crawlers to wait between requests, or None.
+        """
+        delay = self.rules(url).crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
+
+    def sitemaps(self, url):
+        """
+        Sitemap URLs listed in the host's robots.txt.
+        """
+        return self.rules(url).site_maps() or []
+
+    def stats(self):
+        with self._lock:
+            return {"hosts": len(self._rules), "fetched": self.fetched, "blocked": self.blocked}
@@ -0,0 +1,290 @@
+# dnz_seochecker/rules.py
+
+from hashlib import blake2b
+from urllib.parse import urlparse
+from dnz_seochecker.frontier import FingerprintSet
+from dnz_seochecker.url_normalizer import normalize_url, url_key
+from dnz_seochecker.seo_analyzer import (
+    TITLE_MIN_LENGTH, TITLE_MAX_LENGTH, DESCRIPTION_MIN_LENGTH, DESCRIPTION_MAX_LENGTH,
+    MAX_MINOR_BROKEN_LINKS,
+)
+
+SEVERITIES = ["error", "warning", "notice"]
+
+# URLs listed in a site-wide finding; its count always covers every affected page.
+MAX_SAMPLE_URLS = 10
+
+
+class PageRule:
+    """
+    A declarative check on one page report. `test(page)` returns something falsy when the
+    page passes, otherwise True or a dict of values that is formatted into `message`.
+    """
+
+    def __init__(self, code, severity, message, test):
+        self.code = code
+        self.severity = severity
+        self.message = message
+        self.test = test
+
+    def evaluate(self, page):
+        result = self.test(page)
+        if not result:
+            return None
+        details = result if isinstance(result, dict) else {}
+        finding = {"code": self.code, "severity": self.severity, "message": self.message.format(**details)}
+        if details:
+            finding["details"] = details
+        return finding
+
+
+def _shorter_than(field, limit):
+    def test(page):
+        value = page.get(field)
+        return bool(value) and len(value) < limit and {"length": len(value)}
+    return test
+
+
+def _longer_than(field, limit):
+    def test(page):
+        value = page.get(field)
+        return bool(value) and len(value) > limit and {"length": len(value)}
+    return test
+
+
+def _broken_links(low, high=None):
+    def test(page):
+        count = len(page.get("broken_links") or [])
+        return count >= low and (high is None or count <= high) and {"count": count}
+    return test
+
+
+def _download_status(page):
+    return (page.get("download") or {}).get("status")
+
+
+def _images_missing_alt(page):
+    missing = sum(1 for img in page.get("images") or [] if not (img.get("alt") or "").strip())
+    return missing and {"count": missing}
+
+
+# The same checks as SEOAnalyzer.run_all_checks, as structured findings.
+PAGE_RULES = [
+    PageRule("title-missing", "error", "Missing <title> tag.",
+             lambda page: not page.get("title")),
+    PageRule("title-too-short", "warning", "Title is too short ({length} chars).",
+             _shorter_than("title", TITLE_MIN_LENGTH)),
+    PageRule("title-too-long", "warning", "Title is too long ({length} chars).",
+             _longer_than("title", TITLE_MAX_LENGTH)),
+    PageRule("description-missing", "error", "Missing meta description.",
+             lambda page: not page.get("description")),
+    PageRule("description-too-short", "warning", "Meta description is too short ({length} chars).",
+             _shorter_than("description", DESCRIPTION_MIN_LENGTH)),
+    PageRule("description-too-long", "warning", "Meta description is too long ({length} chars).",
+             _longer_than("description", DESCRIPTION_MAX_LENGTH)),
+    PageRule("keywords-missing", "notice", "No keywords meta tag.",
+             lambda page: not page.get("keywords")),
+    PageRule("broken-links", "warning", "{count} broken links.",
+             _broken_links(1, MAX_MINOR_BROKEN_LINKS)),
+    PageRule("broken-links-many", "error", "{count} broken links.",
+             _broken_links(MAX_MINOR_BROKEN_LINKS + 1)),
+    PageRule("viewport-missing", "warning", "Missing viewport meta tag.",
+             lambda page: not (page.get("meta") or {}).get("viewport")),
+    # Reports written before h1_count existed have no value, so neither H1 rule fires for them.
+    PageRule("h1-missing", "error", "No <h1> tag.",
+             lambda page: page.get("h1_count") == 0),
+    PageRule("h1-multiple", "warning", "{count} <h1> tags; ideally use one.",
+             lambda page: (page.get("h1_count") or 0) > 1 and {"count": page["h1_count"]}),
+    # A head-only download stops before most of the body, so its missing images prove nothing.
+    PageRule("images-none", "notice", "No <img> tags on the page.",
+             lambda page: not page.get("images") and _download_status(page) != "head_only"),
+    PageRule("image-alt-missing", "error", "{count} images missing alt text.",
+             _images_missing_alt),
+]
+
+# Pages that were not read in full (see SiteChecker.fetch).
+DOWNLOAD_RULES = [
+    PageRule("page-truncated", "warning", "Page is larger than {bytes} bytes; only the first {bytes} bytes were audited.",
+             lambda page: _download_status(page) == "truncated" and {"bytes": page["download"]["bytes"]}),
+    PageRule("content-type-skipped", "notice", "Not audited: {content_type} is not an HTML content type.",
+             lambda page: _download_status(page) == "skipped" and {"content_type": page["download"]["content_type"]}),
+]
+PAGE_RULES.extend(DOWNLOAD_RULES)
+
+
+def _assets(page, field):
+    # Only pages audited with an AssetAuditor have an `assets` field.
+    return (page.get("assets") or {}).get(field) or []
+
+
+def _sized_assets(field):
+    def test(page):
+        items = _assets(page, field)
+        return bool(items) and {"count": len(items), "kb": round(sum(size for _, size in items) / 1024)}
+    return test
+
+
+def _counted_assets(field):
+    def test(page):
+        items = _assets(page, field)
+        return bool(items) and {"count": len(items)}
+    return test
+
+
+# Page weight and asset checks (see AssetAuditor.audit).
+ASSET_RULES = [
+    PageRule("page-heavy", "warning", "Page weighs {kb} KB with its images, scripts and stylesheets.",
+             lambda page: (page.get("assets") or {}).get("heavy")
+             and {"kb": round(page["assets"]["page_weight"] / 1024)}),
+    PageRule("images-oversized", "warning", "{count} oversized images ({kb} KB in total).",
+             _sized_assets("oversized_images")),
+    PageRule("assets-uncompressed", "warning", "{count} text assets served without compression ({kb} KB).",
+             _sized_assets("uncompressed")),
+    PageRule("assets-uncacheable", "notice", "{count} assets have no cache lifetime.",
+             _counted_assets("uncacheable")),
+    PageRule("assets-broken", "warning", "{count} images, scripts or stylesheets could not be loaded.",
+             _counted_assets("broken")),
+]
+PAGE_RULES.extend(ASSET_RULES)
+
+
+def evaluate_page(page, rules=PAGE_RULES):
+    """
+    Structured findings for one page report, in rule order. A page whose body was
+    skipped only gets the download findings.
+    """
+    if _download_status(page) == "skipped":
+        rules = [rule for rule in rules if rule in DOWNLOAD_RULES]
+    findings = []
+    for rule in rules:
+        finding = rule.evaluate(page)
+        if finding is not None:
+            findings.append(finding)
+    return findings
+
+
+# (report field, finding code, severity, message) for fields that should be unique per page.
+_UNIQUE_FIELDS = [
+    ("title", "duplicate-title", "warning", "{count} pages share the title \"{value}\"."),
+    ("description", "duplicate-description", "warning", "{count} pages share the meta description \"{value}\"."),
+    ("h1", "duplicate-h1", "notice", "{count} pages share the <h1> \"{value}\"."),
+]
+
+
+class SiteIndex:
+    """
+    Hash indexes over a crawl, updated one page at a time as reports are emitted, from
+    which the site-wide findings are read at the end: duplicate titles, descriptions and
+    H1s, orphan pages and internal links to broken pages. Every lookup is a dict or
+    fingerprint-set probe, so the whole pass is linear in the number of pages and links.
+    """
+
+    def __init__(self, start_url=None, track_links=True):
+        self.start_url = normalize_url(start_url) if start_url else None
+        self.host = urlparse(self.start_url).netloc if self.start_url else None
+        # Orphan detection needs the links of every page; a resumed crawl only has reports.
+        self.track_links = track_links
+        self.pages = 0
+        self._values = {field: {} for field, _, _, _ in _UNIQUE_FIELDS}
+        self._page_urls = []
+        self._linked = FingerprintSet()
+        self._broken_targets = {}
+        self._near_duplicates = {}
+
+    def add_page(self, page):
+        url = page.get("url")
+        self.pages += 1
+        if self.track_links:
+            self._page_urls.append(url)
+
+        for field, _, _, _ in _UNIQUE_FIELDS:
+            value = page.get(field)
+            if not value:
+                continue
+            # Keyed by a digest of the folded text: near-identical spacing and case count as duplicates.
+            folded = " ".join(value.split()).casefold()
+            key = blake2b(folded.encode("utf-8"), digest_size=8).digest()
+            entry = self._values[field].get(key)
+            if entry is None:
+                self._values[field][key] = [value, 1, [url]]
+            else:
+                entry[1] += 1
+                if len(entry[2]) < MAX_SAMPLE_URLS:
+                    entry[2].append(url)
+
+        # A page linking to the same broken URL twice counts once.
+        for link, error in dict(page.get("broken_links") or []).items():
+            target = normalize_url(link)
+            if target is None or urlparse(target).netloc != self.host:
+                continue
+            entry = self._broken_targets.get(target)
+            if entry is None:
+                self._broken_targets[target] = [error, 1, [url]]
+            else:
+                entry[1] += 1
+                if len(entry[2]) < MAX_SAMPLE_URLS:
+                    entry[2].append(url)
+
+        original = page.get("near_duplicate_of")
+        if original:
+            entry = self._near_duplicates.get(original)
+            if entry is None:
+                self._near_duplicates[original] = [1, [url]]
+            else:
+                entry[0] += 1
+                if len(entry[1]) < MAX_SAMPLE_URLS:
+                    entry[1].append(url)
+
+    def add_links(self, source, targets):
+        """
+        Record the internal links found on `source`; self-links are ignored. Links are
+        compared by url_key(), so `/blog` and `/blog/` are one page.
+        """
+        if not self.track_links:
+            return
+        source = url_key(source) or source
+        for target in targets:
+            target = url_key(target) or target
+            if target != source:
+                self._linked.add(target)
+
+    def findings(self):
+        findings = []
+        for field, code, severity, message in _UNIQUE_FIELDS:
+            for value, count, urls in self._values[field].values():
+                if count > 1:
+                    findings.append(_site_finding(code, severity, message.format(count=count, value=value),
+                                                  count, urls, {"value": value}))
+
+        for target, (error, count, urls) in self._broken_targets.items():
+            findings.append(_site_finding(
+                "broken-internal-target", "error",
+                f"{target} is broken ({error}) and linked from {count} pages.",
+                count, urls, {"target": target, "status": error},
+            ))
+
+        for original, (count, urls) in self._near_duplicates.items():
+            findings.append(_site_finding(
+                "near-duplicate-content", "warning",
+                f"{count} pages have nearly the same text as {original}.",
+                count, urls, {"original": original},
+            ))
+
+        if self.track_links:
+            start_key = url_key(self.start_url) if self.start_url else None
+            for url in self._page_urls:
+                key = url_key(url) or url
+                if key != start_key and key not in self._linked:
+                    findings.append(_site_finding("orphan-page", "warning",
+                                                  "No crawled page links to this page.", 1, [url]))
+
+        findings.sort(key=lambda f: (SEVERITIES.index(f["severity"]), -f["count"], f["code"], f["urls"][0]))
+        return findings
+
+
+def _site_finding(code, severity, message, count, urls, details=None):
+    finding = {"code": code, "severity": severity, "message": message, "count": count, "urls": list(urls)}
+    if details:
+        finding["details"] = details
+    return finding
+
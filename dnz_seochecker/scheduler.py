@@ -0,0 +1,68 @@
+# dnz_seochecker/scheduler.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+class FetchScheduler:
+    """
+    Runs page jobs for every crawl on one event loop within a shared budget:
+
+    - `workers` threads in total, so page jobs from all sites share one pool.
+    - At most `per_host_limit` jobs in flight per host.
+    - With `host_delay`, jobs for the same host start at least that many seconds apart.
+      With `robots` (a RobotsCache), a longer Crawl-delay from the host's robots.txt wins.
+
+    A job takes its host's slot before it queues for a worker. A host that is slow or held
+    back by its delay therefore never holds workers that other hosts could use. Workers
+    are handed out in the order jobs asked for them. Each crawl only keeps its own window
+    of pages in flight, so the hosts take turns.
+    """
+
+    def __init__(self, workers, per_host_limit=None, host_delay=0, robots=None):
+        self.workers = max(1, workers)
+        self.per_host_limit = max(1, per_host_limit or self.workers)
+        self.host_delay = max(0, host_delay)
+        self.robots = robots
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._workers = None
+        self._host_slots = {}
+        self._host_delays = {}
+        self._next_start = {}
+        self.jobs = 0
+        self.delayed = 0
+
+    async def run(self, url, fn, *args):
+        loop = asyncio.get_running_loop()
+        # Created on first use so they belong to the running loop.
+        if self._workers is None:
+            self._workers = asyncio.Semaphore(self.workers)
+        host = urlparse(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+            delay = self.host_delay
+            if self.robots is not None:
+                delay = max(delay, self.robots.crawl_delay(url) or 0)
+            self._host_delays[host] = delay
+
+        async with slot:
+            delay = self._host_delays[host]
+            if delay:
+                now = loop.time()
+                start = max(now, self._next_start.get(host, 0.0))
+                self._next_start[host] = start + delay
+                if start > now:
+                    self.delayed += 1
+                    await asyncio.sleep(start - now)
+            async with self._workers:
+                self.jobs += 1
+                return await loop.run_in_executor(self.executor, fn, *args)
+
+    def stats(self):
+        return {"workers": self.workers, "hosts": len(self._host_slots), "jobs": self.jobs,
+                "delayed": self.delayed}
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -1,18 +1,26 @@
 # dnz_seochecker/seo_analyzer.py
 
+# Length limits shared with the structured page rules in rules.py.
+TITLE_MIN_LENGTH = 10
+TITLE_MAX_LENGTH = 60
+DESCRIPTION_MIN_LENGTH = 50
+DESCRIPTION_MAX_LENGTH = 160
+MAX_MINOR_BROKEN_LINKS = 5
+
 class SEOAnalyzer:
-    def __init__(self, report, soup):
+    def __init__(self, report, soup=None, facts=None):
         self.report = report
         self.soup = soup
+        self.facts = facts
         self.suggestions = []
 
     def analyze_title(self):
         title = self.report.get('title')
         if not title:
             self.suggestions.append("❌ Missing <title> tag. Add a descriptive title.")
-        elif len(title) < 10:
+        elif len(title) < TITLE_MIN_LENGTH:
             self.suggestions.append(f"⚠️ Title is too short ({len(title)} chars). Make it more descriptive.")
-        elif len(title) > 60:
+        elif len(title) > TITLE_MAX_LENGTH:
             self.suggestions.append(f"⚠️ Title is long ({len(title)} chars). Consider shortening to ~60 chars.")
         else:
             self.suggestions.append("✅ Title length is good.")
@@ -21,9 +29,9 @@ class SEOAnalyzer:
         desc = self.report.get('description')
         if not desc:
             self.suggestions.append("❌ Missing meta description. Add one around 150–160 chars.")
-        elif len(desc) < 50:
+        elif len(desc) < DESCRIPTION_MIN_LENGTH:
             self.suggestions.append(f"⚠️ Description is short ({len(desc)} chars). Expand it.")
-        elif len(desc) > 160:
+        elif len(desc) > DESCRIPTION_MAX_LENGTH:
             self.suggestions.append(f"⚠️ Description is long ({len(desc)} chars). Consider shortening.")
         else:
             self.suggestions.append("✅ Meta description length is good.")
@@ -39,7 +47,7 @@ class SEOAnalyzer:
         broken = self.report.get('broken_links', [])
         if not broken:
             self.suggestions.append("✅ No broken links found.")
-        elif len(broken) <= 5:
+        elif len(broken) <= MAX_MINOR_BROKEN_LINKS:
             self.suggestions.append(f"⚠️ {len(broken)} broken links found. Consider fixing them.")
         else:
             self.suggestions.append(f"❌ {len(broken)} broken links found. Major issue—fix them ASAP.")
@@ -52,11 +60,14 @@ class SEOAnalyzer:
             self.suggestions.append("✅ Viewport meta tag found.")
 
     def analyze_h1(self):
-        h1_tags = self.soup.find_all('h1')
-        if not h1_tags:
+        if self.facts is not None:
+            h1_count = self.facts.h1_count
+        else:
+            h1_count = len(self.soup.find_all('h1'))
+        if not h1_count:
             self.suggestions.append("❌ No <h1> tag found. Add a main heading.")
-        elif len(h1_tags) > 1:
-            self.suggestions.append(f"⚠️ Multiple <h1> tags found ({len(h1_tags)}). Ideally use one.")
+        elif h1_count > 1:
+            self.suggestions.append(f"⚠️ Multiple <h1> tags found ({h1_count}). Ideally use one.")
         else:
             self.suggestions.append("✅ Single <h1> tag found.")
 
@@ -66,6 +77,9 @@ class SEOAnalyzer:
      missing_alt = [img for img in images if not img.get('alt') or img.get('alt').strip() == ""]
 
      if not images:
+         # A head-only download never reached most images, so say nothing either way.
+         if (self.report.get('download') or {}).get('status') == 'head_only':
+             return
          self.suggestions.append("⚠️ No <img> tags found on the page.")
      elif not missing_alt:
         self.suggestions.append("✅ All images have alt text.")
@@ -73,6 +87,26 @@ class SEOAnalyzer:
         self.suggestions.append(f"❌ {len(missing_alt)} images missing alt text. Add descriptive alt attributes for accessibility and SEO.")
 
     
+    def analyze_download(self):
+        download = self.report.get('download') or {}
+        if download.get('status') == 'truncated':
+            self.suggestions.append(f"⚠️ Page is larger than {download['bytes']} bytes; only the first {download['bytes']} bytes were audited.")
+
+    def analyze_assets(self):
+        assets = self.report.get('assets')
+        if not assets:
+            return
+        if assets['heavy']:
+            self.suggestions.append(f"⚠️ Page weighs {round(assets['page_weight'] / 1024)} KB with its assets. Reduce images and scripts.")
+        if assets['oversized_images']:
+            self.suggestions.append(f"⚠️ {len(assets['oversized_images'])} oversized images. Resize or compress them (WebP/AVIF).")
+        if assets['uncompressed']:
+            self.suggestions.append(f"⚠️ {len(assets['uncompressed'])} text assets served without compression. Enable gzip or Brotli.")
+        if assets['uncacheable']:
+            self.suggestions.append(f"⚠️ {len(assets['uncacheable'])} assets have no cache lifetime. Send Cache-Control: max-age.")
+        if assets['broken']:
+            self.suggestions.append(f"❌ {len(assets['broken'])} images, scripts or stylesheets could not be loaded.")
+
     def run_all_checks(self):
         self.analyze_title()
         self.analyze_description()
@@ -81,6 +115,8 @@ class SEOAnalyzer:
         self.analyze_viewport()
         self.analyze_h1()
         self.analyze_image_alt()
+        self.analyze_download()
+        self.analyze_assets()
 
         return self.suggestions
     
\ No newline at end of file
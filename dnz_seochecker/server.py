@@ -0,0 +1,261 @@
+# dnz_seochecker/server.py
+
+import itertools
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dnz_seochecker.audit import audit_page
+from dnz_seochecker.crawler import Crawler
+from dnz_seochecker.http_client import HttpClient
+from dnz_seochecker.link_cache import LinkStatusCache
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, job_id, kind, params):
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.status = "queued"
+        self.result = None
+        self.site_findings = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+
+    def to_dict(self, include_result=True):
+        data = {
+            "id": self.id,
+            "type": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        if include_result and self.status == "done":
+            data["result"] = self.result
+            if self.site_findings is not None:
+                data["site_findings"] = self.site_findings
+        return data
+
+
+class AuditService:
+    """
+    Warm state shared by every job of a long-running server: one HTTP client with its
+    connection pools and host health, one AI client and response cache, and an optional
+    on-disk link store. Jobs wait in a bounded queue for one of `workers` threads; when
+    the queue is full, submit() raises QueueFullError so callers can back off.
+    """
+
+    def __init__(self, client=None, ai_suggester=None, link_store=None, workers=4, queue_size=32,
+                 max_crawl_pages=500, max_crawl_concurrency=8, max_jobs=1000):
+        self.client = client or HttpClient(pool_connections=100, pool_maxsize=max(10, workers))
+        self.ai_suggester = ai_suggester
+        self.link_store = link_store
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_crawl_pages = max_crawl_pages
+        self.max_crawl_concurrency = max_crawl_concurrency
+        self.max_jobs = max_jobs
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._jobs = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self._threads = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, kind, params):
+        with self._lock:
+            job = Job(str(next(self._ids)), kind, params)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.rejected += 1
+                raise QueueFullError(f"Job queue is full ({self.queue_size} jobs waiting).")
+            self._jobs[job.id] = job
+            self._trim_jobs()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _trim_jobs(self):
+        # Keep the most recent jobs; finished ones are dropped oldest first.
+        if len(self._jobs) <= self.max_jobs:
+            return
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id].done.is_set():
+                del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                if job.kind == "check":
+                    self._run_check(job)
+                else:
+                    self._run_crawl(job)
+            except Exception as e:
+                print(f"[ERROR] Job {job.id} failed: {e}")
+                job.status = "failed"
+                job.error = str(e)
+            job.finished_at = time.time()
+            job.done.set()
+
+    def _ai_for(self, params):
+        return self.ai_suggester if params.get("ai", True) else None
+
+    def _run_check(self, job):
+        report = audit_page(job.params["url"], client=self.client, ai_suggester=self._ai_for(job.params),
+                            link_cache=LinkStatusCache(store=self.link_store))
+        if report is None:
+            job.status = "failed"
+            job.error = "Failed to fetch the site."
+            return
+        job.result = report
+        job.status = "done"
+
+    def _run_crawl(self, job):
+        params = job.params
+        ai_suggester = self._ai_for(params)
+        crawler = Crawler(
+            params["url"],
+            max_pages=min(int(params.get("max_pages", 10)), self.max_crawl_pages),
+            no_ai=ai_suggester is None,
+            concurrency=min(int(params.get("concurrency", 1)), self.max_crawl_concurrency),
+            link_store=self.link_store,
+            client=self.client,
+            ai_suggester=ai_suggester,
+        )
+        job.result = crawler.crawl()
+        job.site_findings = crawler.site_index.findings()
+        job.status = "done"
+
+    def stats(self):
+        with self._lock:
+            statuses = {}
+            for job in self._jobs.values():
+                statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "queue_size": self.queue_size,
+            "rejected": self.rejected,
+            "jobs": statuses,
+            "http": self.client.stats(),
+            "host_health": self.client.health.stats(),
+            "ai": self.ai_suggester.stats() if self.ai_suggester is not None else None,
+        }
+
+    def close(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        if self.ai_suggester is not None:
+            self.ai_suggester.close()
+        if self.link_store is not None:
+            self.link_store.close()
+        self.client.close()
+
+
+class AuditServer(ThreadingHTTPServer):
+    """
+    Local HTTP/JSON API in front of an AuditService:
+
+        GET  /health           service, queue and client statistics
+        POST /check            {"url", "ai": true, "wait": true}
+        POST /crawl            {"url", "max_pages": 10, "concurrency": 1, "ai": true, "wait": false}
+        GET  /jobs/<id>        job status, with "result" once it is done
+
+    With "wait", the response is the report itself, exactly as `check` / `crawl` write it
+    to JSON. Otherwise the job is accepted with 202 and polled. A full queue answers 503.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, service, wait_timeout=300):
+        super().__init__(address, _Handler)
+        self.service = service
+        self.wait_timeout = wait_timeout
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/health":
+            self._send_json(200, dict(status="ok", **service.stats()))
+        elif self.path.startswith("/jobs/"):
+            job = service.get(self.path[len("/jobs/"):])
+            if job is None:
+                self._send_json(404, {"error": "Unknown job."})
+            else:
+                self._send_json(200, job.to_dict())
+        else:
+            self._send_json(404, {"error": "Not found."})
+
+    def do_POST(self):
+        if self.path not in ("/check", "/crawl"):
+            self._send_json(404, {"error": "Not found."})
+            return
+        kind = self.path[1:]
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            params = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(params, dict) or not isinstance(params.get("url"), str):
+                raise ValueError("Body must be a JSON object with a \"url\".")
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        wait = params.pop("wait", kind == "check")
+        try:
+            job = self.server.service.submit(kind, params)
+        except QueueFullError as e:
+            self._send_json(503, {"error": str(e)}, headers={"Retry-After": "1"})
+            return
+
+        if not wait:
+            self._send_json(202, job.to_dict(include_result=False), headers={"Location": f"/jobs/{job.id}"})
+        elif not job.done.wait(self.server.wait_timeout):
+            self._send_json(202, job.to_dict(include_result=False), headers={"Location": f"/jobs/{job.id}"})
+        elif job.status == "done":
+            self._send_json(200, job.result)
+        else:
+            self._send_json(502, {"error": job.error, "id": job.id})
+
+    def _send_json(self, status, data, headers=None):
+        # Same formatting as the JSON report files.
+        body = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
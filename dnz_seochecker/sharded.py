@@ -0,0 +1,228 @@
+# dnz_seochecker/sharded.py
+
+import heapq
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+from dnz_seochecker.crawler import Crawler
+from dnz_seochecker.http_client import HttpClient, DEFAULT_USER_AGENT
+from dnz_seochecker.link_cache import LinkStatusCache
+from dnz_seochecker.near_duplicates import NearDuplicateIndex
+from dnz_seochecker.report_sink import JsonlReportSink, JsonlReports
+from dnz_seochecker.rules import SiteIndex
+from dnz_seochecker.url_normalizer import normalize_url
+
+# Seconds an idle worker waits before asking the queue again.
+POLL_INTERVAL = 0.2
+
+
+def shard_stream_path(output_dir, shard):
+    return os.path.join(output_dir, f"shard-{shard:03d}.jsonl")
+
+
+class ShardWorker:
+    """
+    Crawls the URLs of one shard. It leases them from the work queue, processes up to
+    `concurrency` pages at a time with Crawler.process_page, and streams one record per
+    URL to its shard file in lease order: {"seq", "url", "report", "links"}. The internal
+    links found go back to the queue, which hands each one to the shard that owns it.
+    Link statuses are shared with the other shards through the queue's link store.
+
+    The worker stops once the queue is finished: nothing leased by any shard and nothing
+    left to claim within the page budget.
+    """
+
+    def __init__(self, queue, shard, output_path, concurrency=4, user_agent=DEFAULT_USER_AGENT,
+                 robots=False, assets=False, **crawler_options):
+        self.queue = queue
+        self.shard = shard
+        self.output_path = output_path
+        self.concurrency = max(1, concurrency)
+        self.client = HttpClient(user_agent=user_agent, pool_maxsize=max(10, self.concurrency))
+        robots_cache = None
+        if robots:
+            from dnz_seochecker.robots import RobotsCache
+            robots_cache = RobotsCache(self.client)
+        self.asset_auditor = None
+        if assets:
+            from dnz_seochecker.assets import AssetAuditor
+            self.asset_auditor = AssetAuditor(self.client)
+        self.link_store = queue.link_store()
+        # Only the page pipeline of the Crawler is used; the queue replaces its frontier.
+        self.crawler = Crawler(queue.start_url, no_ai=True, concurrency=self.concurrency, client=self.client,
+                               link_cache=LinkStatusCache(store=self.link_store), robots=robots_cache,
+                               asset_auditor=self.asset_auditor, **crawler_options)
+        self.pages = 0
+
+    def run(self):
+        window = deque()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor, \
+                JsonlReportSink(self.output_path, append=True) as sink:
+            try:
+                while True:
+                    if len(window) < self.concurrency:
+                        for seq, url in self.queue.claim(self.shard, self.concurrency - len(window)):
+                            window.append((seq, url, executor.submit(self.crawler.process_page, url)))
+                    if not window:
+                        if self.queue.finished():
+                            break
+                        time.sleep(POLL_INTERVAL)
+                        continue
+                    seq, url, future = window.popleft()
+                    self._commit(sink, seq, url, future.result())
+            finally:
+                for _, _, future in window:
+                    future.cancel()
+                if self.asset_auditor is not None:
+                    self.asset_auditor.close()
+                self.link_store.close()
+                self.client.close()
+        return self.pages
+
+    def _commit(self, sink, seq, url, result):
+        if result is None:
+            self.queue.complete(url, visited=False)
+            return
+        report, links = result
+        internal_links = []
+        for link in links:
+            full_link = urljoin(url, link)
+            if self.crawler.is_internal(full_link):
+                target = normalize_url(full_link)
+                if target is not None:
+                    internal_links.append(target)
+        robots = self.crawler.robots
+        to_queue = [link for link in internal_links if robots is None or robots.allowed(link)]
+
+        # The record is on disk before the URL is finished, so a crash can only repeat a page.
+        sink.write({"seq": seq, "url": url, "report": report, "links": internal_links})
+        self.queue.complete(url, visited=True, links=to_queue)
+        if report is not None:
+            self.pages += 1
+
+
+def run_shard_worker(queue, shard, output_path, options):
+    # Entry point of a worker process, and of the shard-worker command.
+    ShardWorker(queue, shard, output_path, **options).run()
+
+
+class ShardedCrawl:
+    """
+    Coordinates a crawl split over `shards` worker processes through a work queue (a
+    SqliteWorkQueue, or any queue with the same methods). URLs are assigned to shards by
+    a hash of their host and path. The queue stores every URL once, so a page linked from
+    several shards is crawled once, by its owner.
+
+    run() seeds the queue, starts one local process per shard (unless `spawn` is off and
+    shard-worker processes started separately do the work), restarts workers that die,
+    and merges the shard streams. The merge orders records by queue sequence, drops the
+    second copy of a page crawled twice after a lost lease, matches near-duplicates and
+    builds the site index, so the merged stream reads like one crawl.
+    """
+
+    def __init__(self, start_url, queue, output_dir, shards=4, max_pages=10, near_duplicate_distance=3,
+                 lease_timeout=300, max_restarts=2, worker_options=None):
+        self.start_url = normalize_url(start_url) or start_url
+        self.queue = queue
+        self.output_dir = output_dir
+        self.shards = max(1, shards)
+        self.max_pages = max_pages
+        self.near_duplicate_distance = near_duplicate_distance
+        self.lease_timeout = lease_timeout
+        self.max_restarts = max_restarts
+        self.worker_options = worker_options or {}
+        # Sequence numbers of URLs whose lease was taken back; only these can appear twice.
+        self.released = set()
+        self.restarts = 0
+        self.duplicates_dropped = 0
+
+    def run(self, spawn=True):
+        os.makedirs(self.output_dir, exist_ok=True)
+        for shard in range(self.shards):
+            # A new crawl starts with empty shard streams; workers append to them.
+            open(shard_stream_path(self.output_dir, shard), "w").close()
+        self.queue.start(self.start_url, self.shards, self.max_pages)
+        self.queue.put([self.start_url])
+        if spawn:
+            self._run_local_workers()
+        else:
+            self._wait_for_remote_workers()
+
+    def _run_local_workers(self):
+        # spawn rather than fork: each worker builds its own HTTP client and threads.
+        context = multiprocessing.get_context("spawn")
+        processes = {shard: self._start_worker(context, shard) for shard in range(self.shards)}
+        next_lease_check = time.monotonic() + self.lease_timeout / 10
+        while processes:
+            time.sleep(POLL_INTERVAL)
+            for shard, process in list(processes.items()):
+                if process.is_alive():
+                    continue
+                del processes[shard]
+                if process.exitcode == 0:
+                    continue
+                # The worker died: its leased URLs go back to the queue for its replacement.
+                self.released.update(self.queue.release(shard=shard))
+                if self.restarts < self.max_restarts:
+                    self.restarts += 1
+                    print(f"[WARNING] Shard {shard} worker exited with code {process.exitcode}; restarting it.")
+                    processes[shard] = self._start_worker(context, shard)
+                else:
+                    print(f"[ERROR] Shard {shard} worker exited with code {process.exitcode}; "
+                          f"its remaining URLs are not crawled.")
+            if time.monotonic() >= next_lease_check:
+                self.released.update(self.queue.release(older_than=self.lease_timeout))
+                next_lease_check = time.monotonic() + self.lease_timeout / 10
+
+    def _start_worker(self, context, shard):
+        process = context.Process(target=run_shard_worker, daemon=True,
+                                  args=(self.queue, shard, shard_stream_path(self.output_dir, shard),
+                                        self.worker_options))
+        process.start()
+        return process
+
+    def _wait_for_remote_workers(self):
+        print(f"[INFO] Waiting for {self.shards} shard workers (run the shard-worker command for each shard).")
+        next_lease_check = time.monotonic() + self.lease_timeout / 10
+        while not self.queue.finished():
+            time.sleep(POLL_INTERVAL)
+            if time.monotonic() >= next_lease_check:
+                self.released.update(self.queue.release(older_than=self.lease_timeout))
+                next_lease_check = time.monotonic() + self.lease_timeout / 10
+
+    def merge(self, sink):
+        """
+        Merge the shard streams into `sink` in queue order. Returns the SiteIndex of the
+        merged crawl.
+        """
+        site_index = SiteIndex(self.start_url)
+        near_duplicates = NearDuplicateIndex(self.near_duplicate_distance)
+        paths = [shard_stream_path(self.output_dir, shard) for shard in range(self.shards)]
+        # Each shard writes its URLs in the order it claimed them, which is queue order,
+        # except for released URLs: claimed again later, they land after higher seqs. They
+        # are few, so they are set aside, sorted and merged back in.
+        streams = [(record for record in JsonlReports(path) if record["seq"] not in self.released)
+                   for path in paths]
+        if self.released:
+            late = [record for path in paths for record in JsonlReports(path) if record["seq"] in self.released]
+            late.sort(key=lambda record: record["seq"])
+            streams.append(late)
+        merged_seqs = set()
+        for record in heapq.merge(*streams, key=lambda record: record["seq"]):
+            seq = record["seq"]
+            if seq in self.released:
+                if seq in merged_seqs:
+                    self.duplicates_dropped += 1
+                    continue
+                merged_seqs.add(seq)
+            site_index.add_links(record["url"], record["links"])
+            report = record["report"]
+            if report is None:
+                continue
+            report["near_duplicate_of"] = near_duplicates.add(report["url"], int(report.get("content_simhash") or "0", 16))
+            site_index.add_page(report)
+            sink.write(report)
+        return site_index
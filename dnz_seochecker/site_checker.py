@@ -1,50 +1,174 @@
 # dnz_seochecker/site_checker.py
 
-import requests
+import re
+import time
 from bs4 import BeautifulSoup
+from dnz_seochecker.http_client import get_default_client, decode_body
+from dnz_seochecker.page_facts import extract_page_facts
+from dnz_seochecker.profiler import NULL_PROFILER
+
+# Googlebot only indexes the first 15 MB of an HTML file, so nothing past that is audited.
+DEFAULT_MAX_PAGE_BYTES = 15 * 2**20
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+_CHUNK_SIZE = 64 * 1024
+# Unread bodies up to this size are drained so the connection can be reused.
+_DRAIN_LIMIT = 64 * 1024
+_HEAD_END = re.compile(rb"</head\s*>", re.I)
+_H1_END = re.compile(rb"</h1\s*>", re.I)
+
 
 class SiteChecker:
-    def __init__(self, url, timeout=10):
+    def __init__(self, url, timeout=10, client=None, profiler=None, max_bytes=DEFAULT_MAX_PAGE_BYTES,
+                 content_types=HTML_CONTENT_TYPES, head_only=False):
         self.url = url
+        # The URL the page was served from, after redirects; relative links resolve against it.
+        self.final_url = url
         self.timeout = timeout
+        self.client = client or get_default_client()
+        self.profiler = profiler or NULL_PROFILER
+        self.max_bytes = max_bytes
+        self.content_types = content_types
+        self.head_only = head_only
+        self.download = None
         self.html = None
-        self.soup = None
+        self.content = None
+        self.encoding = None
+        self.facts = None
+        self.headers = None
+        self.not_modified = False
         self.status_code = None
+        self.timing = None
+        self._soup = None
+
+    def fetch(self, parse=True, headers=None):
+        """
+        With parse=False only the raw body is kept (`content` and `encoding`); call parse()
+        or set `facts` afterwards. With conditional `headers`, a 304 response also counts
+        as fetched and sets `not_modified`.
 
-    def fetch(self):
+        The body is streamed and never grows past `max_bytes`. With `head_only`, reading
+        stops once </head> and the first </h1> have arrived. A response whose Content-Type
+        is not in `content_types` is not read at all. `download` records which happened:
+        {"status": "complete" | "truncated" | "head_only" | "skipped", "bytes": ...}.
+        """
         try:
-            response = requests.get(self.url, timeout=self.timeout)
-            self.status_code = response.status_code
-            if response.status_code == 200:
-                self.html = response.text
-                self.soup = BeautifulSoup(self.html, 'html.parser')
-                return True
-            else:
-                return False
+            with self.profiler.stage("fetch"):
+                response = self.client.get(self.url, timeout=self.timeout, headers=headers, stream=True)
+                try:
+                    self.status_code = response.status_code
+                    self.final_url = response.url or self.url
+                    self.timing = response.timing
+                    if response.status_code == 304 and headers:
+                        self.not_modified = True
+                        _discard(response)
+                        return True
+                    if response.status_code != 200:
+                        _discard(response)
+                        return False
+                    started = time.perf_counter()
+                    self.headers = response.headers
+                    self.encoding = response.encoding
+                    self.content, self.download = self._read_body(response)
+                    read_seconds = time.perf_counter() - started
+                    self.client.add_body_time(read_seconds)
+                    self.timing = dict(self.timing, total=round(self.timing["total"] + read_seconds, 6))
+                finally:
+                    response.close()
+            if parse and not self.skipped:
+                self.parse()
+            return True
         except Exception as e:
             print(f"[ERROR] Could not fetch {self.url}: {e}")
             return False
 
+    def _read_body(self, response):
+        media_type = response.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+        # Without a Content-Type the body is read and treated as HTML, as browsers sniff it.
+        if media_type and self.content_types and media_type not in self.content_types:
+            _discard(response)
+            return b"", {"status": "skipped", "bytes": 0, "content_type": media_type}
+
+        chunks = response.iter_content(_CHUNK_SIZE)
+        parts = []
+        size = 0
+        status = "complete"
+        head_seen = h1_seen = False
+        tail = b""
+        for chunk in chunks:
+            if size + len(chunk) > self.max_bytes:
+                parts.append(chunk[:self.max_bytes - size])
+                size = self.max_bytes
+                status = "truncated"
+                break
+            parts.append(chunk)
+            size += len(chunk)
+            if self.head_only:
+                # Keep the end of the previous chunk so a tag split between chunks still matches.
+                window = tail + chunk
+                head_seen = head_seen or _HEAD_END.search(window) is not None
+                h1_seen = h1_seen or _H1_END.search(window) is not None
+                if head_seen and h1_seen:
+                    status = "head_only"
+                    break
+                tail = window[-16:]
+        if status != "complete":
+            _discard(response, chunks)
+        return b"".join(parts), {"status": status, "bytes": size}
+
+    @property
+    def skipped(self):
+        return self.download is not None and self.download["status"] == "skipped"
+
+    def parse(self):
+        with self.profiler.stage("parse"):
+            self.html = decode_body(self.content, self.encoding)
+            self.facts = extract_page_facts(self.html)
+
+    @property
+    def soup(self):
+        # Built only when a custom rule asks for the full tree; the built-in checks use `facts`.
+        if self.html is None and self.content is not None:
+            self.html = decode_body(self.content, self.encoding)
+        if self._soup is None and self.html is not None:
+            self._soup = BeautifulSoup(self.html, 'html.parser')
+        return self._soup
+
     def get_title(self):
-        if self.soup:
-            title_tag = self.soup.find('title')
-            return title_tag.text.strip() if title_tag else None
+        if self.facts:
+            return self.facts.title
+        return None
+
+    def get_h1(self):
+        if self.facts:
+            return self.facts.h1
         return None
 
+    def get_h1_count(self):
+        if self.facts:
+            return self.facts.h1_count
+        return 0
+
     def get_all_links(self):
-        if self.soup:
-            return [a.get('href') for a in self.soup.find_all('a', href=True)]
+        if self.facts:
+            return list(self.facts.links)
         return []
 
     def get_images_with_alt(self):
-     if not self.soup:
-        return []
-     images = []
-     for img in self.soup.find_all('img'):
-        src = img.get('src')
-        alt = img.get('alt')
-        images.append({
-            "src": src,
-            "alt": alt
-        })
-     return images
\ No newline at end of file
+        if not self.facts:
+            return []
+        return [dict(img) for img in self.facts.images]
+
+
+def _discard(response, chunks=None):
+    # Read a short unread body (even an empty one) so the connection goes back to the pool.
+    # A long one, by Content-Length or once more than _DRAIN_LIMIT bytes have been read,
+    # is dropped together with its connection when the response is closed.
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit() and int(length) > _DRAIN_LIMIT:
+        return
+    read = 0
+    for chunk in chunks if chunks is not None else response.iter_content(_CHUNK_SIZE):
+        read += len(chunk)
+        if read > _DRAIN_LIMIT:
+            return
@@ -0,0 +1,159 @@
+# dnz_seochecker/sitemap.py
+
+import gzip
+import heapq
+from datetime import datetime, timezone
+from xml.etree.ElementTree import iterparse
+
+# Limits from the sitemap protocol: 50,000 URLs and 50 MB (uncompressed) per file.
+MAX_SITEMAP_URLS = 50000
+MAX_SITEMAP_BYTES = 50 * 2**20
+
+# Sitemap indexes may point at further indexes; deeper nesting is not followed.
+MAX_INDEX_DEPTH = 2
+
+
+def parse_lastmod(value):
+    """
+    A W3C datetime ("2024-05-01", "2024-05-01T10:00:00+02:00", "...Z") as a Unix
+    timestamp, or None if it cannot be read. Dates without a timezone count as UTC.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value[-1:] in ("Z", "z"):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        # Before Python 3.11, fromisoformat only reads 3 or 6 fractional digits; keep the date.
+        try:
+            parsed = datetime.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class _Stream:
+    """
+    Read-only view of a streamed body: the bytes read to sniff its format are put back in
+    front, and reading past `limit` bytes raises ValueError.
+    """
+
+    def __init__(self, head, rest, limit):
+        self._head = head
+        self._rest = rest
+        self._left = limit
+
+    def read(self, size=-1):
+        if self._head:
+            data, self._head = (self._head, b"") if size is None or size < 0 else \
+                (self._head[:size], self._head[size:])
+        else:
+            data = self._rest.read(size if size is not None and size >= 0 else None)
+        self._left -= len(data)
+        if self._left < 0:
+            raise ValueError(f"sitemap is larger than {MAX_SITEMAP_BYTES // 2**20} MB")
+        return data
+
+
+def _open_body(response):
+    raw = response.raw
+    # Undo any Content-Encoding; a gzipped file (sitemap.xml.gz) is recognized by its magic bytes.
+    raw.decode_content = True
+    head = b""
+    while len(head) < 2:
+        chunk = raw.read(2 - len(head))
+        if not chunk:
+            break
+        head += chunk
+    if head == b"\x1f\x8b":
+        return _Stream(b"", gzip.GzipFile(fileobj=_Stream(head, raw, MAX_SITEMAP_BYTES)), MAX_SITEMAP_BYTES)
+    return _Stream(head, raw, MAX_SITEMAP_BYTES)
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_sitemap(client, url, depth=0):
+    """
+    Yield (url, lastmod) for every page listed in the sitemap at `url`, following sitemap
+    indexes. The file is parsed while it downloads and each entry is dropped once read, so
+    memory stays flat for sitemaps of any size. `lastmod` is a Unix timestamp or None.
+    Sitemaps that cannot be fetched or parsed are reported and skipped.
+    """
+    try:
+        response = client.get(url, stream=True, timeout=30)
+    except Exception as e:
+        print(f"[WARNING] Could not fetch sitemap {url}: {e}")
+        return
+
+    children = []
+    try:
+        if response.status_code != 200:
+            print(f"[WARNING] Sitemap {url} answered {response.status_code}; skipping it.")
+            return
+        root = None
+        count = 0
+        for event, element in iterparse(_open_body(response), events=("start", "end")):
+            if root is None:
+                root = element
+            if event != "end":
+                continue
+            kind = _local_name(element.tag)
+            if kind not in ("url", "sitemap"):
+                continue
+
+            loc = lastmod = None
+            for child in element:
+                name = _local_name(child.tag)
+                if name == "loc":
+                    loc = (child.text or "").strip()
+                elif name == "lastmod":
+                    lastmod = parse_lastmod(child.text)
+            # Drop the entries read so far; the root would otherwise keep every one of them.
+            root.clear()
+            if not loc:
+                continue
+
+            count += 1
+            if count > MAX_SITEMAP_URLS:
+                print(f"[WARNING] Sitemap {url} lists more than {MAX_SITEMAP_URLS} entries; ignoring the rest.")
+                break
+            if kind == "url":
+                yield loc, lastmod
+            else:
+                children.append(loc)
+    except Exception as e:
+        print(f"[WARNING] Could not read sitemap {url}: {e}")
+    finally:
+        response.close()
+
+    if children and depth >= MAX_INDEX_DEPTH:
+        print(f"[WARNING] Sitemap index {url} is nested too deeply; skipping {len(children)} sitemaps.")
+        return
+    for child in children:
+        yield from iter_sitemap(client, child, depth + 1)
+
+
+def newest_entries(entries, limit, accept=None):
+    """
+    The `limit` entries of an iterable of (url, lastmod) with the newest lastmod, newest
+    first. Entries without a lastmod come last, in their sitemap order. Only `limit`
+    entries are held at a time, however many the sitemaps list.
+    """
+    if limit <= 0:
+        return []
+    heap = []
+    for position, (url, lastmod) in enumerate(entries):
+        if accept is not None and not accept(url):
+            continue
+        key = (lastmod if lastmod is not None else float("-inf"), -position)
+        if len(heap) < limit:
+            heapq.heappush(heap, (key, url, lastmod))
+        elif key > heap[0][0]:
+            heapq.heapreplace(heap, (key, url, lastmod))
+    return [(url, lastmod) for _, url, lastmod in sorted(heap, reverse=True)]
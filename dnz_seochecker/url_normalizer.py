@@ -0,0 +1,54 @@
+# dnz_seochecker/url_normalizer.py
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+_ESCAPE = re.compile(r"%[0-9a-fA-F]{2}")
+
+
+def normalize_url(url):
+    """
+    Canonical form of an absolute http(s) URL, or None for other schemes (mailto:, javascript:, ...).
+
+    Scheme and host are lower-cased, default ports and fragments are dropped and
+    percent-escapes are upper-cased. The result still names the same resource, so it is
+    the URL that gets fetched; see url_key() for the looser form used to spot duplicates.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower()
+    if ":" in host:
+        host = f"[{host}]"
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = _ESCAPE.sub(lambda m: m.group(0).upper(), parts.path) or "/"
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+def url_key(url):
+    """
+    Deduplication key of a URL: normalize_url() with the trailing slash removed from every
+    path except the root and the query parameters sorted. Pages that differ only in those
+    count as one page. Only used to compare URLs, never fetched: a server may answer
+    `/blog` and `/blog/` differently, and relative links resolve differently against them.
+    """
+    url = normalize_url(url)
+    if url is None:
+        return None
+    parts = urlsplit(url)
+    path = parts.path
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/") or "/"
+    query = parts.query
+    if query:
+        query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc, path, query, ""))
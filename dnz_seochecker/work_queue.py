@@ -0,0 +1,217 @@
+# dnz_seochecker/work_queue.py
+
+import sqlite3
+import threading
+import time
+from hashlib import blake2b
+from urllib.parse import urlparse
+from dnz_seochecker.url_normalizer import url_key
+
+# URL states in the queue.
+QUEUED, LEASED, VISITED, FAILED = 0, 1, 2, 3
+
+
+def shard_of(url, shards):
+    """
+    The shard that owns `url`: a stable hash of its host and path, so every process and
+    machine agrees without asking anyone. The query string is left out, so the parameter
+    variants of a page are crawled by the same shard.
+    """
+    parts = urlparse(url)
+    digest = blake2b(f"{parts.netloc.lower()}{parts.path}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+class SqliteWorkQueue:
+    """
+    The frontier of a sharded crawl in one SQLite file, shared by the coordinator and the
+    shard workers. They must all run on the machine that holds the file: the queue uses
+    SQLite's WAL mode, which does not work on network file systems (NFS, SMB).
+
+    To spread the shards over several machines, use a queue on a network service instead.
+    Any object with these methods can take its place;
+    it is handed to worker processes by pickling, so it must reopen itself on unpickling:
+
+    - start(start_url, shards, max_pages): set up a new crawl.
+    - put(urls): queue the URLs not seen before, each on the shard that owns it.
+    - claim(shard, limit): lease up to `limit` queued URLs of a shard in queue order,
+      within the page budget. Returns [(seq, url)]; `seq` orders the merged reports.
+    - complete(url, visited, links): finish a leased URL and queue the links found on it,
+      in one step. A visited URL counts against the page budget.
+    - release(shard=None, older_than=None): put leased URLs back in the queue (of a worker
+      that died, or leased longer than `older_than` seconds ago). Returns their seqs.
+    - finished(): nothing is leased and nothing more can be claimed.
+    - link_store(): link statuses shared by every shard (see LinkStatusCache), so a link
+      found on pages of several shards is checked once.
+    - stats(), close().
+
+    Every URL is stored once, however many shards link to it, so each page is crawled
+    once in the whole crawl. Leases and the budget are updated in one transaction each.
+    """
+
+    def __init__(self, path, timeout=60):
+        self.path = path
+        self.timeout = timeout
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        # WAL lets the shard workers read while one of them writes.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS crawl (key TEXT PRIMARY KEY, value);"
+            # `key` is the url_key() of the URL, so spellings of one page are queued once.
+            "CREATE TABLE IF NOT EXISTS urls (seq INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL UNIQUE,"
+            " url TEXT NOT NULL, shard INTEGER NOT NULL, state INTEGER NOT NULL DEFAULT 0, leased_at REAL);"
+            "CREATE INDEX IF NOT EXISTS urls_claim ON urls (shard, state, seq);"
+            # Only leased rows are indexed, so looking for expired leases stays cheap.
+            f"CREATE INDEX IF NOT EXISTS urls_leased ON urls (leased_at) WHERE state = {LEASED};"
+            "CREATE TABLE IF NOT EXISTS link_status (url TEXT PRIMARY KEY, status INTEGER NOT NULL);"
+        )
+        self._shards = None
+
+    def __reduce__(self):
+        return (SqliteWorkQueue, (self.path, self.timeout))
+
+    def _setting(self, key):
+        row = self.conn.execute("SELECT value FROM crawl WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def shards(self):
+        if self._shards is None:
+            self._shards = self._setting("shards")
+        return self._shards
+
+    @property
+    def start_url(self):
+        return self._setting("start_url")
+
+    def start(self, start_url, shards, max_pages):
+        with self._transaction():
+            self.conn.execute("DELETE FROM urls")
+            self.conn.execute("DELETE FROM link_status")
+            self.conn.execute("DELETE FROM crawl")
+            self.conn.executemany("INSERT INTO crawl VALUES (?, ?)", [
+                ("start_url", start_url), ("shards", shards), ("max_pages", max_pages),
+                ("queued", 0), ("leased", 0), ("visited", 0), ("failed", 0),
+            ])
+        self._shards = shards
+
+    def put(self, urls):
+        with self._transaction():
+            return self._put(urls)
+
+    def _put(self, urls):
+        shards = self.shards
+        before = self.conn.total_changes
+        keys = ((url_key(url) or url, url) for url in urls)
+        self.conn.executemany("INSERT OR IGNORE INTO urls (key, url, shard) VALUES (?, ?, ?)",
+                              ((key, url, shard_of(key, shards)) for key, url in keys))
+        added = self.conn.total_changes - before
+        if added:
+            self._count("queued", added)
+        return added
+
+    def claim(self, shard, limit):
+        with self._transaction():
+            counts = self._counts()
+            limit = min(limit, counts["max_pages"] - counts["visited"] - counts["leased"])
+            if limit <= 0:
+                return []
+            rows = self.conn.execute(
+                "SELECT seq, url FROM urls WHERE shard = ? AND state = ? ORDER BY seq LIMIT ?",
+                (shard, QUEUED, limit),
+            ).fetchall()
+            if rows:
+                self.conn.executemany("UPDATE urls SET state = ?, leased_at = ? WHERE seq = ?",
+                                      ((LEASED, time.time(), seq) for seq, _ in rows))
+                self._count("queued", -len(rows))
+                self._count("leased", len(rows))
+            return rows
+
+    def complete(self, url, visited, links=()):
+        with self._transaction():
+            # Only a URL still leased is finished; one released meanwhile is left for its new owner.
+            changed = self.conn.execute("UPDATE urls SET state = ?, leased_at = NULL WHERE key = ? AND state = ?",
+                                        (VISITED if visited else FAILED, url_key(url) or url, LEASED)).rowcount
+            if changed:
+                self._count("leased", -1)
+                self._count("visited" if visited else "failed", 1)
+            if links:
+                self._put(links)
+
+    def release(self, shard=None, older_than=None):
+        conditions, params = ["state = ?"], [LEASED]
+        if shard is not None:
+            conditions.append("shard = ?")
+            params.append(shard)
+        if older_than is not None:
+            conditions.append("leased_at < ?")
+            params.append(time.time() - older_than)
+        where = " AND ".join(conditions)
+        with self._transaction():
+            seqs = [seq for (seq,) in self.conn.execute(f"SELECT seq FROM urls WHERE {where}", params)]
+            if seqs:
+                self.conn.execute(f"UPDATE urls SET state = {QUEUED}, leased_at = NULL WHERE {where}", params)
+                self._count("leased", -len(seqs))
+                self._count("queued", len(seqs))
+        return seqs
+
+    def finished(self):
+        counts = self._counts()
+        return counts["leased"] == 0 and (counts["queued"] == 0 or counts["visited"] >= counts["max_pages"])
+
+    def link_store(self):
+        return _SharedLinkStore(self.path, self.timeout)
+
+    def stats(self):
+        counts = self._counts()
+        return {key: counts[key] for key in ("queued", "leased", "visited", "failed")}
+
+    def _counts(self):
+        return dict(self.conn.execute("SELECT key, value FROM crawl WHERE key != 'start_url'"))
+
+    def _count(self, key, delta):
+        self.conn.execute("UPDATE crawl SET value = value + ? WHERE key = ?", (delta, key))
+
+    def _transaction(self):
+        return _Transaction(self.conn)
+
+    def close(self):
+        self.conn.close()
+
+
+class _Transaction:
+    # BEGIN IMMEDIATE takes the write lock up front, so two workers never claim the same URL.
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, *exc):
+        self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+
+class _SharedLinkStore:
+    """
+    Link statuses in the queue file, for the LinkStatusCache of every shard worker. Each
+    status is committed at once, so the other shards see it on their next lookup.
+    """
+
+    def __init__(self, path, timeout):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+
+    def get(self, url):
+        with self._lock:
+            row = self.conn.execute("SELECT status FROM link_status WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, url, status):
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO link_status VALUES (?, ?)", (url, status))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()